@@ -0,0 +1 @@
+"""Benchmark suite for the fightgrid package."""
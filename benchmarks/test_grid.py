@@ -0,0 +1,79 @@
+"""Benchmarks for Grid construction, queries and rendering."""
+from typing import Any
+
+import pytest
+
+from fightgrid import grid
+
+
+SIDE_LENGTHS = (9, 32, 128)
+
+
+@pytest.fixture
+def default_grid() -> grid.Grid:
+    """Grid of the configured size with labels to render."""
+    g = grid.Grid(def_pub_label="w", def_prv_label="x")
+    g.get_square_xy(4, 4).pub_label = "X"
+    return g
+
+
+@pytest.mark.parametrize("side_length", SIDE_LENGTHS)
+def test_grid_init(benchmark: Any, side_length: int) -> None:
+    """Benchmark building a Grid."""
+    built = benchmark(grid.Grid, side_length)
+    assert built.side_length == side_length
+
+
+@pytest.mark.parametrize("direction", list(grid.DIRECTION_OFFSETS), ids=str)
+def test_projected_from(
+    benchmark: Any, default_grid: grid.Grid, direction: grid.Direction
+) -> None:
+    """Benchmark projecting two squares from the center."""
+    center = default_grid.get_square_xy(4, 4)
+    target = benchmark(default_grid.projected_from, center, direction, 2)
+    assert target is not None
+
+
+def test_surrounding_squares(benchmark: Any, default_grid: grid.Grid) -> None:
+    """Benchmark finding the four squares around the center."""
+    center = default_grid.get_square_xy(4, 4)
+    assert len(benchmark(default_grid.surrounding_squares, center)) == 4
+
+
+def test_reticle_squares(benchmark: Any, default_grid: grid.Grid) -> None:
+    """Benchmark finding the eight squares around the center."""
+    center = default_grid.get_square_xy(4, 4)
+    assert len(benchmark(default_grid.reticle_squares, center)) == 8
+
+
+def test_grid_string_labels_unchanged(benchmark: Any, default_grid: grid.Grid) -> None:
+    """Benchmark rendering a grid whose labels have not changed."""
+    text = benchmark(default_grid.grid_string_labels)
+    assert text.count("\n") == default_grid.height - 1
+
+
+def test_grid_string_labels_after_change(
+    benchmark: Any, default_grid: grid.Grid
+) -> None:
+    """Benchmark rendering after one label changed on every call."""
+    sq = default_grid.get_square_xy(0, 0)
+    labels = iter("ab" * 10**7)
+
+    def relabel_and_render() -> str:
+        sq.pub_label = next(labels)
+        return default_grid.grid_string_labels(prv=False)
+
+    assert benchmark(relabel_and_render)
+
+
+def test_fork_and_write(benchmark: Any, default_grid: grid.Grid) -> None:
+    """Benchmark forking a grid and changing one square of the fork."""
+
+    def fork_and_write() -> grid.Grid:
+        child = default_grid.fork()
+        child.get_square_xy(2, 2).state = grid.SqState.HIT
+        return child
+
+    child = benchmark(fork_and_write)
+    assert default_grid.get_square_xy(2, 2).state is grid.SqState.EMPTY
+    assert child.bits.count(grid.SqState.HIT) == 1
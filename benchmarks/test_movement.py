@@ -0,0 +1,20 @@
+"""Benchmarks for resolving a turn of entity moves."""
+import random
+from typing import Any
+
+from fightgrid import movement
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.placement import Fleet
+
+
+def test_resolve_fleet_tick(benchmark: Any) -> None:
+    """Benchmark checking a move of every entity of a large fleet."""
+    sizes = {f"unit{i}": 2 + i % 3 for i in range(40)}
+    fleet = Fleet(Grid(32), sizes)
+    fleet.place_random(random.Random(0))  # noqa: S311
+    rng = random.Random(1)  # noqa: S311
+    directions = list(movement.FLIPPED) + [Direction.FLIP]
+    moves = [movement.Move(name, rng.choice(directions)) for name in sizes]
+    result = benchmark(movement.resolve, fleet, moves, False)
+    assert len(result.moved) + len(result.failed) == len(moves)
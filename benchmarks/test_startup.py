@@ -0,0 +1,18 @@
+"""Benchmarks for package and CLI startup time."""
+import subprocess  # noqa: S404
+import sys
+from typing import Any
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "code",
+    ["import fightgrid", "import fightgrid.__main__", "import fightgrid.grid"],
+)
+def test_import_time(benchmark: Any, code: str) -> None:
+    """Benchmark a fresh interpreter importing part of the package."""
+    command = [sys.executable, "-c", code]
+    benchmark.pedantic(
+        subprocess.run, args=(command,), kwargs={"check": True}, rounds=10
+    )
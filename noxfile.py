@@ -149,9 +149,9 @@ def safety(session: Session) -> None:
 @session(python=python_versions)
 def mypy(session: Session) -> None:
     """Type-check using mypy."""
-    args = session.posargs or ["src", "tests", "docs/conf.py"]
+    args = session.posargs or ["src", "tests", "benchmarks", "docs/conf.py"]
     session.install(".")
-    session.install("mypy", "pytest")
+    session.install("mypy", "pytest", "pytest-benchmark", "numpy")
     session.run("mypy", *args)
     if not session.posargs:
         session.run("mypy", f"--python-executable={sys.executable}", "noxfile.py")
@@ -161,7 +161,7 @@ def mypy(session: Session) -> None:
 def tests(session: Session) -> None:
     """Run the test suite."""
     session.install(".")
-    session.install("coverage[toml]", "pytest", "pygments")
+    session.install("coverage[toml]", "pytest", "pygments", "numpy", "pyarrow")
     try:
         session.run("coverage", "run", "--parallel", "-m", "pytest", *session.posargs)
     finally:
@@ -182,11 +182,46 @@ def coverage(session: Session) -> None:
     session.run("coverage", *args)
 
 
+@session(python=python_versions[0])
+def benchmarks(session: Session) -> None:
+    """Run the benchmark suite, failing on regressions from a pinned baseline.
+
+    ``nox --session=benchmarks -- pin`` records the baseline, as does the
+    first run when there is none. Later runs compare against it without
+    replacing it. In-process benchmarks fail if a mean is 10% slower,
+    while startup benchmarks, which spawn an interpreter and vary more,
+    fail only if 25% slower. Other arguments run pytest on the suite
+    with them instead.
+    """
+    session.install(".")
+    session.install("pytest", "pytest-benchmark")
+    baseline = Path(".benchmarks", "baseline.json")
+    startup = "benchmarks/test_startup.py"
+    pin = session.posargs[:1] == ["pin"]
+    if session.posargs and not pin:
+        session.run("pytest", "benchmarks", *session.posargs)
+        return
+    if pin or not baseline.exists():
+        session.log(f"Pinning this run as the baseline in {baseline}.")
+        baseline.parent.mkdir(exist_ok=True)
+        session.run("pytest", "benchmarks", f"--benchmark-json={baseline}")
+        return
+    compare = f"--benchmark-compare={baseline}"
+    session.run(
+        "pytest",
+        "benchmarks",
+        f"--ignore={startup}",
+        compare,
+        "--benchmark-compare-fail=mean:10%",
+    )
+    session.run("pytest", startup, compare, "--benchmark-compare-fail=mean:25%")
+
+
 @session(python=python_versions[0])
 def typeguard(session: Session) -> None:
     """Runtime type checking using Typeguard."""
     session.install(".")
-    session.install("pytest", "typeguard", "pygments")
+    session.install("pytest", "typeguard", "pygments", "numpy")
     session.run("pytest", f"--typeguard-packages={package}", *session.posargs)
 
 
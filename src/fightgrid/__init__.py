@@ -1 +1,28 @@
-"""FightGrid."""
+"""FightGrid.
+
+Submodules are imported on first attribute access, so ``import
+fightgrid`` stays cheap and ``fightgrid.grid`` works without importing
+fightgrid.grid explicitly.
+"""
+import importlib
+from types import ModuleType
+from typing import List
+
+
+def __getattr__(name: str) -> ModuleType:
+    """Import and return the submodule called name."""
+    if not name.startswith("_"):
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    """List module attributes along with submodules not yet imported."""
+    import pkgutil
+
+    submodules = (info.name for info in pkgutil.iter_modules(__path__))
+    return sorted(set(globals()) | set(submodules))
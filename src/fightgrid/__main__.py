@@ -1,12 +1,305 @@
-"""Command-line interface."""
+"""Command-line interface.
+
+Commands import the engine modules they use when they run, so starting
+the CLI, or asking it for help or its version, stays fast.
+"""
+import os
+import time
+from typing import Optional
+from typing import Tuple
+
 import click
 
+import fightgrid.config as cfg
+
+
+SIZE_HELP = "Side length of boards, by default the configured grid_size."
+
+
+def _strategy_name(ctx: click.Context, param: click.Parameter, value: str) -> str:
+    """Validate that a strategy name can be loaded."""
+    from fightgrid.strategies import load_strategy
+
+    try:
+        load_strategy(value)
+    except (ValueError, ImportError, AttributeError) as error:
+        raise click.BadParameter(str(error)) from error
+    return value
+
+
+def _load_config(ctx: click.Context, param: click.Parameter, value: str) -> str:
+    """Load the configuration file, also for worker processes."""
+    if value:
+        try:
+            cfg.load(value)
+        except (OSError, ValueError) as error:
+            raise click.BadParameter(str(error)) from error
+        os.environ[cfg.CONFIG_ENV] = value
+    return value
 
-@click.command()
+
+@click.group(invoke_without_command=True)
 @click.version_option()
+@click.option(
+    "--config",
+    type=click.Path(exists=True, dir_okay=False),
+    callback=_load_config,
+    is_eager=True,
+    expose_value=False,
+    help="TOML file of settings, see fightgrid.config.",
+)
 def main() -> None:
     """FightGrid."""
 
 
+@main.command()
+@click.option("-n", "--games", default=1000, show_default=True, help="Matches to play.")
+@click.option(
+    "-a",
+    "--strategy-a",
+    default="density",
+    show_default=True,
+    callback=_strategy_name,
+    help="First player: random, hunt, density or module:attribute.",
+)
+@click.option(
+    "-b",
+    "--strategy-b",
+    default="hunt",
+    show_default=True,
+    callback=_strategy_name,
+    help="Second player, as for --strategy-a.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes, defaulting to the number of CPUs.",
+)
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+@click.option("--size", type=int, help=SIZE_HELP)
+def simulate(
+    games: int,
+    strategy_a: str,
+    strategy_b: str,
+    workers: Optional[int],
+    seed: int,
+    size: Optional[int],
+) -> None:
+    """Play headless matches between two strategies and report throughput."""
+    from fightgrid import simulate as sim
+
+    side = size or cfg.GRID_SIZE
+    report = sim.run((strategy_a, strategy_b), games, workers, seed, side)
+    click.echo(report.format())
+
+
+def _strategy_names(
+    ctx: click.Context, param: click.Parameter, value: Tuple[str, ...]
+) -> Tuple[str, ...]:
+    """Validate strategy names, defaulting to every registered strategy."""
+    from fightgrid.strategies import STRATEGIES
+
+    for name in value:
+        _strategy_name(ctx, param, name)
+    return value or tuple(STRATEGIES)
+
+
+@main.command()
+@click.option(
+    "-s",
+    "--strategy",
+    "strategies",
+    multiple=True,
+    callback=_strategy_names,
+    help="Strategy to enter, repeatable; defaults to every registered one.",
+)
+@click.option(
+    "-n",
+    "--deals",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Deals per pairing.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes, defaulting to the number of CPUs.",
+)
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+@click.option("--size", type=int, help=SIZE_HELP)
+def tournament(
+    strategies: Tuple[str, ...],
+    deals: int,
+    workers: Optional[int],
+    seed: int,
+    size: Optional[int],
+) -> None:
+    """Play a round robin between strategies and rate them by Elo."""
+    from fightgrid import tournament as tourney
+
+    try:
+        report = tourney.run(strategies, deals, workers, seed, size or cfg.GRID_SIZE)
+    except ValueError as error:
+        raise click.UsageError(str(error)) from error
+    click.echo(report.format())
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address.")
+@click.option("--port", default=8765, show_default=True, help="TCP port.")
+@click.option(
+    "--strategy",
+    default="hunt",
+    show_default=True,
+    callback=_strategy_name,
+    help="Bot strategy, as for simulate.",
+)
+@click.option(
+    "--max-matches",
+    default=20_000,
+    show_default=True,
+    help="Concurrent matches before turning connections away.",
+)
+@click.option("--size", type=int, help=SIZE_HELP)
+def serve(
+    host: str, port: int, strategy: str, max_matches: int, size: Optional[int]
+) -> None:
+    """Host matches against a bot, one per connection, until interrupted."""
+    import asyncio
+
+    from fightgrid import server as srv
+
+    side = size or cfg.GRID_SIZE
+    server = srv.MatchServer(side, strategy=strategy, max_matches=max_matches)
+    click.echo(f"Serving FightGrid matches on {host}:{port}")
+    try:
+        asyncio.run(srv.serve_forever(server, host, port))
+    except KeyboardInterrupt:  # pragma: no cover
+        click.echo("Stopped.")
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address.")
+@click.option("--port", default=8765, show_default=True, help="TCP port.")
+@click.option(
+    "-c", "--connections", default=100, show_default=True, help="Concurrent clients."
+)
+@click.option(
+    "-s", "--seconds", default=10.0, show_default=True, help="Duration of the run."
+)
+@click.option("--local", is_flag=True, help="Start a server in this process instead.")
+def loadgen(
+    host: str, port: int, connections: int, seconds: float, local: bool
+) -> None:
+    """Measure moves per second and latency of a match server."""
+    import asyncio
+
+    from fightgrid import loadgen as load
+
+    if local:
+        report = asyncio.run(load.run_local(connections, seconds))
+    else:
+        report = asyncio.run(load.run_load(host, port, connections, seconds))
+    click.echo(report.format())
+
+
+@main.command()
+@click.option("-n", "--games", default=50, show_default=True, help="Matches to play.")
+@click.option(
+    "--sample",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Time one call in this many.",
+)
+@click.option(
+    "--format",
+    "output",
+    type=click.Choice(["text", "json", "prometheus"]),
+    default="text",
+    show_default=True,
+    help="Output format.",
+)
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+def profile(games: int, sample: int, output: str, seed: int) -> None:
+    """Play matches with grid and game methods instrumented."""
+    from fightgrid import profiling
+
+    profiler = profiling.Profiler(sample_every=sample)
+    start = time.perf_counter()
+    with profiler:
+        moves = profiling.workload(games, seed=seed)
+    wall = time.perf_counter() - start
+    if output == "json":
+        click.echo(profiler.to_json())
+    elif output == "prometheus":
+        click.echo(profiler.to_prometheus(), nl=False)
+    else:
+        click.echo(f"games: {games}, moves: {moves}")
+        click.echo(profiler.format(wall))
+
+
+@main.command()
+@click.argument("path", type=click.Path())
+@click.option("-n", "--games", default=1000, show_default=True, help="Matches to play.")
+@click.option(
+    "-a",
+    "--strategy-a",
+    default="density",
+    show_default=True,
+    callback=_strategy_name,
+    help="First player: random, hunt, density or module:attribute.",
+)
+@click.option(
+    "-b",
+    "--strategy-b",
+    default="hunt",
+    show_default=True,
+    callback=_strategy_name,
+    help="Second player, as for --strategy-a.",
+)
+@click.option(
+    "--chunk",
+    type=click.IntRange(min=1),
+    default=65536,
+    show_default=True,
+    help="Moves per shard or Parquet row group.",
+)
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+@click.option("--size", type=int, help=SIZE_HELP)
+def export(
+    path: str,
+    games: int,
+    strategy_a: str,
+    strategy_b: str,
+    chunk: int,
+    seed: int,
+    size: Optional[int],
+) -> None:
+    """Play matches, streaming every move to PATH.
+
+    PATH is a directory of .npz shards, or a .parquet file if it ends in
+    .parquet, which needs pyarrow.
+    """
+    from fightgrid import export as exporter
+
+    start = time.perf_counter()
+    moves = exporter.export_matches(
+        path,
+        games,
+        (strategy_a, strategy_b),
+        seed,
+        size or cfg.GRID_SIZE,
+        chunk_rows=chunk,
+    )
+    seconds = time.perf_counter() - start
+    click.echo(f"games: {games}, moves: {moves} in {seconds:.2f}s to {path}")
+
+
 if __name__ == "__main__":
     main(prog_name="FightGrid")  # pragma: no cover
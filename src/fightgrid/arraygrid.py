@@ -0,0 +1,223 @@
+"""Array-backed grid storing Square data in compact NumPy planes."""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+import fightgrid.config as cfg
+from fightgrid.grid import Coord
+from fightgrid.grid import Grid
+from fightgrid.grid import GridListener
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.topology import Topology
+
+
+STATE_DTYPE = np.uint8
+LABEL_DTYPE = np.uint16
+
+# SqState values start at 1, so each state's code is simply its value.
+_STATES_BY_CODE: Tuple[Optional[SqState], ...] = (None,) + tuple(SqState)
+
+
+class LabelTable:
+    """Intern label strings as small integer ids, with 0 reserved for None."""
+
+    def __init__(self) -> None:
+        """Initialize LabelTable holding only the None label."""
+        self._labels: List[Optional[str]] = [None]
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, label: Optional[str]) -> int:
+        """Return the id for label, adding it to the table if new.
+
+        Args:
+            label: Label string, or None.
+
+        Returns:
+            int: Id of the label, 0 for None.
+
+        Raises:
+            OverflowError: If the table cannot hold another label.
+        """
+        if label is None:
+            return 0
+        label_id = self._ids.get(label)
+        if label_id is None:
+            label_id = len(self._labels)
+            if label_id > np.iinfo(LABEL_DTYPE).max:
+                raise OverflowError("Too many distinct labels for label plane.")
+            self._labels.append(label)
+            self._ids[label] = label_id
+        return label_id
+
+    def label(self, label_id: int) -> Optional[str]:
+        """Return the label string for an id."""
+        return self._labels[label_id]
+
+    def lookup_array(self, blank: str = " ") -> "np.ndarray[Any, np.dtype[Any]]":
+        """Return object array mapping ids to labels, None replaced by blank."""
+        return np.array([label or blank for label in self._labels], dtype=object)
+
+    def __len__(self) -> int:
+        """Return number of labels, including None."""
+        return len(self._labels)
+
+
+class SquareView(Square):
+    """Lightweight Square reading and writing an ArrayGrid's planes."""
+
+    __slots__ = ("_agrid",)
+
+    def __init__(self, agrid: "ArrayGrid", x: int, y: int) -> None:
+        """Initialize view of the square at x and y of agrid."""
+        self._agrid = agrid
+        self.coord = Coord(x, y)
+
+    @property
+    def state(self) -> SqState:
+        """State of the square."""
+        return _STATES_BY_CODE[self._agrid.states[self.y, self.x]]  # type: ignore
+
+    @state.setter
+    def state(self, value: SqState) -> None:
+        old = self.state
+        self._agrid.states[self.y, self.x] = value.value
+        if value is not old:
+            self._agrid._state_changed(self, old, value)
+
+    @property
+    def pub_label(self) -> Optional[str]:
+        """Public label of the square."""
+        return self._agrid.labels.label(self._agrid.pub_labels[self.y, self.x])
+
+    @pub_label.setter
+    def pub_label(self, value: Optional[str]) -> None:
+        old = self.pub_label
+        self._agrid.pub_labels[self.y, self.x] = self._agrid.labels.intern(value)
+        if value != old:
+            self._agrid._label_changed(self, "pub_label", old, value)
+
+    @property
+    def prv_label(self) -> Optional[str]:
+        """Private label of the square."""
+        return self._agrid.labels.label(self._agrid.prv_labels[self.y, self.x])
+
+    @prv_label.setter
+    def prv_label(self, value: Optional[str]) -> None:
+        old = self.prv_label
+        self._agrid.prv_labels[self.y, self.x] = self._agrid.labels.intern(value)
+        if value != old:
+            self._agrid._label_changed(self, "prv_label", old, value)
+
+    @property
+    def highlight(self) -> Optional[str]:
+        """Highlight of the square."""
+        return self._agrid.labels.label(self._agrid.highlights[self.y, self.x])
+
+    @highlight.setter
+    def highlight(self, value: Optional[str]) -> None:
+        old = self.highlight
+        self._agrid.highlights[self.y, self.x] = self._agrid.labels.intern(value)
+        if value != old:
+            self._agrid._label_changed(self, "highlight", old, value)
+
+
+class ArrayGrid(Grid):
+    """Grid keeping Square data in typed NumPy planes instead of objects.
+
+    Squares returned by get_square and get_square_xy are SquareView
+    objects created on demand, so they compare equal to, but are not
+    identical with, earlier views of the same location.
+    """
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        def_pub_label: Optional[str] = None,
+        def_prv_label: Optional[str] = None,
+    ) -> None:
+        """Initialize ArrayGrid."""
+        self.topology = Topology.square(side_length)
+        self.side_length = side_length
+        self.height = side_length
+        self.labels = LabelTable()
+        shape = (side_length, side_length)
+        self.states = np.full(shape, SqState.EMPTY.value, dtype=STATE_DTYPE)
+        self.pub_labels = np.full(
+            shape, self.labels.intern(def_pub_label), dtype=LABEL_DTYPE
+        )
+        self.prv_labels = np.full(
+            shape, self.labels.intern(def_prv_label), dtype=LABEL_DTYPE
+        )
+        self.highlights = np.zeros(shape, dtype=LABEL_DTYPE)
+        self.bits = self._new_bits()
+        self._listeners: List[GridListener] = []
+        self._forks = None
+
+    def fork(self) -> "ArrayGrid":
+        """Return copy of the grid, copying its planes and sharing labels.
+
+        The planes are compact enough that copying them whole is cheaper
+        than tracking which rows are shared. The label table only ever
+        grows, so both grids can keep interning into it.
+        """
+        child = ArrayGrid.__new__(ArrayGrid)
+        child.topology = self.topology
+        child.side_length = self.side_length
+        child.height = self.height
+        child.labels = self.labels
+        child.states = self.states.copy()
+        child.pub_labels = self.pub_labels.copy()
+        child.prv_labels = self.prv_labels.copy()
+        child.highlights = self.highlights.copy()
+        child.bits = self.bits.copy()
+        child._listeners = []
+        child._forks = None
+        return child
+
+    def _store(self, sq: Square, field: str, old: Any) -> Tuple[Square, Any]:
+        """Return the view and old value as given; views write the planes."""
+        return sq, old
+
+    def get_square(self, sq: Square) -> Square:
+        """Given Square, return view of the grid with same x & y."""
+        return SquareView(self, sq.x, sq.y)
+
+    def get_square_xy(self, x: int, y: int) -> Square:
+        """Given x and y coordinates, return view of the grid there."""
+        return SquareView(self, x, y)
+
+    def get_square_index(self, index: int) -> Square:
+        """Given row-major index, return view of the grid there."""
+        y, x = divmod(index, self.side_length)
+        return SquareView(self, x, y)
+
+    def label_at(self, index: int, prv: bool = False) -> Optional[str]:
+        """Return a label of the square at row-major index, as on a Grid."""
+        y, x = divmod(index, self.side_length)
+        plane = self.prv_labels if prv else self.pub_labels
+        return self.labels.label(plane[y, x])
+
+    def row_labels(self, y: int, prv: bool = False) -> List[Optional[str]]:
+        """Return the labels of row y, as on a Grid."""
+        plane = self.prv_labels if prv else self.pub_labels
+        return [self.labels.label(label_id) for label_id in plane[y]]
+
+    def grid_string_labels(self, prv: Optional[bool] = False) -> str:
+        """Return simple string representation of grid.
+
+        Args:
+        prv (bool, optional): Flag to show private label
+        for each square. Defaults to False, showing each
+        square's public label.
+
+        Returns:
+        str: String representation of grid. Spaces between
+        squares on a row, newlines between rows.
+        """
+        labels = self.labels.lookup_array()[self.prv_labels if prv else self.pub_labels]
+        return "\n".join(" ".join(row) for row in labels.tolist())
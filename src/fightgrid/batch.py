@@ -0,0 +1,120 @@
+"""Vectorized Grid queries over arrays of x and y coordinates.
+
+Each function mirrors a single-square Grid query but takes array-like
+x and y coordinates and answers for all of them in one NumPy call.
+Square indexes are row-major (y * side_length + x), with -1 marking a
+square that is off the grid or blocked. Answers follow the grid's
+Topology: its height, wraparound and blocked squares.
+"""
+from functools import lru_cache
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from fightgrid.grid import DIRECTION_OFFSETS
+from fightgrid.grid import RETICLE_DIRECTIONS
+from fightgrid.grid import SURROUNDING_DIRECTIONS
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import Square
+from fightgrid.topology import Topology
+
+
+IndexArray = npt.NDArray[np.intp]
+MaskArray = npt.NDArray[np.bool_]
+
+
+def _coords(xs: npt.ArrayLike, ys: npt.ArrayLike) -> Tuple[IndexArray, IndexArray]:
+    """Return xs and ys as broadcast integer arrays."""
+    x, y = np.broadcast_arrays(
+        np.asarray(xs, dtype=np.intp), np.asarray(ys, dtype=np.intp)
+    )
+    return x, y
+
+
+@lru_cache(maxsize=64)
+def _valid_array(topology: Topology) -> MaskArray:
+    """Return read-only array of Topology.valid, shared per topology."""
+    valid = np.array(topology.valid(), dtype=np.bool_)
+    valid.flags.writeable = False
+    return valid
+
+
+def _in_bounds(grid: Grid, x: IndexArray, y: IndexArray) -> MaskArray:
+    """Return mask that is True where x and y are within grid bounds."""
+    mask: MaskArray = (x >= 0) & (x < grid.side_length) & (y >= 0) & (y < grid.height)
+    return mask
+
+
+def valid_mask(grid: Grid, xs: npt.ArrayLike, ys: npt.ArrayLike) -> MaskArray:
+    """Return mask that is True where x and y are in bounds and not blocked."""
+    x, y = _coords(xs, ys)
+    inside = _in_bounds(grid, x, y)
+    index = np.where(inside, y * grid.side_length + x, 0)
+    mask: MaskArray = inside & _valid_array(grid.topology)[index]
+    return mask
+
+
+def indices(grid: Grid, xs: npt.ArrayLike, ys: npt.ArrayLike) -> IndexArray:
+    """Return row-major square indexes, -1 where off the grid or blocked."""
+    x, y = _coords(xs, ys)
+    result: IndexArray = np.where(valid_mask(grid, x, y), y * grid.side_length + x, -1)
+    return result
+
+
+def coords(grid: Grid, idx: npt.ArrayLike) -> Tuple[IndexArray, IndexArray]:
+    """Return x and y arrays for row-major square indexes."""
+    y, x = np.divmod(np.asarray(idx, dtype=np.intp), grid.side_length)
+    return x, y
+
+
+def projected_indices(
+    grid: Grid,
+    xs: npt.ArrayLike,
+    ys: npt.ArrayLike,
+    direction: Direction,
+    distance: int = 1,
+) -> IndexArray:
+    """Return indexes a distance and direction away, as projected_from.
+
+    Projections wrap on a torus, and are -1 where they leave any other
+    grid, land on a blocked square or start off the grid.
+    """
+    x, y = _coords(xs, ys)
+    if direction not in DIRECTION_OFFSETS:
+        return np.full(x.shape, -1, dtype=np.intp)
+    dx, dy = DIRECTION_OFFSETS[direction]
+    tx, ty = x + dx * distance, y + dy * distance
+    if grid.topology.wrap:
+        tx, ty = tx % grid.side_length, ty % grid.height
+    target = indices(grid, tx, ty)
+    result: IndexArray = np.where(_in_bounds(grid, x, y), target, -1)
+    return result
+
+
+def neighbor_indices(
+    grid: Grid,
+    xs: npt.ArrayLike,
+    ys: npt.ArrayLike,
+    directions: Tuple[Direction, ...],
+) -> IndexArray:
+    """Return array of shape (..., len(directions)) of neighbor indexes."""
+    return np.stack([projected_indices(grid, xs, ys, d) for d in directions], axis=-1)
+
+
+def surrounding_indices(grid: Grid, xs: npt.ArrayLike, ys: npt.ArrayLike) -> IndexArray:
+    """Return up, left, right and down neighbor indexes of each square."""
+    return neighbor_indices(grid, xs, ys, SURROUNDING_DIRECTIONS)
+
+
+def reticle_indices(grid: Grid, xs: npt.ArrayLike, ys: npt.ArrayLike) -> IndexArray:
+    """Return all eight neighbor indexes of each square, as reticle_squares."""
+    return neighbor_indices(grid, xs, ys, RETICLE_DIRECTIONS)
+
+
+def squares(grid: Grid, idx: npt.ArrayLike) -> List[Square]:
+    """Return grid Squares for indexes, skipping any that are -1."""
+    flat = np.asarray(idx, dtype=np.intp).ravel().tolist()
+    return [grid.get_square_index(i) for i in flat if i >= 0]
@@ -0,0 +1,162 @@
+"""Integer bitboards tracking which squares are in each SqState.
+
+Bit i of a board is set when the square at row-major index i
+(y * side_length + x) is in that board's state. Python integers are
+arbitrary precision, so one integer covers a grid of any size and set
+queries become a handful of bitwise operations.
+
+A BitBoard also keeps a Zobrist hash of the position: the XOR of one
+random 64-bit key per square and state, with EMPTY squares keyed 0.
+Each change of state XORs out the old key and XORs in the new one, so
+the hash is always current at constant cost and equal for every grid
+with the same squares in the same states, whichever moves led there.
+"""
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Set
+
+from fightgrid.grid import SqState
+
+
+UNSHOT_STATES = (SqState.EMPTY, SqState.HIDDEN)
+SHOT_STATES = (SqState.HIT, SqState.MISS, SqState.SUNK)
+
+MASK64 = (1 << 64) - 1
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield index of each set bit in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def popcount(mask: int) -> int:
+    """Return number of set bits in mask."""
+    return bin(mask).count("1")
+
+
+def zobrist_key(index: int, state: SqState) -> int:
+    """Return Zobrist key of the square at index being in state.
+
+    Keys are derived from index and state with the SplitMix64 mixer
+    rather than drawn from a random source, so they are the same in
+    every process and are computed as squares change, with no table.
+    """
+    if state is SqState.EMPTY:
+        return 0
+    z: int = (index * len(SqState) + state.value) * 0x9E3779B97F4A7C15 & MASK64
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EB & MASK64
+    return z ^ (z >> 31)
+
+
+class BitBoard:
+    """One integer bitmask per SqState for a grid.
+
+    Args:
+        side_length: Number of squares in each row.
+        fill: State every square starts in.
+        height: Number of rows, by default side_length for a square grid.
+    """
+
+    def __init__(
+        self,
+        side_length: int,
+        fill: SqState = SqState.EMPTY,
+        height: Optional[int] = None,
+    ) -> None:
+        """Initialize BitBoard with every square in the fill state."""
+        self.side_length = side_length
+        self.height = side_length if height is None else height
+        self.full = (1 << (side_length * self.height)) - 1
+        left_col = sum(1 << (y * side_length) for y in range(self.height))
+        self._not_left = self.full & ~left_col
+        self._not_right = self.full & ~(left_col << (side_length - 1))
+        self._boards: Dict[SqState, int] = {state: 0 for state in SqState}
+        self._boards[fill] = self.full
+        self.zobrist = 0
+        if fill is not SqState.EMPTY:
+            for index in range(side_length * self.height):
+                self.zobrist ^= zobrist_key(index, fill)
+
+    def copy(self) -> "BitBoard":
+        """Return BitBoard with the same squares in each state."""
+        other = BitBoard.__new__(BitBoard)
+        other.__dict__.update(self.__dict__)
+        other._boards = dict(self._boards)
+        return other
+
+    def move(self, index: int, old: SqState, new: SqState) -> None:
+        """Record the square at index changing from old to new state."""
+        bit = 1 << index
+        self._boards[old] &= ~bit
+        self._boards[new] |= bit
+        self.zobrist ^= zobrist_key(index, old) ^ zobrist_key(index, new)
+
+    def mask(self, *states: SqState) -> int:
+        """Return mask of squares in any of the given states."""
+        result = 0
+        for state in states:
+            result |= self._boards[state]
+        return result
+
+    def state_at(self, index: int) -> SqState:
+        """Return the state of the square at index."""
+        bit = 1 << index
+        for state, board in self._boards.items():
+            if board & bit:
+                return state
+        raise IndexError(f"Square index {index} is not on the board.")
+
+    def count(self, *states: SqState) -> int:
+        """Return number of squares in any of the given states."""
+        return popcount(self.mask(*states))
+
+    def members(self, *states: SqState) -> Set[int]:
+        """Return set of indexes of squares in any of the given states."""
+        return set(iter_bits(self.mask(*states)))
+
+    def neighbors(self, mask: int, diagonal: bool = False) -> int:
+        """Return mask of squares next to any square in mask.
+
+        Args:
+            mask: Squares to find the neighbors of.
+            diagonal: Also include diagonal neighbors, as reticle_squares.
+
+        Returns:
+            int: Mask of neighbors, which may overlap mask itself. Edges
+            never wrap and blocked squares are not excluded, whatever the
+            Topology of the grid.
+        """
+        side = self.side_length
+        left = (mask & self._not_left) >> 1
+        right = (mask & self._not_right) << 1
+        result = left | right
+        if diagonal:
+            mask |= result
+        result |= (mask >> side) | ((mask << side) & self.full)
+        return result
+
+    def unshot(self) -> int:
+        """Return mask of squares not yet fired upon."""
+        return self.mask(*UNSHOT_STATES)
+
+    def shot(self) -> int:
+        """Return mask of squares already fired upon."""
+        return self.mask(*SHOT_STATES)
+
+    def frontier(self) -> int:
+        """Return mask of unshot squares next to a HIT."""
+        return self.unshot() & self.neighbors(self._boards[SqState.HIT])
+
+    def adjacent_hits(self) -> int:
+        """Return mask of HIT squares next to another HIT."""
+        hits = self._boards[SqState.HIT]
+        return hits & self.neighbors(hits)
+
+    def cleared(self) -> bool:
+        """Return True if no HIDDEN squares remain."""
+        return not self._boards[SqState.HIDDEN]
@@ -0,0 +1,156 @@
+"""Connected groups of HIT squares, kept up to date as a Grid changes.
+
+HitComponents listens to a Grid and joins each new HIT to the HITs next
+to it, up, down, left or right, with a union-find structure. Every
+component root keeps the component's size and bounding box, so which
+component a square belongs to, how large it is and whether it lies in a
+straight line are answered in near-constant time.
+
+Union-find cannot split a component, so when a square stops being a HIT,
+such as when its entity is SUNK, the index is rebuilt from the remaining
+HITs on the next query.
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+
+from fightgrid.grid import SURROUNDING_DIRECTIONS
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+
+
+class Component(NamedTuple):
+    """Size and bounding box of a group of adjacent squares."""
+
+    root: int
+    size: int
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+
+    @property
+    def orientation(self) -> Direction:
+        """RIGHT for a row, DOWN for a column, otherwise NONE.
+
+        A single square, or a group that is not one straight line, such
+        as two entities hit side by side, has no orientation.
+        """
+        if self.size > 1:
+            if self.y0 == self.y1 and self.x1 - self.x0 + 1 == self.size:
+                return Direction.RIGHT
+            if self.x0 == self.x1 and self.y1 - self.y0 + 1 == self.size:
+                return Direction.DOWN
+        return Direction.NONE
+
+
+class HitComponents:
+    """Union-find index of connected squares in one state of a Grid.
+
+    Args:
+        grid: Grid to follow; squares already in state are indexed.
+        state: State whose squares are grouped, HIT by default.
+    """
+
+    def __init__(self, grid: Grid, state: SqState = SqState.HIT) -> None:
+        """Initialize HitComponents from the current squares of grid."""
+        self.grid = grid
+        self.state = state
+        self._cells: Set[int] = set(grid.bits.members(state))
+        self._parent: Dict[int, int] = {}
+        self._boxes: Dict[int, Component] = {}
+        self._dirty = True
+        grid.add_listener(self._on_change)
+
+    def detach(self) -> None:
+        """Stop following changes of the grid."""
+        self.grid.remove_listener(self._on_change)
+
+    def _on_change(self, sq: Square, field: str, old: Any, new: Any) -> None:
+        """Index a square entering the state, or rebuild after one leaves."""
+        if field != "state":
+            return
+        index = sq.y * self.grid.side_length + sq.x
+        if new is self.state:
+            self._cells.add(index)
+            if not self._dirty:
+                self._add(index, sq)
+        elif old is self.state:
+            self._cells.discard(index)
+            self._dirty = True
+
+    def _rebuild(self) -> None:
+        """Index every square in the state from scratch."""
+        self._parent.clear()
+        self._boxes.clear()
+        for index in sorted(self._cells):
+            self._add(index, self.grid.get_square_index(index))
+        self._dirty = False
+
+    def _add(self, index: int, sq: Square) -> None:
+        """Make index a component of its own, then join its neighbors."""
+        self._parent[index] = index
+        self._boxes[index] = Component(index, 1, sq.x, sq.y, sq.x, sq.y)
+        for neighbor in self.grid._adjacent(sq, SURROUNDING_DIRECTIONS):
+            other = neighbor.y * self.grid.side_length + neighbor.x
+            if other in self._parent:
+                self._union(index, other)
+
+    def _find(self, index: int) -> int:
+        """Return root of the component of index, halving paths on the way."""
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def _union(self, a: int, b: int) -> None:
+        """Join the components of a and b, the smaller under the larger."""
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return
+        box_a, box_b = self._boxes[ra], self._boxes[rb]
+        if box_a.size < box_b.size:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        del self._boxes[rb]
+        self._boxes[ra] = Component(
+            ra,
+            box_a.size + box_b.size,
+            min(box_a.x0, box_b.x0),
+            min(box_a.y0, box_b.y0),
+            max(box_a.x1, box_b.x1),
+            max(box_a.y1, box_b.y1),
+        )
+
+    def component(self, x: int, y: int) -> Optional[Component]:
+        """Return Component of the square at x and y, None if not in state."""
+        if self._dirty:
+            self._rebuild()
+        index = y * self.grid.side_length + x
+        if index not in self._parent:
+            return None
+        return self._boxes[self._find(index)]
+
+    def size(self, x: int, y: int) -> int:
+        """Return size of the component of the square at x and y, or 0."""
+        component = self.component(x, y)
+        return 0 if component is None else component.size
+
+    def components(self) -> List[Component]:
+        """Return every Component, largest first."""
+        if self._dirty:
+            self._rebuild()
+        return sorted(self._boxes.values(), key=lambda c: (-c.size, c.root))
+
+    def members(self, x: int, y: int) -> List[int]:
+        """Return indexes of the squares in the component of x and y."""
+        component = self.component(x, y)
+        if component is None:
+            return []
+        return sorted(i for i in self._parent if self._find(i) == component.root)
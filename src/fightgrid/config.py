@@ -1,4 +1,27 @@
-"""Read in configuration file of constants and other settings."""
+"""Read in configuration file of constants and other settings.
+
+Defaults below can be replaced from a TOML file with load, or by naming
+the file in the FIGHTGRID_CONFIG environment variable before this module
+is first imported. This module imports nothing from the rest of the
+package, so configuration can be loaded before the grid engine. Load it
+first: modules already imported keep the sizes they were given as
+defaults.
+
+Example file::
+
+    grid_size = 10
+
+    [entity_sizes]
+    Battleship = 4
+    Submarine = 3
+"""
+import os
+import sys
+from typing import Any
+from typing import Dict
+
+
+CONFIG_ENV = "FIGHTGRID_CONFIG"
 
 GRID_SIZE = 9
 
@@ -7,3 +30,50 @@ ENTITY_SIZES = {
     "Patrol Boat": 2,
     "Submarine": 3,
 }
+
+
+def _read_toml(path: str) -> Dict[str, Any]:
+    """Return parsed contents of the TOML file at path."""
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:  # pragma: no cover
+        import tomli as tomllib
+
+    with open(path, "rb") as file:
+        return tomllib.load(file)
+
+
+def load(path: str) -> None:
+    """Replace settings with those given in the TOML file at path.
+
+    ENTITY_SIZES is updated in place, so modules holding it see the new
+    fleet; GRID_SIZE is rebound.
+
+    Args:
+        path: TOML file with optional grid_size and entity_sizes.
+
+    Raises:
+        ValueError: If a setting is unknown or of the wrong type.
+    """
+    global GRID_SIZE
+    settings = _read_toml(path)
+    unknown = set(settings) - {"grid_size", "entity_sizes"}
+    if unknown:
+        raise ValueError(f"Unknown settings in {path}: {', '.join(sorted(unknown))}.")
+    grid_size = settings.get("grid_size", GRID_SIZE)
+    entity_sizes = settings.get("entity_sizes", ENTITY_SIZES)
+    if not isinstance(grid_size, int) or grid_size < 1:
+        raise ValueError(f"grid_size in {path} must be a positive integer.")
+    if not isinstance(entity_sizes, dict) or not all(
+        isinstance(size, int) and 0 < size <= grid_size
+        for size in entity_sizes.values()
+    ):
+        raise ValueError(f"entity_sizes in {path} must map names to lengths.")
+    GRID_SIZE = grid_size
+    if entity_sizes is not ENTITY_SIZES:
+        ENTITY_SIZES.clear()
+        ENTITY_SIZES.update(entity_sizes)
+
+
+if os.environ.get(CONFIG_ENV):  # pragma: no cover
+    load(os.environ[CONFIG_ENV])
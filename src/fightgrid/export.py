@@ -0,0 +1,343 @@
+"""Stream match histories to columnar files and read them back.
+
+Every move of a match is one row: the match and move numbers, the
+player moving, the square fired upon, the outcome, the entity sunk if
+any, and the state of every square of the board fired upon after the
+shot. Rows are gathered in NumPy columns of chunk_rows rows, written out
+when full and then reused, so memory stays bounded however many matches
+are exported.
+
+Two formats are written, chosen by the path:
+
+- a directory of ``.npz`` shards, ``shard-00000.npz`` and up, one per
+  chunk. Each holds an array per column and a ``meta`` JSON string
+  giving the format version, side length, column names, SqState names
+  and entity names, so a shard can be read on its own. Shards already
+  in the directory are removed first, so none of an earlier export is
+  read back with the new one.
+- a ``.parquet`` file, one row group per chunk, with the states as a
+  list of u8 per row and the same metadata in the schema. This needs
+  the optional pyarrow package.
+
+The readers are generators that load one shard or row group at a time.
+"""
+import glob
+import json
+import os
+import random
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+import fightgrid.config as cfg
+from fightgrid.game import Board
+from fightgrid.game import Shot
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.simulate import play_match
+from fightgrid.strategies import load_strategy
+
+
+VERSION = 1
+DEFAULT_CHUNK_ROWS = 65536
+PARQUET_SUFFIX = ".parquet"
+SHARD_PATTERN = "shard-{:05d}.npz"
+
+# Name and dtype of each column with one value per row.
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("match", "<u4"),
+    ("move", "<u2"),
+    ("player", "u1"),
+    ("x", "<u2"),
+    ("y", "<u2"),
+    ("outcome", "u1"),
+    ("sunk", "<i2"),
+)
+
+_STATES_BY_VALUE = {state.value: state for state in SqState}
+
+
+class MoveRecord(NamedTuple):
+    """One exported move, with the board fired upon as SqState values."""
+
+    match: int
+    move: int
+    player: int
+    x: int
+    y: int
+    outcome: SqState
+    sunk: Optional[str]
+    states: bytes
+
+
+def grid_states(grid: Grid) -> "npt.NDArray[np.uint8]":
+    """Return SqState value of every square of grid, row-major."""
+    squares = grid.side_length * grid.height
+    nbytes = (squares + 7) // 8
+    states = np.full(squares, SqState.EMPTY.value, dtype=np.uint8)
+    for state in SqState:
+        mask = grid.bits.mask(state)
+        if state is SqState.EMPTY or not mask:
+            continue
+        packed = np.frombuffer(mask.to_bytes(nbytes, "little"), dtype=np.uint8)
+        bits = np.unpackbits(packed, bitorder="little")[:squares]
+        states[bits.astype(bool)] = state.value
+    return states
+
+
+class ExportWriter:
+    """Buffer moves in fixed-size columns, writing each full chunk out.
+
+    Args:
+        path: Directory for npz shards, or a file ending in .parquet.
+        side_length: Length of each side of the boards.
+        sizes: Entities in each fleet, naming the sunk column's values.
+        chunk_rows: Rows per shard or row group.
+
+    Raises:
+        ValueError: If chunk_rows is less than 1.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        side_length: int = cfg.GRID_SIZE,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> None:
+        """Initialize ExportWriter with an empty chunk."""
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1.")
+        self.path = path
+        self.side_length = side_length
+        self.chunk_rows = chunk_rows
+        self.entities = list(sizes)
+        self._entity_ids = {name: i for i, name in enumerate(self.entities)}
+        self.parquet = path.endswith(PARQUET_SUFFIX)
+        self.rows = 0
+        self.chunks = 0
+        self._filled = 0
+        self._columns = {
+            name: np.zeros(chunk_rows, dtype=dtype) for name, dtype in COLUMNS
+        }
+        self._states = np.zeros((chunk_rows, side_length * side_length), np.uint8)
+        self._parquet_writer: Any = None
+        if not self.parquet:
+            os.makedirs(path, exist_ok=True)
+            pattern = os.path.join(glob.escape(path), "shard-*.npz")
+            for stale in glob.glob(pattern):
+                os.remove(stale)
+
+    def meta(self) -> Dict[str, Any]:
+        """Return description of the columns stored with every chunk."""
+        return {
+            "version": VERSION,
+            "side_length": self.side_length,
+            "columns": [name for name, _ in COLUMNS] + ["states"],
+            "states": {state.name: state.value for state in SqState},
+            "entities": self.entities,
+        }
+
+    def add(
+        self, match: int, move: int, player: int, x: int, y: int, shot: Shot, grid: Grid
+    ) -> None:
+        """Add a move, writing the chunk out once full.
+
+        Args:
+            match: Number of the match.
+            move: Number of the move within the match, from 0.
+            player: Index of the player moving.
+            x: Column fired upon.
+            y: Row fired upon.
+            shot: Outcome of the move.
+            grid: Grid fired upon, after the shot.
+
+        Raises:
+            ValueError: If grid is not a square board of side_length.
+        """
+        if (grid.side_length, grid.height) != (self.side_length, self.side_length):
+            raise ValueError(
+                f"Grid of {grid.side_length}x{grid.height} squares does not fit "
+                f"boards of side {self.side_length}."
+            )
+        row = self._filled
+        columns = self._columns
+        columns["match"][row] = match
+        columns["move"][row] = move
+        columns["player"][row] = player
+        columns["x"][row] = x
+        columns["y"][row] = y
+        columns["outcome"][row] = shot.state.value
+        columns["sunk"][row] = -1 if shot.sunk is None else self._entity_ids[shot.sunk]
+        self._states[row] = grid_states(grid)
+        self._filled += 1
+        self.rows += 1
+        if self._filled == self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out the rows added since the last chunk."""
+        filled = self._filled
+        if not filled:
+            return
+        columns = {name: array[:filled] for name, array in self._columns.items()}
+        states = self._states[:filled]
+        if self.parquet:
+            self._write_row_group(columns, states)
+        else:
+            shard = os.path.join(self.path, SHARD_PATTERN.format(self.chunks))
+            meta = np.array(json.dumps(self.meta()))
+            np.savez_compressed(
+                shard, meta=meta, states=states, **columns  # type: ignore[arg-type]
+            )
+        self.chunks += 1
+        self._filled = 0
+
+    def _write_row_group(
+        self,
+        columns: Dict[str, "npt.NDArray[Any]"],
+        states: "npt.NDArray[np.uint8]",
+    ) -> None:
+        """Append chunk to the Parquet file as a row group."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrays = [pa.array(array) for array in columns.values()]
+        arrays.append(
+            pa.FixedSizeListArray.from_arrays(
+                pa.array(states.reshape(-1)), states.shape[1]
+            )
+        )
+        names = list(columns) + ["states"]
+        table = pa.Table.from_arrays(arrays, names=names)
+        if self._parquet_writer is None:
+            schema = table.schema.with_metadata({"fightgrid": json.dumps(self.meta())})
+            self._parquet_writer = pq.ParquetWriter(self.path, schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        """Write out the last chunk and close the Parquet file."""
+        self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self) -> "ExportWriter":
+        """Return writer for use in a with block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close writer at the end of a with block."""
+        self.close()
+
+
+def export_matches(
+    path: str,
+    games: int,
+    strategies: Tuple[str, str] = ("density", "hunt"),
+    seed: int = 0,
+    side_length: int = cfg.GRID_SIZE,
+    sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> int:
+    """Play matches, streaming every move to path.
+
+    Args:
+        path: Directory for npz shards, or a file ending in .parquet.
+        games: Matches to play.
+        strategies: Names of the two players' strategies.
+        seed: Random seed.
+        side_length: Length of each side of the boards.
+        sizes: Entities in each fleet.
+        chunk_rows: Rows per shard or row group.
+
+    Returns:
+        int: Number of moves exported.
+    """
+    factories = (load_strategy(strategies[0]), load_strategy(strategies[1]))
+    rng = random.Random(seed)  # noqa: S311
+    with ExportWriter(path, side_length, sizes, chunk_rows) as writer:
+        # Numbers of the match being played and of its next move.
+        position = [0, 0]
+
+        def record(player: int, x: int, y: int, shot: Shot, board: Board) -> None:
+            match, move = position
+            writer.add(match, move, player, x, y, shot, board.grid)
+            position[1] += 1
+
+        for game in range(games):
+            position[:] = [game, 0]
+            play_match(factories, rng, game % 2, side_length, sizes, on_move=record)
+        return writer.rows
+
+
+Chunk = Tuple[Dict[str, Any], Dict[str, "npt.NDArray[Any]"]]
+
+
+def iter_chunks(path: str) -> Iterator[Chunk]:
+    """Yield metadata and columns of each shard or row group in turn.
+
+    Args:
+        path: Directory of npz shards, or a .parquet file.
+
+    Yields:
+        Chunk: Metadata of the export and a dict of column arrays, with
+        states as an array of shape (rows, squares).
+    """
+    if path.endswith(PARQUET_SUFFIX):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        meta = json.loads(parquet.schema_arrow.metadata[b"fightgrid"])
+        for group in range(parquet.num_row_groups):
+            table = parquet.read_row_group(group)
+            columns = {name: table.column(name).to_numpy() for name, _ in COLUMNS}
+            states = table.column("states").combine_chunks()
+            squares = meta["side_length"] ** 2
+            columns["states"] = states.flatten().to_numpy().reshape(-1, squares)
+            yield meta, columns
+        return
+    shard = 0
+    while True:
+        name = os.path.join(path, SHARD_PATTERN.format(shard))
+        if not os.path.exists(name):
+            return
+        with np.load(name) as data:
+            meta = json.loads(str(data["meta"]))
+            columns = {key: data[key] for key in data.files if key != "meta"}
+        yield meta, columns
+        shard += 1
+
+
+def iter_moves(path: str) -> Iterator[MoveRecord]:
+    """Yield every exported move, loading one chunk at a time.
+
+    Args:
+        path: Directory of npz shards, or a .parquet file.
+
+    Yields:
+        MoveRecord: Each move in the order written.
+    """
+    for meta, columns in iter_chunks(path):
+        entities: List[str] = meta["entities"]
+        rows = zip(*(columns[name].tolist() for name, _ in COLUMNS))
+        for row, states in zip(rows, columns["states"]):
+            match, move, player, x, y, outcome, sunk = row
+            yield MoveRecord(
+                match,
+                move,
+                player,
+                x,
+                y,
+                _STATES_BY_VALUE[outcome],
+                None if sunk < 0 else entities[sunk],
+                states.tobytes(),
+            )
@@ -0,0 +1,119 @@
+"""Rules for firing upon a player's Board of hidden entities."""
+import random
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.placement import Fleet
+from fightgrid.weapons import Template
+from fightgrid.weapons import area_squares
+
+
+HIT_LABEL = "X"
+MISS_LABEL = "o"
+
+
+class Shot(NamedTuple):
+    """Outcome of firing upon one square."""
+
+    state: SqState
+    sunk: Optional[str] = None
+
+
+class Board:
+    """A player's Grid and the Fleet hidden on it.
+
+    Public labels of squares record what the opponent has learned: the
+    hit and miss markers, and the first letter of each sunk entity.
+    """
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        rng: Optional[random.Random] = None,
+        grid: Optional[Grid] = None,
+    ) -> None:
+        """Initialize Board, placing the fleet at random unless grid given."""
+        self.grid = grid if grid is not None else Grid(side_length)
+        self.fleet = Fleet(self.grid, sizes)
+        self._damage: Dict[str, int] = {name: 0 for name in sizes}
+        if grid is None:
+            self.fleet.place_random(rng)
+
+    def fire(self, x: int, y: int) -> Shot:
+        """Fire upon the square at x and y.
+
+        Args:
+            x: Column of the target square.
+            y: Row of the target square.
+
+        Returns:
+            Shot: MISS, HIT or, if it finished an entity, SUNK with its name.
+
+        Raises:
+            ValueError: If the square is off the grid, blocked or already
+                fired upon.
+        """
+        if not (0 <= x < self.grid.side_length and 0 <= y < self.grid.height):
+            raise ValueError(f"Square x{x} y{y} is off the grid.")
+        sq = self.grid.get_square_xy(x, y)
+        if not self.grid.square_valid(sq):
+            raise ValueError(f"Square x{x} y{y} is blocked.")
+        if sq.state is SqState.EMPTY:
+            sq.pub_label = MISS_LABEL
+            sq.state = SqState.MISS
+            return Shot(SqState.MISS)
+        if sq.state is not SqState.HIDDEN:
+            raise ValueError(f"Square x{x} y{y} was already fired upon.")
+        placement = self.fleet.entity_at(sq)
+        assert placement is not None  # noqa: S101
+        name = placement.name
+        self._damage[name] += 1
+        if self._damage[name] < len(placement.span.indices):
+            sq.pub_label = HIT_LABEL
+            sq.state = SqState.HIT
+            return Shot(SqState.HIT)
+        for index in placement.span.indices:
+            part = self.grid.get_square_index(index)
+            part.pub_label = name[0]
+            part.state = SqState.SUNK
+        return Shot(SqState.SUNK, name)
+
+    def fire_area(
+        self, template: Template, x: int, y: int
+    ) -> List[Tuple[Square, Shot]]:
+        """Fire an area weapon aimed at the square at x and y.
+
+        Args:
+            template: Shape of the weapon.
+            x: Column of the aimed square.
+            y: Row of the aimed square.
+
+        Returns:
+            List[Tuple[Square, Shot]]: Each struck square not fired upon
+            before, with the outcome of firing upon it.
+
+        Raises:
+            ValueError: If the aimed square is off the grid.
+        """
+        if not (0 <= x < self.grid.side_length and 0 <= y < self.grid.height):
+            raise ValueError(f"Square x{x} y{y} is off the grid.")
+        center = self.grid.get_square_xy(x, y)
+        unshot = self.grid.bits.unshot()
+        shots = []
+        for sq in area_squares(self.grid, template, center):
+            if unshot >> (sq.y * self.grid.side_length + sq.x) & 1:
+                shots.append((sq, self.fire(sq.x, sq.y)))
+        return shots
+
+    def defeated(self) -> bool:
+        """Return True once every entity is sunk."""
+        return self.grid.bits.cleared()
@@ -1,12 +1,26 @@
 """Define coordinate system and grid."""
+import weakref
 from enum import Enum
 from enum import auto
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 
 import fightgrid.config as cfg
 
 
+if TYPE_CHECKING:  # pragma: no cover
+    from fightgrid.bitboard import BitBoard
+    from fightgrid.render import GridRenderer
+    from fightgrid.topology import Topology
+
+
 class Direction(Enum):
     """Direction for reference and moving entities."""
 
@@ -22,6 +36,69 @@ class Direction(Enum):
     NONE = auto()
 
 
+DIRECTION_OFFSETS: Dict[Direction, Tuple[int, int]] = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0),
+    Direction.UP_LEFT: (-1, -1),
+    Direction.UP_RIGHT: (1, -1),
+    Direction.DOWN_LEFT: (-1, 1),
+    Direction.DOWN_RIGHT: (1, 1),
+}
+
+SURROUNDING_DIRECTIONS = (Direction.UP, Direction.LEFT, Direction.RIGHT, Direction.DOWN)
+
+RETICLE_DIRECTIONS = (
+    Direction.UP_LEFT,
+    Direction.UP,
+    Direction.UP_RIGHT,
+    Direction.LEFT,
+    Direction.RIGHT,
+    Direction.DOWN_LEFT,
+    Direction.DOWN,
+    Direction.DOWN_RIGHT,
+)
+
+
+def neighbor_table(
+    side_length: int, direction: Direction, distance: int = 1
+) -> Tuple[Optional[int], ...]:
+    """Return, per square index, the index a distance and direction away.
+
+    Indexes are row-major (y * side_length + x), and None marks a
+    projection that leaves the grid.
+
+    Args:
+        side_length: Length of each side of the grid.
+        direction: One of the keys of DIRECTION_OFFSETS.
+        distance: Number of squares to project.
+
+    Returns:
+        Tuple[Optional[int], ...]: Target index for every square index.
+    """
+    from fightgrid.topology import Topology
+
+    return Topology.square(side_length).neighbors(direction, distance)
+
+
+class Coord(NamedTuple):
+    """Immutable, hashable x and y of a grid location.
+
+    Grids share the Coords of coord_table, so every board of one size
+    holds the same few coordinate objects.
+    """
+
+    x: int
+    y: int
+
+
+@lru_cache(maxsize=64)
+def coord_table(width: int, height: int) -> Tuple[Coord, ...]:
+    """Return interned Coord of each row-major index of a grid."""
+    return tuple(Coord(x, y) for y in range(height) for x in range(width))
+
+
 class SqState(Enum):
     """General state of Grid Square."""
 
@@ -33,7 +110,18 @@ class SqState(Enum):
 
 
 class Square:
-    """A single location on the grid."""
+    """A single location on the grid.
+
+    A Square created by a Grid reports changes of its state and labels
+    back to that Grid, so the Grid's indexes and listeners stay in sync
+    with plain attribute assignment such as ``sq.state = SqState.HIT``.
+
+    The location is kept as a Coord, separate from the square's data,
+    and Squares hash and compare by it, so they can be set members and
+    dict keys.
+    """
+
+    __slots__ = ("coord", "_pub_label", "_prv_label", "_highlight", "_state", "_grid")
 
     def __init__(
         self,
@@ -44,20 +132,78 @@ class Square:
         highlight: Optional[str] = None,
     ) -> None:
         """Initialize grid Square with at least x and y."""
-        self.x = x
-        self.y = y
-        self.pub_label = pub_label
-        self.prv_label = prv_label
-        self.highlight = highlight
-        self.state = SqState.EMPTY
+        self.coord = Coord(x, y)
+        self._pub_label = pub_label
+        self._prv_label = prv_label
+        self._highlight = highlight
+        self._state = SqState.EMPTY
+        self._grid: Optional["Grid"] = None
+
+    @property
+    def x(self) -> int:
+        """Column of the Square."""
+        return self.coord[0]
+
+    @property
+    def y(self) -> int:
+        """Row of the Square."""
+        return self.coord[1]
+
+    @property
+    def state(self) -> SqState:
+        """General state of the Square."""
+        return self._state
+
+    @state.setter
+    def state(self, value: SqState) -> None:
+        old = self._state
+        self._state = value
+        if self._grid is not None and value is not old:
+            self._grid._state_changed(self, old, value)
+
+    @property
+    def pub_label(self) -> Optional[str]:
+        """Label shown to every player."""
+        return self._pub_label
+
+    @pub_label.setter
+    def pub_label(self, value: Optional[str]) -> None:
+        old = self._pub_label
+        self._pub_label = value
+        if self._grid is not None and value != old:
+            self._grid._label_changed(self, "pub_label", old, value)
+
+    @property
+    def prv_label(self) -> Optional[str]:
+        """Label shown only to the owner of the grid."""
+        return self._prv_label
+
+    @prv_label.setter
+    def prv_label(self, value: Optional[str]) -> None:
+        old = self._prv_label
+        self._prv_label = value
+        if self._grid is not None and value != old:
+            self._grid._label_changed(self, "prv_label", old, value)
+
+    @property
+    def highlight(self) -> Optional[str]:
+        """Highlight of the Square."""
+        return self._highlight
+
+    @highlight.setter
+    def highlight(self, value: Optional[str]) -> None:
+        old = self._highlight
+        self._highlight = value
+        if self._grid is not None and value != old:
+            self._grid._label_changed(self, "highlight", old, value)
 
     def __eq__(self: "Square", other: object) -> bool:
         """Test equality."""
-        return (
-            self.x == other.x and self.y == other.y
-            if isinstance(other, Square)
-            else False
-        )
+        return self.coord == other.coord if isinstance(other, Square) else False
+
+    def __hash__(self) -> int:
+        """Hash by location, consistent with equality."""
+        return hash(self.coord)
 
     def __repr__(self) -> str:
         """Represent Square object as string."""
@@ -65,96 +211,289 @@ class Square:
         return f"Sq x{self.x} y{self.y} pub:{self.pub_label} prv:{self.prv_label} state:{state_str}"
 
 
+GridListener = Callable[[Square, str, Any, Any], None]
+
+
 class Grid:
-    """Grid of Squares."""
+    """Grid of Squares.
+
+    Args:
+        side_length: Length of each side of a square grid.
+        def_pub_label: Public label of squares not yet changed.
+        def_prv_label: Private label of squares not yet changed.
+        topology: Shape of the grid, overriding side_length. Its width
+            becomes side_length, the length of each row.
+    """
 
     def __init__(
         self,
         side_length: int = cfg.GRID_SIZE,
         def_pub_label: Optional[str] = None,
         def_prv_label: Optional[str] = None,
+        topology: Optional["Topology"] = None,
     ) -> None:
         """Initialize Grid."""
-        self._grid = [
-            [
-                Square(x, y, pub_label=def_pub_label, prv_label=def_prv_label)
-                for x in range(side_length)
-            ]
-            for y in range(side_length)
-        ]
+        if topology is None:
+            from fightgrid.topology import Topology
+
+            topology = Topology.square(side_length)
+        self.topology = topology
+        self.side_length = topology.width
+        self.height = topology.height
+        self.def_pub_label = def_pub_label
+        self.def_prv_label = def_prv_label
+        # Rows are None until first read, so nothing is built up front.
+        self._grid: List[Optional[List[Square]]] = [None] * topology.height
+        self.bits = self._new_bits()
+        self._listeners: List[GridListener] = []
+        self._renderers: Dict[bool, "GridRenderer"] = {}
+        self._forks: Optional["weakref.WeakSet[Grid]"] = None
+
+    def fork(self) -> "Grid":
+        """Return copy of the grid that shares rows with it until written.
+
+        The fork starts with this grid's rows and Squares, copying only
+        the list of rows and the BitBoard. Squares of a row the fork does
+        not own are read as new Squares of the fork, equal to but not
+        identical with earlier reads, and the row is copied only when one
+        of them changes. A change made here to a row still shared gives
+        every fork sharing it a copy holding the value from before the
+        change. Either way neither grid ever sees the other's changes,
+        and forking costs the same however few rows are touched
+        afterwards. Listeners are not carried over to the fork.
+
+        Returns:
+            Grid: Independent grid of the same type, topology and squares.
+        """
+        child = type(self).__new__(type(self))
+        child.topology = self.topology
+        child.side_length = self.side_length
+        child.height = self.height
+        child.def_pub_label = self.def_pub_label
+        child.def_prv_label = self.def_prv_label
+        child._grid = list(self._grid)
+        child.bits = self.bits.copy()
+        child._listeners = []
+        child._renderers = {}
+        child._forks = None
+        # Each grid owning Squares in a shared row must be able to reach
+        # every fork holding that row, however many forks lie between.
+        firsts = [row[0] for row in self._grid if row is not None]
+        for owner in {sq._grid for sq in firsts if sq._grid is not None}:
+            if owner._forks is None:
+                owner._forks = weakref.WeakSet()
+            owner._forks.add(child)
+        return child
+
+    def _copy(self, src: Square) -> Square:
+        """Return new Square of this grid holding the values of src."""
+        sq = Square.__new__(Square)
+        sq.coord = src.coord
+        sq._pub_label = src._pub_label
+        sq._prv_label = src._prv_label
+        sq._highlight = src._highlight
+        sq._state = src._state
+        sq._grid = self
+        return sq
+
+    def _blank(self, coord: Coord) -> Square:
+        """Return new Square of this grid at coord holding the defaults."""
+        sq = Square.__new__(Square)
+        sq.coord = coord
+        sq._pub_label = self.def_pub_label
+        sq._prv_label = self.def_prv_label
+        sq._highlight = None
+        sq._state = SqState.EMPTY
+        sq._grid = self
+        return sq
+
+    def _privatize(self, y: int) -> List[Square]:
+        """Replace row y, unbuilt or shared, with Squares of this grid."""
+        width = self.side_length
+        # Index as the list of rows would, counting negatives from the end.
+        y = range(self.height)[y]
+        source = self._grid[y]
+        if source is None:
+            coords = coord_table(width, self.height)[y * width : (y + 1) * width]
+            row = [self._blank(coord) for coord in coords]
+        else:
+            row = [self._copy(sq) for sq in source]
+        self._grid[y] = row
+        return row
+
+    def _store(self, sq: Square, field: str, old: Any) -> Tuple[Square, Any]:
+        """Keep a changed Square in its row, copying the row if not owned.
+
+        Args:
+            sq: Square whose field changed.
+            field: Name of the changed property.
+            old: Value of the field before the change.
+
+        Returns:
+            Tuple[Square, Any]: The Square kept for the location and the
+            value its field held before the change.
+        """
+        row = self._grid[sq.y]
+        if row is None or row[sq.x]._grid is not self:
+            self._privatize(sq.y)[sq.x] = sq
+            return sq, old
+        stored = row[sq.x]
+        if stored is not sq:
+            # Read before its row was copied; move the change onto the
+            # Square now kept for the location.
+            attr = "_" + field
+            old = getattr(stored, attr)
+            setattr(stored, attr, getattr(sq, attr))
+        return stored, old
+
+    def _unshare(self, sq: Square, attribute: str, old: Any) -> None:
+        """Give forks sharing the row of sq a copy from before its change."""
+        row = self._grid[sq.y]
+        for fork in list(self._forks or ()):
+            if fork._grid[sq.y] is row:
+                setattr(fork._privatize(sq.y)[sq.x], attribute, old)
+
+    def _new_bits(self) -> "BitBoard":
+        """Return BitBoard with every square EMPTY."""
+        from fightgrid.bitboard import BitBoard
+
+        return BitBoard(self.side_length, height=self.height)
+
+    @property
+    def zobrist(self) -> int:
+        """64-bit Zobrist hash of the states of the squares.
+
+        Kept up to date by the BitBoard as states change, so reading it is
+        free; grids with every square in the same state hash equal.
+        """
+        return self.bits.zobrist
+
+    def _state_changed(self, sq: Square, old: SqState, new: SqState) -> None:
+        """Update indexes after the state of a grid Square changed."""
+        sq, old = self._store(sq, "state", old)
+        if self._forks:
+            self._unshare(sq, "_state", old)
+        self.bits.move(sq.y * self.side_length + sq.x, old, new)
+        for listener in self._listeners:
+            listener(sq, "state", old, new)
+
+    def _label_changed(
+        self, sq: Square, field: str, old: Optional[str], new: Optional[str]
+    ) -> None:
+        """Notify listeners after a label of a grid Square changed."""
+        sq, old = self._store(sq, field, old)
+        if self._forks:
+            self._unshare(sq, "_" + field, old)
+        for listener in self._listeners:
+            listener(sq, field, old, new)
+
+    def add_listener(self, listener: GridListener) -> None:
+        """Call listener with (square, field, old, new) after each change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: GridListener) -> None:
+        """Stop calling a listener added with add_listener."""
+        self._listeners.remove(listener)
+
+    def set_state(self, sq: Square, state: SqState) -> None:
+        """Set state of the grid Square with same x & y as given."""
+        self.get_square(sq).state = state
 
     def get_square(self, sq: Square) -> Square:
         """Given Square, return Square from grid with same x & y."""
-        return self._grid[sq.y][sq.x]
+        return self.get_square_xy(sq.x, sq.y)
 
     def get_square_xy(self, x: int, y: int) -> Square:
         """Given x and y coordinates, return the Square from the grid."""
-        return self._grid[y][x]
+        row = self._grid[y]
+        if row is None:
+            return self._privatize(y)[x]
+        sq = row[x]
+        return sq if sq._grid is self else self._copy(sq)
 
     def projected_from(
         self, sq: Square, direction: Direction, distance: int = 1
     ) -> Optional[Square]:
         """Returns Square from grid a distance and direction away."""
-        # if not sq:
-        #     raise ValueError("Starting Square cannot be None.")
-        if direction == Direction.UP:
-            p = Square(y=(sq.y - distance), x=sq.x)
-            return self.get_square(p) if self.square_valid(p) else None
-        if direction == Direction.UP_LEFT:
-            p = Square(y=(sq.y - distance), x=(sq.x - distance))
-            return self.get_square(p) if self.square_valid(p) else None
-        if direction == Direction.UP_RIGHT:
-            p = Square(y=(sq.y - distance), x=(sq.x + distance))
-            return self.get_square(p) if self.square_valid(p) else None
-        if direction == Direction.DOWN:
-            p = Square(y=(sq.y + distance), x=sq.x)
-            return self.get_square(p) if self.square_valid(p) else None
-        if direction == Direction.DOWN_LEFT:
-            p = Square(y=(sq.y + distance), x=(sq.x - 1))
-            return self.get_square(p) if self.square_valid(p) else None
-        if direction == Direction.DOWN_RIGHT:
-            p = Square(y=(sq.y + distance), x=(sq.x + 1))
-            return self.get_square(p) if self.square_valid(p) else None
-        if direction == Direction.LEFT:
-            p = Square(y=sq.y, x=(sq.x - distance))
-            return self.get_square(p) if self.square_valid(p) else None
-        if direction == Direction.RIGHT:
-            p = Square(y=sq.y, x=(sq.x + distance))
-            return self.get_square(p) if self.square_valid(p) else None
+        index = self._index(sq)
+        if index is None or direction not in DIRECTION_OFFSETS:
+            return None
+        target = self.topology.project(index, direction, distance)
+        return None if target is None else self.get_square_index(target)
+
+    def _index(self, sq: Square) -> Optional[int]:
+        """Return row-major index of Square, or None if off this grid."""
+        if 0 <= sq.x < self.side_length and 0 <= sq.y < self.height:
+            return sq.y * self.side_length + sq.x
         return None
-        # raise ValueError("Invalid direction given, can't project movement.")
+
+    def get_square_index(self, index: int) -> Square:
+        """Given row-major index, return the Square from the grid."""
+        y, x = divmod(index, self.side_length)
+        row = self._grid[y]
+        if row is None:
+            return self._privatize(y)[x]
+        sq = row[x]
+        return sq if sq._grid is self else self._copy(sq)
+
+    def label_at(self, index: int, prv: bool = False) -> Optional[str]:
+        """Return a label of the square at row-major index.
+
+        Unlike get_square_index this builds no row, so rendering a grid
+        does not create its Squares.
+
+        Args:
+            index: Row-major index of the square.
+            prv: Return the private label instead of the public one.
+
+        Returns:
+            Optional[str]: The label of the square.
+        """
+        y, x = divmod(index, self.side_length)
+        row = self._grid[y]
+        if row is None:
+            return self.def_prv_label if prv else self.def_pub_label
+        return row[x]._prv_label if prv else row[x]._pub_label
+
+    def row_labels(self, y: int, prv: bool = False) -> List[Optional[str]]:
+        """Return the labels of row y, building no row as label_at.
+
+        Args:
+            y: Row to read.
+            prv: Return the private labels instead of the public ones.
+
+        Returns:
+            List[Optional[str]]: The label of each square of the row.
+        """
+        row = self._grid[y]
+        if row is None:
+            return [
+                self.def_prv_label if prv else self.def_pub_label
+            ] * self.side_length
+        if prv:
+            return [sq._prv_label for sq in row]
+        return [sq._pub_label for sq in row]
 
     def square_valid(self, sq: Square) -> bool:
-        """Returns True if point is within grid bounds."""
-        if (sq.x < 0) or (cfg.GRID_SIZE <= sq.x):
-            return False
-        if (sq.y < 0) or (cfg.GRID_SIZE <= sq.y):
-            return False
-        return True
+        """Returns True if point is within grid bounds and not blocked."""
+        index = self._index(sq)
+        return index is not None and self.topology.valid()[index]
 
     def surrounding_squares(self, sq: Square) -> List[Square]:
         """Return Squares that are up, down, left, right from given."""
-        surrounding = [
-            self.projected_from(sq, Direction.UP),
-            self.projected_from(sq, Direction.LEFT),
-            self.projected_from(sq, Direction.RIGHT),
-            self.projected_from(sq, Direction.DOWN),
-        ]
-        return list(filter(None, surrounding))
+        return self._adjacent(sq, SURROUNDING_DIRECTIONS)
 
     def reticle_squares(self, sq: Square) -> List[Square]:
         """Return all surrounding squares."""
-        corners = [
-            self.projected_from(sq, Direction.UP_LEFT),
-            self.projected_from(sq, Direction.UP),
-            self.projected_from(sq, Direction.UP_RIGHT),
-            self.projected_from(sq, Direction.LEFT),
-            self.projected_from(sq, Direction.RIGHT),
-            self.projected_from(sq, Direction.DOWN_LEFT),
-            self.projected_from(sq, Direction.DOWN),
-            self.projected_from(sq, Direction.DOWN_RIGHT),
-        ]
-        return list(filter(None, corners))
+        return self._adjacent(sq, RETICLE_DIRECTIONS)
+
+    def _adjacent(self, sq: Square, directions: Tuple[Direction, ...]) -> List[Square]:
+        """Return in-bounds Squares one step from given in each direction."""
+        index = self._index(sq)
+        if index is None:
+            return []
+        table = self.topology.adjacency(directions)
+        return [self.get_square_index(i) for i in table[index]]
 
     def grid_string_labels(self, prv: Optional[bool] = False) -> str:
         """Return simple string representation of grid.
@@ -168,10 +507,12 @@ class Grid:
         str: String representation of grid. Spaces between
         squares on a row, newlines between rows.
         """
-        return "\n".join(
-            " ".join([(s.prv_label if prv else s.pub_label) or " " for s in row])
-            for row in self._grid
-        )
+        renderer = self._renderers.get(bool(prv))
+        if renderer is None:
+            from fightgrid.render import GridRenderer
+
+            renderer = self._renderers[bool(prv)] = GridRenderer(self, bool(prv))
+        return renderer.render()
 
     def __repr__(self) -> str:
         """Return a string representation of Grid."""
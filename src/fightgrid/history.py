@@ -0,0 +1,147 @@
+"""Undo and redo of moves on a Grid, for search that walks a game tree.
+
+A History listens to a Grid and records each change of a square's state
+or labels with its old and new value. Ending a move groups the changes
+made since the last one, so a search can play a move, explore below it
+and take it back again on the same grid, undoing only the squares the
+move changed instead of copying the grid at every node. Grid.fork gives
+a cheap copy where the search needs to branch and keep both lines.
+"""
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from fightgrid.grid import Grid
+from fightgrid.grid import Square
+
+
+class Change(NamedTuple):
+    """A field of the square with the given row-major index changed."""
+
+    square: int
+    field: str
+    old: Any
+    new: Any
+
+
+Move = Tuple[Change, ...]
+
+
+class History:
+    """Undo and redo stacks of the moves made on a Grid.
+
+    Args:
+        grid: Grid whose changes are recorded from now on.
+        limit: Most moves kept for undo, oldest dropped first; None keeps
+            every move.
+
+    Raises:
+        ValueError: If limit is less than 1.
+    """
+
+    def __init__(self, grid: Grid, limit: Optional[int] = None) -> None:
+        """Initialize History with nothing to undo."""
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1.")
+        self.grid = grid
+        self.limit = limit
+        self._pending: List[Change] = []
+        self._undo: List[Move] = []
+        self._redo: List[Move] = []
+        self._replaying = False
+        grid.add_listener(self._on_change)
+
+    def detach(self) -> None:
+        """Stop recording changes of the grid."""
+        self.grid.remove_listener(self._on_change)
+
+    def _on_change(self, sq: Square, field: str, old: Any, new: Any) -> None:
+        """Record a change made outside undo and redo."""
+        if self._replaying:
+            return
+        self._pending.append(
+            Change(sq.y * self.grid.side_length + sq.x, field, old, new)
+        )
+        self._redo.clear()
+
+    def end_move(self) -> bool:
+        """Group the changes since the last move into one move.
+
+        Returns:
+            bool: True if a move was recorded, False if nothing changed.
+        """
+        if not self._pending:
+            return False
+        self._undo.append(tuple(self._pending))
+        self._pending.clear()
+        if self.limit is not None and len(self._undo) > self.limit:
+            del self._undo[0]
+        return True
+
+    @contextmanager
+    def move(self) -> Iterator["History"]:
+        """Record the changes made in a with block as one move."""
+        self.end_move()
+        yield self
+        self.end_move()
+
+    @property
+    def can_undo(self) -> bool:
+        """True if there is a move, finished or not, to undo."""
+        return bool(self._pending or self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        """True if there is an undone move to redo."""
+        return bool(self._redo)
+
+    def __len__(self) -> int:
+        """Return number of moves that can be undone."""
+        return len(self._undo) + bool(self._pending)
+
+    def _set(self, changes: Move, new: bool) -> None:
+        """Set each changed field to its new or its old value."""
+        self._replaying = True
+        try:
+            for change in changes:
+                sq = self.grid.get_square_index(change.square)
+                setattr(sq, change.field, change.new if new else change.old)
+        finally:
+            self._replaying = False
+
+    def undo(self) -> bool:
+        """Take back the last move, ending it first if still in progress.
+
+        Returns:
+            bool: True if a move was undone, False if there was none.
+        """
+        self.end_move()
+        if not self._undo:
+            return False
+        move = self._undo.pop()
+        self._set(move[::-1], new=False)
+        self._redo.append(move)
+        return True
+
+    def redo(self) -> bool:
+        """Make the last undone move again.
+
+        Returns:
+            bool: True if a move was redone, False if there was none.
+        """
+        if not self._redo:
+            return False
+        move = self._redo.pop()
+        self._set(move, new=True)
+        self._undo.append(move)
+        return True
+
+    def clear(self) -> None:
+        """Forget every move, keeping the grid as it is."""
+        self._pending.clear()
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,121 @@
+"""Load generator playing many concurrent matches against a MatchServer.
+
+Each simulated client fires at random unshot squares of the bot's board
+and starts a new match whenever one ends, until the run's time is up.
+The round trip of every move goes into a LatencyHistogram.
+"""
+import asyncio
+import json
+import random
+import time
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from fightgrid.server import MatchServer
+from fightgrid.server import encode
+from fightgrid.simulate import LatencyHistogram
+
+
+class LoadReport:
+    """Moves, matches and latency measured over a load run."""
+
+    def __init__(
+        self, moves: int, matches: int, seconds: float, latency: LatencyHistogram
+    ) -> None:
+        """Initialize LoadReport."""
+        self.moves = moves
+        self.matches = matches
+        self.seconds = seconds
+        self.latency = latency
+
+    def moves_per_second(self) -> float:
+        """Return moves answered per second of wall time."""
+        return self.moves / self.seconds if self.seconds else 0.0
+
+    def format(self) -> str:
+        """Return report as lines of text."""
+        percentiles = ", ".join(
+            f"p{p}={self.latency.percentile(p) / 1e6:.2f}ms" for p in (50, 90, 99, 99.9)
+        )
+        return "\n".join(
+            [
+                f"moves: {self.moves} in {self.seconds:.2f}s "
+                f"({self.moves_per_second():.0f} moves/s, "
+                f"{self.matches} matches finished)",
+                f"round trip: {percentiles}",
+            ]
+        )
+
+
+async def _client(
+    host: str, port: int, deadline: float, latency: LatencyHistogram, seed: int
+) -> Tuple[int, int]:
+    """Play matches until deadline, returning moves and matches finished."""
+    rng = random.Random(seed)  # noqa: S311
+    moves = matches = 0
+    while time.perf_counter() < deadline:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            start = json.loads(await reader.readline())
+            if start["op"] != "start":
+                # The server is full; let earlier matches wind down.
+                await asyncio.sleep(0.01)
+                continue
+            side = start["size"]
+            targets = [(x, y) for y in range(side) for x in range(side)]
+            rng.shuffle(targets)
+            # Firing at every square sinks the fleet, so targets last the match.
+            while time.perf_counter() < deadline:
+                x, y = targets.pop()
+                sent = time.perf_counter_ns()
+                writer.write(encode({"op": "fire", "x": x, "y": y}))
+                result = json.loads(await reader.readline())
+                latency.add(time.perf_counter_ns() - sent)
+                moves += 1
+                if result.get("winner"):
+                    matches += 1
+                    break
+        finally:
+            writer.close()
+    return moves, matches
+
+
+async def run_load(
+    host: str,
+    port: int,
+    connections: int = 100,
+    seconds: float = 10.0,
+    seed: int = 0,
+) -> LoadReport:
+    """Play matches over concurrent connections for a number of seconds."""
+    latency = LatencyHistogram()
+    start = time.perf_counter()
+    deadline = start + seconds
+    results: List[Tuple[int, int]] = await asyncio.gather(
+        *(_client(host, port, deadline, latency, seed + i) for i in range(connections))
+    )
+    elapsed = time.perf_counter() - start
+    return LoadReport(
+        sum(moves for moves, _ in results),
+        sum(matches for _, matches in results),
+        elapsed,
+        latency,
+    )
+
+
+async def run_local(
+    connections: int = 100,
+    seconds: float = 10.0,
+    seed: int = 0,
+    server: Optional[MatchServer] = None,
+) -> LoadReport:
+    """Start a MatchServer in this event loop and run load against it."""
+    server = server or MatchServer(seed=seed, max_matches=2 * connections)
+    listening = await server.start("127.0.0.1", 0)
+    port = listening.sockets[0].getsockname()[1]
+    try:
+        return await run_load("127.0.0.1", port, connections, seconds, seed)
+    finally:
+        listening.close()
+        await listening.wait_closed()
@@ -0,0 +1,332 @@
+"""Append-only log of Grid changes, with replay and keyframe seeking.
+
+A MoveLogWriter listens to a Grid and streams every state and label
+change to a binary file as it happens, along with entity placements
+and the end of each move. Every keyframe_interval moves it also writes
+a snapshot of the whole grid, so a MoveLogReader can restore the grid
+as of any move by loading the nearest earlier keyframe and applying
+only the changes after it.
+
+File layout, all integers little-endian: magic ``FGML``, u16 version,
+u32 width and u32 height, then records of a u8 kind, u32 payload length
+and the payload. A keyframe for move 0 always follows the header, and
+keyframe snapshots carry the rest of the grid's topology.
+"""
+import struct
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from fightgrid import snapshot
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.placement import Placement
+
+
+MAGIC = b"FGML"
+VERSION = 2
+HEADER = struct.Struct("<4sHII")
+RECORD = struct.Struct("<BI")
+
+STATE_CHANGE = 1
+LABEL_CHANGE = 2
+ENTITY_PLACED = 3
+MOVE_END = 4
+KEYFRAME = 5
+
+LABEL_FIELDS = ("pub_label", "prv_label", "highlight")
+
+_STATE = struct.Struct("<IBB")
+_LABEL = struct.Struct("<IB")
+_PLACED = struct.Struct("<IIBH")
+_MOVE = struct.Struct("<I")
+_TEXT = struct.Struct("<i")
+
+_STATES_BY_VALUE = {state.value: state for state in SqState}
+_DIRECTIONS_BY_VALUE = {direction.value: direction for direction in Direction}
+
+
+class StateChange(NamedTuple):
+    """State of the square with the given row-major index changed."""
+
+    square: int
+    old: SqState
+    new: SqState
+
+
+class LabelChange(NamedTuple):
+    """A label field of the square with the given index changed."""
+
+    square: int
+    field: str
+    old: Optional[str]
+    new: Optional[str]
+
+
+class EntityPlaced(NamedTuple):
+    """An entity was placed with its bow at x and y."""
+
+    name: str
+    x: int
+    y: int
+    direction: Direction
+    length: int
+
+
+class MoveEnd(NamedTuple):
+    """Changes up to here make up the given move."""
+
+    move: int
+
+
+class Keyframe(NamedTuple):
+    """Snapshot of the whole grid at the end of the given move."""
+
+    move: int
+    data: bytes
+
+
+Event = Union[StateChange, LabelChange, EntityPlaced, MoveEnd, Keyframe]
+
+
+def _pack_text(text: Optional[str]) -> bytes:
+    """Return optional text as i32 length, -1 for None, and UTF-8 bytes."""
+    if text is None:
+        return _TEXT.pack(-1)
+    encoded = text.encode("utf-8")
+    return _TEXT.pack(len(encoded)) + encoded
+
+
+def _unpack_text(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    """Return optional text packed at offset and the offset after it."""
+    (length,) = _TEXT.unpack_from(data, offset)
+    offset += _TEXT.size
+    if length < 0:
+        return None, offset
+    return data[offset : offset + length].decode("utf-8"), offset + length
+
+
+def encode(event: Event) -> Tuple[int, bytes]:
+    """Return record kind and payload of event."""
+    if isinstance(event, StateChange):
+        return STATE_CHANGE, _STATE.pack(event.square, event.old.value, event.new.value)
+    if isinstance(event, LabelChange):
+        head = _LABEL.pack(event.square, LABEL_FIELDS.index(event.field))
+        return LABEL_CHANGE, head + _pack_text(event.old) + _pack_text(event.new)
+    if isinstance(event, EntityPlaced):
+        head = _PLACED.pack(event.x, event.y, event.direction.value, event.length)
+        return ENTITY_PLACED, head + event.name.encode("utf-8")
+    if isinstance(event, MoveEnd):
+        return MOVE_END, _MOVE.pack(event.move)
+    return KEYFRAME, _MOVE.pack(event.move) + event.data
+
+
+def decode(kind: int, payload: bytes) -> Event:
+    """Return event from record kind and payload.
+
+    Args:
+        kind: Record kind, such as STATE_CHANGE.
+        payload: Record payload.
+
+    Returns:
+        Event: The decoded event.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    if kind == STATE_CHANGE:
+        index, old, new = _STATE.unpack(payload)
+        return StateChange(index, _STATES_BY_VALUE[old], _STATES_BY_VALUE[new])
+    if kind == LABEL_CHANGE:
+        index, field = _LABEL.unpack_from(payload)
+        old_label, offset = _unpack_text(payload, _LABEL.size)
+        new_label, _ = _unpack_text(payload, offset)
+        return LabelChange(index, LABEL_FIELDS[field], old_label, new_label)
+    if kind == ENTITY_PLACED:
+        x, y, direction, length = _PLACED.unpack_from(payload)
+        name = payload[_PLACED.size :].decode("utf-8")
+        return EntityPlaced(name, x, y, _DIRECTIONS_BY_VALUE[direction], length)
+    if kind == MOVE_END:
+        return MoveEnd(*_MOVE.unpack(payload))
+    if kind == KEYFRAME:
+        (move,) = _MOVE.unpack_from(payload)
+        return Keyframe(move, payload[_MOVE.size :])
+    raise ValueError(f"Unknown move log record kind {kind}.")
+
+
+def apply(grid: Grid, event: Event) -> None:
+    """Apply a change event to grid; other events are ignored."""
+    if isinstance(event, StateChange):
+        grid.get_square_index(event.square).state = event.new
+    elif isinstance(event, LabelChange):
+        setattr(grid.get_square_index(event.square), event.field, event.new)
+
+
+class MoveLogWriter:
+    """Stream changes of a Grid to a binary file.
+
+    Args:
+        grid: Grid whose changes are recorded from now on.
+        file: Binary file opened for writing.
+        keyframe_interval: Moves between keyframes, 0 for none after the
+            first.
+    """
+
+    def __init__(self, grid: Grid, file: BinaryIO, keyframe_interval: int = 32):
+        """Initialize MoveLogWriter, writing header and first keyframe."""
+        self.grid = grid
+        self.file = file
+        self.keyframe_interval = keyframe_interval
+        self.move = 0
+        file.write(HEADER.pack(MAGIC, VERSION, grid.side_length, grid.height))
+        self.write(Keyframe(0, snapshot.dumps(grid)))
+        grid.add_listener(self._on_change)
+
+    def write(self, event: Event) -> None:
+        """Append one event to the log."""
+        kind, payload = encode(event)
+        self.file.write(RECORD.pack(kind, len(payload)))
+        self.file.write(payload)
+
+    def _on_change(self, sq: Square, field: str, old: Any, new: Any) -> None:
+        """Record a change of the grid."""
+        index = sq.y * self.grid.side_length + sq.x
+        if field == "state":
+            self.write(StateChange(index, old, new))
+        else:
+            self.write(LabelChange(index, field, old, new))
+
+    def record_placement(self, placement: Placement) -> None:
+        """Record that an entity was placed."""
+        span = placement.span
+        self.write(
+            EntityPlaced(
+                placement.name, span.x, span.y, span.direction, len(span.indices)
+            )
+        )
+
+    def end_move(self) -> int:
+        """Mark the end of a move, writing a keyframe if one is due.
+
+        Returns:
+            int: Number of the move just ended, starting from 1.
+        """
+        self.move += 1
+        self.write(MoveEnd(self.move))
+        if self.keyframe_interval and not self.move % self.keyframe_interval:
+            self.write(Keyframe(self.move, snapshot.dumps(self.grid)))
+        return self.move
+
+    def close(self) -> None:
+        """Stop recording and flush the file, leaving it open."""
+        self.grid.remove_listener(self._on_change)
+        self.file.flush()
+
+    def __enter__(self) -> "MoveLogWriter":
+        """Return self for use as context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the writer."""
+        self.close()
+
+
+class MoveLogReader:
+    """Read and replay a move log from a seekable binary file.
+
+    Raises:
+        ValueError: If the file does not hold a supported move log.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        """Initialize MoveLogReader by reading the header."""
+        self.file = file
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("File is too short to hold a move log.")
+        magic, version, width, height = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("File does not hold a FightGrid move log.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported move log version {version}.")
+        self.side_length: int = width
+        self.height: int = height
+        self._start = file.tell()
+        self._keyframes: Optional[Dict[int, int]] = None
+
+    def _records(self, offset: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield offset, kind and payload length of records from offset."""
+        file = self.file
+        while True:
+            file.seek(offset)
+            head = file.read(RECORD.size)
+            if len(head) < RECORD.size:
+                return
+            kind, length = RECORD.unpack(head)
+            yield offset, kind, length
+            offset += RECORD.size + length
+
+    def events(self, offset: Optional[int] = None) -> Iterator[Event]:
+        """Yield every event from offset, by default from the start."""
+        for record_offset, kind, length in self._records(
+            self._start if offset is None else offset
+        ):
+            self.file.seek(record_offset + RECORD.size)
+            payload = self.file.read(length)
+            if len(payload) < length:
+                return
+            yield decode(kind, payload)
+
+    def keyframes(self) -> Dict[int, int]:
+        """Return file offset of each keyframe by move, skipping payloads."""
+        if self._keyframes is None:
+            self._keyframes = {}
+            for offset, kind, _ in self._records(self._start):
+                if kind == KEYFRAME:
+                    self.file.seek(offset + RECORD.size)
+                    (move,) = _MOVE.unpack(self.file.read(_MOVE.size))
+                    self._keyframes[move] = offset
+        return self._keyframes
+
+    def moves(self) -> int:
+        """Return number of complete moves in the log."""
+        return sum(1 for event in self.events() if isinstance(event, MoveEnd))
+
+    def replay(self, move: Optional[int] = None) -> Grid:
+        """Return Grid as of the end of move, by default of the last move.
+
+        Args:
+            move: Move to stop after; 0 gives the grid before any move.
+
+        Returns:
+            Grid: New Grid restored from the nearest keyframe at or before
+            move, with the changes after it applied.
+
+        Raises:
+            ValueError: If move is negative or past the end of the log.
+        """
+        if move is not None and move < 0:
+            raise ValueError(f"Move {move} is negative.")
+        keyframes = self.keyframes()
+        usable = [m for m in keyframes if move is None or m <= move]
+        start = max(usable)
+        events = self.events(keyframes[start])
+        first = next(events)
+        assert isinstance(first, Keyframe)  # noqa: S101
+        grid = snapshot.loads(first.data).to_grid()
+        if move == start:
+            return grid
+        for event in events:
+            if isinstance(event, MoveEnd) and event.move == move:
+                return grid
+            apply(grid, event)
+        if move is not None:
+            raise ValueError(f"Move log ends before move {move}.")
+        return grid
@@ -0,0 +1,213 @@
+"""Move and flip placed entities, resolving a turn of moves at once.
+
+A Move shifts an entity a distance along a Direction, or with FLIP
+mirrors it across the diagonal through its bow square, so an entity
+extending RIGHT then extends DOWN and one extending UP then extends
+LEFT. NONE leaves it where it is.
+
+Everything a move needs to be checked is cached per starting Span as
+a bitmask: the Span it ends on and the squares it sweeps through on the
+way, being each intermediate Span of a shift and the triangle between
+the two arms of a flip. Checking a move against the fleet's Occupancy
+is then a bitwise AND, however long the entity or far the move.
+
+resolve takes every move of a turn together. A move fails if it leaves
+the grid, sweeps a blocked square or squares of an entity that stays
+put, or sweeps squares another move also sweeps, in which case both
+fail. Failed entities stay put and so block the moves sweeping through
+them, which are failed in turn until no more fail; the rest are applied
+in one relocation.
+"""
+from functools import lru_cache
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from fightgrid.grid import DIRECTION_OFFSETS
+from fightgrid.grid import Direction
+from fightgrid.grid import SqState
+from fightgrid.placement import Fleet
+from fightgrid.placement import Span
+from fightgrid.placement import make_span
+from fightgrid.topology import Topology
+
+
+_DIRECTIONS_BY_OFFSET = {offset: d for d, offset in DIRECTION_OFFSETS.items()}
+
+FLIPPED: Dict[Direction, Direction] = {
+    direction: _DIRECTIONS_BY_OFFSET[(dy, dx)]
+    for direction, (dx, dy) in DIRECTION_OFFSETS.items()
+}
+
+
+class Move(NamedTuple):
+    """Move of the named entity a distance along direction, or a FLIP."""
+
+    name: str
+    direction: Direction
+    distance: int = 1
+
+
+class Path(NamedTuple):
+    """Span a move ends on and mask of the squares it sweeps through."""
+
+    span: Span
+    swept: int
+
+
+class Resolution(NamedTuple):
+    """New Spans of the entities moved and the moves that failed."""
+
+    moved: Dict[str, Span]
+    failed: Tuple[Move, ...]
+
+
+def plan(
+    side_length: int,
+    span: Span,
+    direction: Direction,
+    distance: int = 1,
+    topology: Optional[Topology] = None,
+) -> Optional[Path]:
+    """Return Path of a move of the entity on span, None if it leaves the grid.
+
+    Args:
+        side_length: Length of each side of a square grid.
+        span: Span the entity covers.
+        direction: Direction of the move, FLIP or NONE.
+        distance: Squares to move; ignored by FLIP and NONE.
+        topology: Shape of the grid, overriding side_length.
+
+    Returns:
+        Optional[Path]: Span after the move and squares swept on the way,
+        including those of the final Span; None if the move leaves the
+        grid or sweeps a blocked square.
+    """
+    return _plan(topology or Topology.square(side_length), span, direction, distance)
+
+
+@lru_cache(maxsize=65536)
+def _plan(
+    topology: Topology, span: Span, direction: Direction, distance: int
+) -> Optional[Path]:
+    """Return Path of a move of the entity on span across topology."""
+    length = len(span.indices)
+    if direction is Direction.NONE:
+        return Path(span, span.mask)
+    if direction is Direction.FLIP:
+        return _flip(topology, span, length)
+    if distance < 0:
+        return None
+    swept = 0
+    end = span
+    for step in range(1, distance + 1):
+        bow = topology.project(span.indices[0], direction, step)
+        if bow is None:
+            return None
+        y, x = divmod(bow, topology.width)
+        moved = make_span(topology.width, x, y, span.direction, length, topology)
+        if moved is None:
+            return None
+        swept |= moved.mask
+        end = moved
+    return Path(end, swept or span.mask)
+
+
+def _flip(topology: Topology, span: Span, length: int) -> Optional[Path]:
+    """Return Path of span mirrored across the diagonal through its bow."""
+    direction = FLIPPED[span.direction]
+    width = topology.width
+    flipped = make_span(width, span.x, span.y, direction, length, topology)
+    if flipped is None:
+        return None
+    swept = 0
+    # Both arms fit, but a square between them may still be blocked.
+    for i, start in enumerate(span.indices):
+        for j in range(length - i):
+            index = topology.project(start, direction, j) if j else start
+            if index is None:
+                return None
+            swept |= 1 << index
+    return Path(flipped, swept)
+
+
+def _plan_moves(
+    fleet: Fleet, moves: Sequence[Move]
+) -> Tuple[Dict[str, Path], Dict[str, Move], List[Move]]:
+    """Return Path of each move that stays on the grid, moves by name and the rest.
+
+    Args:
+        fleet: Fleet whose entities move.
+        moves: Moves to plan, at most one per entity.
+
+    Returns:
+        Tuple[Dict[str, Path], Dict[str, Move], List[Move]]: Path of each
+        move that stays on the grid, every move by entity name, and the
+        moves that fail, leaving the grid or moving a sunk entity.
+
+    Raises:
+        ValueError: If an entity is not placed or has more than one move.
+    """
+    grid = fleet.grid
+    paths: Dict[str, Path] = {}
+    by_name: Dict[str, Move] = {}
+    failed: List[Move] = []
+    for move in moves:
+        placement = fleet.occupancy.placements.get(move.name)
+        if placement is None:
+            raise ValueError(f"{move.name} is not placed.")
+        if move.name in by_name:
+            raise ValueError(f"{move.name} has more than one move.")
+        by_name[move.name] = move
+        if move.direction is Direction.NONE:
+            continue
+        span = placement.span
+        path = plan(
+            grid.side_length, span, move.direction, move.distance, grid.topology
+        )
+        sunk = grid.get_square_index(span.indices[0]).state is SqState.SUNK
+        if path is None or sunk:
+            failed.append(move)
+        else:
+            paths[move.name] = path
+    return paths, by_name, failed
+
+
+def resolve(fleet: Fleet, moves: Sequence[Move], apply: bool = True) -> Resolution:
+    """Resolve simultaneous moves of entities of fleet.
+
+    Args:
+        fleet: Fleet whose entities move.
+        moves: At most one Move per entity.
+        apply: Relocate the entities whose moves succeed; if False, only
+            work out which would.
+
+    Returns:
+        Resolution: New Span of each entity moved and the failed moves.
+        SUNK entities cannot move, and NONE moves are left out of both.
+    """
+    occupancy = fleet.occupancy
+    paths, by_name, failed = _plan_moves(fleet, moves)
+    changed = True
+    while changed:
+        # Squares of every entity staying put, and those swept twice.
+        staying = occupancy.mask
+        for name in paths:
+            staying &= ~occupancy.placements[name].span.mask
+        seen = contested = 0
+        for path in paths.values():
+            contested |= seen & path.swept
+            seen |= path.swept
+        blocked = staying | contested
+        stopped = [name for name, path in paths.items() if path.swept & blocked]
+        for name in stopped:
+            del paths[name]
+            failed.append(by_name[name])
+        changed = bool(stopped)
+    moved = {name: path.span for name, path in paths.items()}
+    if apply and moved:
+        fleet.relocate(moved)
+    return Resolution(moved, tuple(failed))
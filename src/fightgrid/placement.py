@@ -0,0 +1,340 @@
+"""Place entities of config.ENTITY_SIZES on a Grid.
+
+An entity covers a straight run of squares starting at its bow square
+and extending along a Direction. Covered squares are kept as a Span,
+with both their row-major indexes and a bitmask of them, so collision
+checks against an Occupancy are a single bitwise AND. Spans follow the
+grid's Topology, wrapping across the edges of a torus and never covering
+a blocked square.
+"""
+import random
+from functools import lru_cache
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.grid import DIRECTION_OFFSETS
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.topology import Topology
+
+
+# Placing along LEFT or UP covers the same squares as RIGHT or DOWN from
+# the other end, so these two orientations enumerate every placement.
+PLACEMENT_DIRECTIONS = (Direction.RIGHT, Direction.DOWN)
+
+
+class Span(NamedTuple):
+    """Squares covered by an entity of some length."""
+
+    x: int
+    y: int
+    direction: Direction
+    indices: Tuple[int, ...]
+    mask: int
+
+
+class Placement(NamedTuple):
+    """Named entity occupying a Span."""
+
+    name: str
+    span: Span
+
+
+def make_span(
+    side_length: int,
+    x: int,
+    y: int,
+    direction: Direction,
+    length: int,
+    topology: Optional[Topology] = None,
+) -> Optional[Span]:
+    """Return Span from x, y along direction, or None if it does not fit.
+
+    Args:
+        side_length: Length of each side of a square grid.
+        x: Column of the bow square.
+        y: Row of the bow square.
+        direction: Direction the rest of the span extends in.
+        length: Number of squares covered.
+        topology: Shape of the grid, overriding side_length.
+
+    Returns:
+        Optional[Span]: The covered squares, None if they leave the grid,
+        include a blocked square or, on a torus, repeat a square.
+    """
+    if topology is None:
+        topology = Topology.square(side_length)
+    if direction not in DIRECTION_OFFSETS:
+        return None
+    if not (0 <= x < topology.width and 0 <= y < topology.height):
+        return None
+    bow = y * topology.width + x
+    if not topology.valid()[bow]:
+        return None
+    step = topology.neighbors(direction)
+    index: Optional[int] = bow
+    indices = []
+    mask = 0
+    for _ in range(length):
+        if index is None or mask >> index & 1:
+            return None
+        indices.append(index)
+        mask |= 1 << index
+        index = step[index]
+    return Span(x, y, direction, tuple(indices), mask)
+
+
+def legal_spans(
+    side_length: int, length: int, topology: Optional[Topology] = None
+) -> Tuple[Span, ...]:
+    """Return every Span of length fitting on an empty grid.
+
+    Args:
+        side_length: Length of each side of a square grid.
+        length: Number of squares covered.
+        topology: Shape of the grid, overriding side_length.
+
+    Returns:
+        Tuple[Span, ...]: The spans, the same tuple for every call with
+        the same shape and length.
+    """
+    return _legal_spans(topology or Topology.square(side_length), length)
+
+
+@lru_cache(maxsize=256)
+def _legal_spans(topology: Topology, length: int) -> Tuple[Span, ...]:
+    """Return every Span of length fitting on an empty grid of topology."""
+    spans = []
+    for direction in PLACEMENT_DIRECTIONS:
+        for y in range(topology.height):
+            for x in range(topology.width):
+                span = make_span(topology.width, x, y, direction, length, topology)
+                if span is not None:
+                    spans.append(span)
+    if length == 1:
+        # Both orientations of a single square are the same placement.
+        return tuple(spans[: len(spans) // 2])
+    return tuple(spans)
+
+
+def fleet_layouts(
+    side_length: int,
+    lengths: Tuple[int, ...],
+    occupied: int = 0,
+    topology: Optional[Topology] = None,
+) -> Iterator[Tuple[Span, ...]]:
+    """Yield every non-overlapping layout of entities with given lengths.
+
+    Args:
+        side_length: Length of each side of a square grid.
+        lengths: Length of each entity, in placement order.
+        occupied: Mask of squares no entity may cover.
+        topology: Shape of the grid, overriding side_length.
+
+    Yields:
+        Tuple[Span, ...]: One Span per entry of lengths.
+    """
+    if not lengths:
+        yield ()
+        return
+    for span in legal_spans(side_length, lengths[0], topology):
+        if not span.mask & occupied:
+            rest_occupied = occupied | span.mask
+            for rest in fleet_layouts(
+                side_length, lengths[1:], rest_occupied, topology
+            ):
+                yield (span,) + rest
+
+
+class Occupancy:
+    """Index of which squares are covered by which entity."""
+
+    def __init__(self) -> None:
+        """Initialize empty Occupancy."""
+        self.mask = 0
+        self.placements: Dict[str, Placement] = {}
+        self._owners: Dict[int, str] = {}
+
+    def fits(self, span: Span) -> bool:
+        """Return True if span covers no occupied square."""
+        return not span.mask & self.mask
+
+    def add(self, placement: Placement) -> None:
+        """Mark squares of placement as occupied by it."""
+        self.mask |= placement.span.mask
+        self.placements[placement.name] = placement
+        for index in placement.span.indices:
+            self._owners[index] = placement.name
+
+    def remove(self, name: str) -> Placement:
+        """Clear squares occupied by the named entity and return it."""
+        placement = self.placements.pop(name)
+        self.mask &= ~placement.span.mask
+        for index in placement.span.indices:
+            del self._owners[index]
+        return placement
+
+    def owner(self, index: int) -> Optional[str]:
+        """Return name of entity covering index, or None."""
+        return self._owners.get(index)
+
+
+class Fleet:
+    """Entities of given sizes placed on a Grid.
+
+    Placed squares become HIDDEN, with the first letter of the entity's
+    name as their private label.
+    """
+
+    def __init__(self, grid: Grid, sizes: Mapping[str, int] = cfg.ENTITY_SIZES):
+        """Initialize Fleet of unplaced entities for grid."""
+        self.grid = grid
+        self.sizes = dict(sizes)
+        self.occupancy = Occupancy()
+        self._saved_labels: Dict[int, Optional[str]] = {}
+
+    def span(self, name: str, x: int, y: int, direction: Direction) -> Optional[Span]:
+        """Return Span the named entity would cover, None if off the grid."""
+        grid = self.grid
+        return make_span(
+            grid.side_length, x, y, direction, self.sizes[name], grid.topology
+        )
+
+    def can_place(self, name: str, x: int, y: int, direction: Direction) -> bool:
+        """Return True if the named entity fits at x, y along direction."""
+        if name in self.occupancy.placements:
+            return False
+        span = self.span(name, x, y, direction)
+        return span is not None and self.occupancy.fits(span)
+
+    def place(self, name: str, x: int, y: int, direction: Direction) -> Placement:
+        """Place the named entity with its bow at x, y along direction.
+
+        Args:
+            name: Key of the entity in sizes.
+            x: Column of the bow square.
+            y: Row of the bow square.
+            direction: Direction the rest of the entity extends in.
+
+        Returns:
+            Placement: The entity's name and covered Span.
+
+        Raises:
+            ValueError: If already placed, off the grid or colliding.
+        """
+        if name in self.occupancy.placements:
+            raise ValueError(f"{name} is already placed.")
+        span = self.span(name, x, y, direction)
+        if span is None:
+            raise ValueError(f"{name} does not fit on the grid there.")
+        if not self.occupancy.fits(span):
+            raise ValueError(f"{name} collides with another entity.")
+        return self._add(Placement(name, span))
+
+    def _add(self, placement: Placement) -> Placement:
+        """Record placement and mark its squares on the grid."""
+        self.occupancy.add(placement)
+        for index in placement.span.indices:
+            sq = self.grid.get_square_index(index)
+            self._saved_labels[index] = sq.prv_label
+            sq.prv_label = placement.name[0]
+            sq.state = SqState.HIDDEN
+        return placement
+
+    def remove(self, name: str) -> Placement:
+        """Remove the named entity, restoring its squares on the grid."""
+        placement = self.occupancy.remove(name)
+        for index in placement.span.indices:
+            sq = self.grid.get_square_index(index)
+            sq.prv_label = self._saved_labels.pop(index)
+            sq.state = SqState.EMPTY
+        return placement
+
+    def relocate(self, spans: Mapping[str, Span]) -> List[Placement]:
+        """Move placed entities to new Spans all at once.
+
+        Every entity is lifted before any is put down, so an entity may
+        move into squares another one leaves. The square at each position
+        along a new Span takes the state of the square at the same
+        position along the old one, so HITs move with the entity; squares
+        left behind become EMPTY with their private labels restored.
+
+        Args:
+            spans: New Span of each entity to move, of the entity's length.
+
+        Returns:
+            List[Placement]: The new placements.
+
+        Raises:
+            ValueError: If the new Spans overlap each other or an entity
+                that stays put; nothing is moved then.
+        """
+        moving = 0
+        for name in spans:
+            moving |= self.occupancy.placements[name].span.mask
+        taken = self.occupancy.mask & ~moving
+        for name, span in spans.items():
+            if span.mask & taken:
+                raise ValueError(f"{name} collides with another entity.")
+            taken |= span.mask
+        states = {
+            name: [
+                self.grid.get_square_index(index).state
+                for index in self.occupancy.placements[name].span.indices
+            ]
+            for name in spans
+        }
+        for name in spans:
+            self.remove(name)
+        placed = []
+        for name, span in spans.items():
+            placed.append(self._add(Placement(name, span)))
+            for index, state in zip(span.indices, states[name]):
+                self.grid.get_square_index(index).state = state
+        return placed
+
+    def entity_at(self, sq: Square) -> Optional[Placement]:
+        """Return Placement covering the given Square, or None."""
+        name = self.occupancy.owner(sq.y * self.grid.side_length + sq.x)
+        return None if name is None else self.occupancy.placements[name]
+
+    def place_random(self, rng: Optional[random.Random] = None) -> List[Placement]:
+        """Place every unplaced entity at random, largest first.
+
+        Args:
+            rng: Source of randomness, defaulting to the random module.
+
+        Returns:
+            List[Placement]: The new placements.
+
+        Raises:
+            ValueError: If an entity has no room left on the grid.
+        """
+        choice = (rng or random).choice
+        unplaced = [n for n in self.sizes if n not in self.occupancy.placements]
+        placed = []
+        for name in sorted(unplaced, key=self.sizes.__getitem__, reverse=True):
+            spans = legal_spans(
+                self.grid.side_length, self.sizes[name], self.grid.topology
+            )
+            span = None
+            for _ in range(16):
+                candidate = choice(spans) if spans else None
+                if candidate is not None and self.occupancy.fits(candidate):
+                    span = candidate
+                    break
+            if span is None:
+                fitting = [s for s in spans if self.occupancy.fits(s)]
+                if not fitting:
+                    raise ValueError(f"No room left on the grid for {name}.")
+                span = choice(fitting)
+            placed.append(self._add(Placement(name, span)))
+        return placed
@@ -0,0 +1,275 @@
+"""Opt-in call counting and timing of grid queries and game logic.
+
+A Profiler wraps the methods listed in its targets while it is enabled
+and puts the originals back when disabled, so instrumentation costs
+nothing unless switched on. Every call is counted. Timing is inclusive
+of callees and, to cut the cost of reading the clock, may be sampled on
+one call in every sample_every, scaling the sampled time by the count.
+
+Results export as JSON or in the Prometheus text exposition format.
+"""
+import functools
+import json
+import random
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.bitboard import BitBoard
+from fightgrid.game import Board
+from fightgrid.game import Shot
+from fightgrid.grid import Grid
+from fightgrid.render import GridRenderer
+from fightgrid.simulate import MoveCallback
+from fightgrid.simulate import play_match
+from fightgrid.strategies import Strategy
+from fightgrid.strategies import load_strategy
+from fightgrid.targeting import DensityMap
+
+
+Target = Tuple[type, str]
+
+GRID_TARGETS: Tuple[Target, ...] = tuple(
+    (Grid, name)
+    for name in (
+        "get_square",
+        "get_square_xy",
+        "get_square_index",
+        "projected_from",
+        "square_valid",
+        "surrounding_squares",
+        "reticle_squares",
+        "set_state",
+        "_state_changed",
+        "_label_changed",
+        "grid_string_labels",
+    )
+)
+
+DEFAULT_TARGETS: Tuple[Target, ...] = GRID_TARGETS + (
+    (GridRenderer, "render"),
+    (BitBoard, "frontier"),
+    (BitBoard, "unshot"),
+    (DensityMap, "best_target"),
+    (Board, "fire"),
+    (Strategy, "observe"),
+)
+
+_active: Optional["Profiler"] = None
+
+
+class Stat(NamedTuple):
+    """Calls of one method and the estimated seconds spent in them."""
+
+    name: str
+    calls: int
+    seconds: float
+
+
+class Profiler:
+    """Count and time calls of target methods while enabled.
+
+    Args:
+        targets: Classes and names of the methods to instrument.
+        sample_every: Time one call in this many; 1 times every call.
+
+    Raises:
+        ValueError: If sample_every is less than 1.
+    """
+
+    def __init__(
+        self, targets: Sequence[Target] = DEFAULT_TARGETS, sample_every: int = 1
+    ) -> None:
+        """Initialize Profiler, disabled and with nothing counted."""
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1.")
+        self.targets = tuple(targets)
+        self.sample_every = sample_every
+        self._calls: Dict[str, List[int]] = {}
+        self._originals: Dict[Target, Any] = {}
+
+    @staticmethod
+    def _name(target: Target) -> str:
+        """Return name a target is reported under."""
+        cls, attribute = target
+        return f"{cls.__name__}.{attribute}"
+
+    def _wrap(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Return method wrapped to count into the counters of name."""
+        # calls, timed calls and nanoseconds of the timed calls
+        counter = self._calls.setdefault(name, [0, 0, 0])
+        every = self.sample_every
+        clock = time.perf_counter_ns
+
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            counter[0] += 1
+            if counter[0] % every:
+                return method(*args, **kwargs)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                counter[1] += 1
+                counter[2] += clock() - start
+
+        return wrapper
+
+    @property
+    def enabled(self) -> bool:
+        """True while the target methods are instrumented."""
+        return bool(self._originals)
+
+    def enable(self) -> None:
+        """Instrument the target methods.
+
+        Raises:
+            RuntimeError: If another Profiler is enabled.
+        """
+        global _active
+        if self.enabled:
+            return
+        if _active is not None:
+            raise RuntimeError("Another Profiler is already enabled.")
+        for target in self.targets:
+            cls, attribute = target
+            original = cls.__dict__[attribute]
+            self._originals[target] = original
+            setattr(cls, attribute, self._wrap(self._name(target), original))
+        _active = self
+
+    def disable(self) -> None:
+        """Restore the original target methods, keeping the counts."""
+        global _active
+        for (cls, attribute), original in self._originals.items():
+            setattr(cls, attribute, original)
+        self._originals.clear()
+        if _active is self:
+            _active = None
+
+    def __enter__(self) -> "Profiler":
+        """Enable for the duration of a with block."""
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Disable at the end of a with block."""
+        self.disable()
+
+    def reset(self) -> None:
+        """Forget every count and time."""
+        for counter in self._calls.values():
+            counter[:] = [0, 0, 0]
+
+    def stats(self) -> List[Stat]:
+        """Return Stat of each called method, most time first."""
+        stats = []
+        for name, (calls, timed, nanoseconds) in self._calls.items():
+            if calls:
+                seconds = nanoseconds / 1e9 * calls / timed if timed else 0.0
+                stats.append(Stat(name, calls, seconds))
+        return sorted(stats, key=lambda s: (-s.seconds, -s.calls, s.name))
+
+    def to_json(self) -> str:
+        """Return stats as a JSON object."""
+        return json.dumps(
+            {
+                "sample_every": self.sample_every,
+                "methods": {
+                    s.name: {"calls": s.calls, "seconds": s.seconds}
+                    for s in self.stats()
+                },
+            },
+            indent=2,
+        )
+
+    def to_prometheus(self) -> str:
+        """Return stats in the Prometheus text exposition format."""
+        stats = self.stats()
+        lines = [
+            "# HELP fightgrid_calls_total Calls of instrumented methods.",
+            "# TYPE fightgrid_calls_total counter",
+        ]
+        lines += [
+            f'fightgrid_calls_total{{method="{s.name}"}} {s.calls}' for s in stats
+        ]
+        lines += [
+            "# HELP fightgrid_seconds_total Estimated seconds spent in instrumented"
+            " methods, including their callees.",
+            "# TYPE fightgrid_seconds_total counter",
+        ]
+        lines += [
+            f'fightgrid_seconds_total{{method="{s.name}"}} {s.seconds:.9f}'
+            for s in stats
+        ]
+        return "\n".join(lines) + "\n"
+
+    def format(self, wall_seconds: Optional[float] = None) -> str:
+        """Return hotspots as lines of text.
+
+        Args:
+            wall_seconds: Duration of the profiled run, to show each
+                method's share of it.
+
+        Returns:
+            str: One line per called method, most time first. Times
+            include callees, so shares can add up to more than 100%.
+        """
+        lines = [f"{'method':<28} {'calls':>10} {'seconds':>10} {'share':>7}"]
+        for s in self.stats():
+            share = f"{s.seconds / wall_seconds:7.1%}" if wall_seconds else ""
+            lines.append(f"{s.name:<28} {s.calls:>10} {s.seconds:>10.4f} {share:>7}")
+        if wall_seconds:
+            lines.append(f"wall time: {wall_seconds:.4f}s")
+        return "\n".join(lines)
+
+
+def _render_all(boards: Sequence[Board]) -> MoveCallback:
+    """Return move callback rendering every board, as a live view would."""
+
+    def render(player: int, x: int, y: int, shot: Shot, fired: Board) -> None:
+        for board in boards:
+            board.grid.grid_string_labels()
+
+    return render
+
+
+def workload(
+    games: int = 50,
+    strategies: Tuple[str, str] = ("density", "hunt"),
+    seed: int = 0,
+    side_length: int = cfg.GRID_SIZE,
+) -> int:
+    """Play matches, rendering both boards after every move as a live view.
+
+    Args:
+        games: Matches to play.
+        strategies: Names of the two players' strategies.
+        seed: Random seed.
+        side_length: Length of each side of the boards.
+
+    Returns:
+        int: Number of moves played.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    factories = (load_strategy(strategies[0]), load_strategy(strategies[1]))
+    moves = 0
+    for game in range(games):
+        boards = [Board(side_length, rng=rng) for _ in range(2)]
+        result = play_match(
+            factories,
+            rng,
+            game % 2,
+            side_length,
+            on_move=_render_all(boards),
+            boards=boards,
+        )
+        moves += result.moves
+    return moves
@@ -0,0 +1,116 @@
+"""Incremental text rendering of Grid labels.
+
+A GridRenderer listens to its Grid and remembers which rows and squares
+changed label since they were last drawn, so rendering re-joins only the
+changed rows and a live terminal view can be updated with ANSI cursor
+movements for just the changed squares.
+"""
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Set
+
+from fightgrid.grid import Grid
+from fightgrid.grid import Square
+
+
+BLANK = " "
+
+
+class GridRenderer:
+    """Cached string rendering of the public or private labels of a Grid.
+
+    Args:
+        grid: Grid to render; the renderer follows its label changes.
+        prv: Render private labels instead of public labels.
+    """
+
+    def __init__(self, grid: Grid, prv: bool = False) -> None:
+        """Initialize GridRenderer with every row dirty."""
+        self.grid = grid
+        self.prv = prv
+        self.field = "prv_label" if prv else "pub_label"
+        self._rows: List[str] = [""] * grid.height
+        self._dirty_rows: Set[int] = set(range(grid.height))
+        self._dirty_squares: Set[int] = set()
+        # Rows last drawn with a label wider than one character.
+        self._wide: Set[int] = set()
+        self._text: Optional[str] = None
+        grid.add_listener(self._on_change)
+
+    def detach(self) -> None:
+        """Stop following label changes of the grid."""
+        self.grid.remove_listener(self._on_change)
+
+    def _on_change(self, sq: Square, field: str, old: Any, new: Any) -> None:
+        """Mark the square and its row dirty after its label changed."""
+        if field == self.field:
+            self._dirty_rows.add(sq.y)
+            self._dirty_squares.add(sq.y * self.grid.side_length + sq.x)
+            self._text = None
+
+    def _label(self, index: int) -> str:
+        """Return the rendered label of the square at index."""
+        return self.grid.label_at(index, self.prv) or BLANK
+
+    def _is_wide(self, y: int) -> bool:
+        """Return True if rendered row y holds a label wider than one character."""
+        return len(self._rows[y]) != 2 * self.grid.side_length - 1
+
+    def render_row(self, y: int) -> str:
+        """Return row y, re-rendering it only if dirty."""
+        if y in self._dirty_rows:
+            if self._rows[y] and self._is_wide(y):
+                self._wide.add(y)
+            self._rows[y] = " ".join(
+                label or BLANK for label in self.grid.row_labels(y, self.prv)
+            )
+            self._dirty_rows.discard(y)
+        return self._rows[y]
+
+    def render(self) -> str:
+        """Return string of grid labels, as Grid.grid_string_labels."""
+        if self._text is None:
+            for y in sorted(self._dirty_rows):
+                self.render_row(y)
+            self._text = "\n".join(self._rows)
+        return self._text
+
+    def dirty_rows(self) -> Set[int]:
+        """Return rows changed since they were last rendered."""
+        return set(self._dirty_rows)
+
+    def ansi_updates(self, top: int = 1, left: int = 1) -> str:
+        """Return ANSI escapes redrawing squares changed since last call.
+
+        Args:
+            top: Terminal row, counting from 1, of the grid's first row.
+            left: Terminal column, counting from 1, of the grid's first square.
+
+        Returns:
+            str: Cursor moves and labels for each changed square. A row
+            holding any label wider than one character, now or when last
+            drawn, is redrawn whole and cleared to the end of the line,
+            as its squares do not sit in fixed columns.
+        """
+        side = self.grid.side_length
+        parts = []
+        drawn: Set[int] = set()
+        rewrite: Set[int] = set()
+        for index in sorted(self._dirty_squares):
+            y, x = divmod(index, side)
+            self.render_row(y)
+            drawn.add(y)
+            if y in self._wide or self._is_wide(y):
+                rewrite.add(y)
+            else:
+                parts.append(f"\x1b[{top + y};{left + 2 * x}H{self._label(index)}")
+        for y in sorted(rewrite):
+            parts.append(f"\x1b[{top + y};{left}H{self._rows[y]}\x1b[K")
+        for y in drawn:
+            if self._is_wide(y):
+                self._wide.add(y)
+            else:
+                self._wide.discard(y)
+        self._dirty_squares.clear()
+        return "".join(parts)
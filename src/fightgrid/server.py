@@ -0,0 +1,258 @@
+"""Asyncio match server playing connected clients against a bot.
+
+Each connection owns a Match: the client's own Board, which the bot
+fires upon, and the bot's Board, which the client fires upon. Messages
+are compact JSON objects, one per line. The client is sent the private
+labels of its own board and only the public labels of the bot's board.
+
+Every match pits one client against a bot; clients are not paired with
+each other. The opponent's side of a Match is its bot strategy, so the
+server answers each move at once and never waits on a second player.
+
+Client messages:
+
+- ``{"op": "fire", "x": 3, "y": 4}`` fires upon the bot's board at
+  integer coordinates; the bot answers with its own shot unless the
+  match is over;
+- ``{"op": "view"}`` asks for both boards as rows of labels;
+- ``{"op": "delta"}`` asks for the squares of each board changed since
+  the last delta, the first delta holding every square. See
+  fightgrid.views for the format.
+
+Every reply is a single line with an ``op`` of ``start``, ``result``,
+``view``, ``delta`` or ``error``.
+"""
+import asyncio
+import json
+import random
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+
+import fightgrid.config as cfg
+from fightgrid.game import Board
+from fightgrid.game import Shot
+from fightgrid.grid import Grid
+from fightgrid.strategies import load_strategy
+from fightgrid.views import PRIVATE
+from fightgrid.views import PUBLIC
+from fightgrid.views import GridView
+from fightgrid.views import Observer
+
+
+MAX_LINE = 1024
+
+Message = Dict[str, Any]
+
+
+def encode(message: Message) -> bytes:
+    """Return message as a compact JSON line."""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _rows(grid: Grid, prv: bool) -> List[str]:
+    """Return labels of grid as one string per row."""
+    return grid.grid_string_labels(prv=prv).split("\n")
+
+
+def _shot(board: Board, x: int, y: int, shot: Shot) -> Message:
+    """Return message describing a shot upon board."""
+    return {
+        "x": x,
+        "y": y,
+        "state": shot.state.name,
+        "sunk": shot.sunk,
+        "label": board.grid.get_square_xy(x, y).pub_label,
+    }
+
+
+def _coordinate(message: Message, key: str) -> int:
+    """Return integer coordinate key of message.
+
+    Args:
+        message: Message from the client.
+        key: Name of the coordinate, x or y.
+
+    Returns:
+        int: Value of the coordinate.
+
+    Raises:
+        ValueError: If the coordinate is not a JSON integer.
+    """
+    value = message[key]
+    if type(value) is not int:
+        raise ValueError(f"{key} must be an integer.")
+    return value
+
+
+class Match:
+    """A client's own Board and the bot Board it fires upon."""
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        strategy: str = "hunt",
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Initialize Match with both fleets placed at random."""
+        self.own = Board(side_length, sizes, rng)
+        self.target = Board(side_length, sizes, rng)
+        self.bot = load_strategy(strategy)(side_length, sizes, rng)
+        self.lock = asyncio.Lock()
+        self.winner: Optional[str] = None
+        self.moves = 0
+        self._observers: Optional[Dict[str, Observer]] = None
+
+    def start(self) -> Message:
+        """Return message opening the match."""
+        return {
+            "op": "start",
+            "size": self.own.grid.side_length,
+            "own": _rows(self.own.grid, prv=True),
+        }
+
+    def view(self) -> Message:
+        """Return message with both boards as the client may see them."""
+        return {
+            "op": "view",
+            "own": _rows(self.own.grid, prv=True),
+            "target": _rows(self.target.grid, prv=False),
+        }
+
+    def delta(self) -> Message:
+        """Return message with squares of both boards changed since last asked."""
+        if self._observers is None:
+            # Views follow every change, so they are only made once asked for.
+            self._observers = {
+                "own": GridView(self.own.grid, PRIVATE).observe(),
+                "target": GridView(self.target.grid, PUBLIC).observe(),
+            }
+        message: Message = {"op": "delta"}
+        for board, observer in self._observers.items():
+            message[board] = observer.update()
+        return message
+
+    async def fire(self, x: int, y: int) -> Message:
+        """Fire upon the bot's board and let the bot fire back."""
+        async with self.lock:
+            if self.winner is not None:
+                raise ValueError("The match is over.")
+            shot = self.target.fire(x, y)
+            self.moves += 1
+            result: Message = {"op": "result", "shot": _shot(self.target, x, y, shot)}
+            reply = None
+            if self.target.defeated():
+                self.winner = "you"
+            else:
+                bx, by = self.bot.choose()
+                bot_shot = self.own.fire(bx, by)
+                self.bot.observe(bx, by, bot_shot)
+                reply = _shot(self.own, bx, by, bot_shot)
+                if self.own.defeated():
+                    self.winner = "bot"
+            result["reply"] = reply
+            result["winner"] = self.winner
+            return result
+
+
+class MatchServer:
+    """Host one Match per connection.
+
+    Args:
+        side_length: Length of each side of every board.
+        sizes: Entities in every fleet.
+        strategy: Name of the bot strategy, see load_strategy.
+        max_matches: Connections beyond this many are turned away.
+        seed: Seed for fleet placement and bots, random if None.
+    """
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        strategy: str = "hunt",
+        max_matches: int = 20_000,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initialize MatchServer."""
+        load_strategy(strategy)
+        self.side_length = side_length
+        self.sizes = dict(sizes)
+        self.strategy = strategy
+        self.max_matches = max_matches
+        self.rng = random.Random(seed)  # noqa: S311
+        self.active = 0
+        self.moves = 0
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Play a match over one connection until it closes."""
+        try:
+            if self.active >= self.max_matches:
+                writer.write(encode({"op": "error", "error": "Server is full."}))
+                await writer.drain()
+                return
+            self.active += 1
+            try:
+                await self._play(reader, writer)
+            finally:
+                self.active -= 1
+        except ConnectionError:
+            return
+        finally:
+            writer.close()
+
+    async def _play(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer messages of one client."""
+        match = Match(self.side_length, self.sizes, self.strategy, self.rng)
+        writer.write(encode(match.start()))
+        await writer.drain()
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                writer.write(encode({"op": "error", "error": "Line too long."}))
+                break
+            if not line:
+                break
+            writer.write(encode(await self.respond(match, line)))
+            # Waiting for the buffer to drain stops reading from clients
+            # that do not read their replies.
+            await writer.drain()
+
+    async def respond(self, match: Match, line: bytes) -> Message:
+        """Return reply to one message line."""
+        try:
+            message = json.loads(line)
+            op = message["op"]
+            if op == "fire":
+                x, y = _coordinate(message, "x"), _coordinate(message, "y")
+                result = await match.fire(x, y)
+                self.moves += 1
+                return result
+            if op == "view":
+                return match.view()
+            if op == "delta":
+                return match.delta()
+            raise ValueError(f"Unknown op {op!r}.")
+        except (ValueError, KeyError, TypeError) as error:
+            return {"op": "error", "error": str(error)}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Start listening, returning the asyncio Server."""
+        return await asyncio.start_server(
+            self.handle, host, port, limit=MAX_LINE, backlog=1024
+        )
+
+
+async def serve_forever(server: MatchServer, host: str, port: int) -> None:
+    """Run server until cancelled."""
+    listening = await server.start(host, port)
+    async with listening:
+        await listening.serve_forever()
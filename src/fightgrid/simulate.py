@@ -0,0 +1,249 @@
+"""Play headless matches between strategies across a process pool.
+
+Matches are split into batches, each played by a worker process with its
+own seeded random source, so a run is reproducible for a given seed and
+worker count. Workers send back only win counts and a fixed-size latency
+histogram, keeping the cost of collecting results independent of the
+number of moves played.
+"""
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.game import Board
+from fightgrid.game import Shot
+from fightgrid.strategies import StrategyFactory
+from fightgrid.strategies import load_strategy
+
+
+BATCHES_PER_WORKER = 4
+
+# Called after each move with the player moving, x, y, the Shot and the
+# Board fired upon.
+MoveCallback = Callable[[int, int, int, Shot, Board], None]
+
+
+class LatencyHistogram:
+    """Mergeable histogram of durations in log-spaced buckets.
+
+    Each power of two is split into BUCKETS_PER_OCTAVE buckets, so any
+    percentile is reported within about 9% of the true value.
+    """
+
+    BUCKETS_PER_OCTAVE = 8
+
+    def __init__(self) -> None:
+        """Initialize empty LatencyHistogram."""
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+
+    def add(self, nanoseconds: int) -> None:
+        """Record one duration."""
+        bucket = int(math.log2(max(nanoseconds, 1)) * self.BUCKETS_PER_OCTAVE)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add every duration recorded by other."""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+
+    def percentile(self, percent: float) -> float:
+        """Return upper bound, in nanoseconds, of the given percentile."""
+        if not self.total:
+            return 0.0
+        rank = percent / 100 * self.total
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                break
+        return float(2 ** ((bucket + 1) / self.BUCKETS_PER_OCTAVE))
+
+
+class MatchResult(NamedTuple):
+    """Winner, 0 or 1, and number of moves of one match."""
+
+    winner: int
+    moves: int
+
+
+class BatchResult(NamedTuple):
+    """Totals over a batch of matches."""
+
+    wins: Tuple[int, int]
+    moves: int
+    latency: LatencyHistogram
+
+
+def play_match(
+    factories: Tuple[StrategyFactory, StrategyFactory],
+    rng: random.Random,
+    first: int = 0,
+    side_length: int = cfg.GRID_SIZE,
+    sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+    latency: Optional[LatencyHistogram] = None,
+    on_move: Optional[MoveCallback] = None,
+    boards: Optional[Sequence[Board]] = None,
+) -> MatchResult:
+    """Play one match to the end.
+
+    Args:
+        factories: Strategy factory of each player.
+        rng: Random source for fleet placement and strategies.
+        first: Index of the player moving first.
+        side_length: Length of each side of both boards.
+        sizes: Entities in each player's fleet.
+        latency: Histogram receiving the duration of every move.
+        on_move: Called after every move, outside the timed part.
+        boards: Board of each player with its fleet placed, instead of
+            placing both fleets at random.
+
+    Returns:
+        MatchResult: Index of the winner and number of moves played.
+    """
+    if boards is None:
+        boards = [Board(side_length, sizes, rng) for _ in range(2)]
+    players = [factory(side_length, sizes, rng) for factory in factories]
+    turn = first
+    moves = 0
+    while True:
+        start = time.perf_counter_ns()
+        x, y = players[turn].choose()
+        shot = boards[1 - turn].fire(x, y)
+        players[turn].observe(x, y, shot)
+        if latency is not None:
+            latency.add(time.perf_counter_ns() - start)
+        if on_move is not None:
+            on_move(turn, x, y, shot, boards[1 - turn])
+        moves += 1
+        if boards[1 - turn].defeated():
+            return MatchResult(turn, moves)
+        turn = 1 - turn
+
+
+def run_batch(
+    strategies: Tuple[str, str],
+    games: int,
+    seed: int,
+    side_length: int = cfg.GRID_SIZE,
+    sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+) -> BatchResult:
+    """Play a batch of matches, alternating which player moves first."""
+    factories = (load_strategy(strategies[0]), load_strategy(strategies[1]))
+    rng = random.Random(seed)  # noqa: S311
+    latency = LatencyHistogram()
+    wins = [0, 0]
+    moves = 0
+    for game in range(games):
+        result = play_match(factories, rng, game % 2, side_length, sizes, latency)
+        wins[result.winner] += 1
+        moves += result.moves
+    return BatchResult((wins[0], wins[1]), moves, latency)
+
+
+class SimulationReport:
+    """Throughput, latency and win rates of a simulation run."""
+
+    def __init__(
+        self,
+        strategies: Tuple[str, str],
+        batches: Iterable[BatchResult],
+        seconds: float,
+    ) -> None:
+        """Initialize SimulationReport by merging batch results."""
+        self.strategies = strategies
+        self.seconds = seconds
+        self.latency = LatencyHistogram()
+        wins = [0, 0]
+        self.moves = 0
+        for batch in batches:
+            wins[0] += batch.wins[0]
+            wins[1] += batch.wins[1]
+            self.moves += batch.moves
+            self.latency.merge(batch.latency)
+        self.wins = (wins[0], wins[1])
+        self.games = sum(wins)
+
+    def games_per_second(self) -> float:
+        """Return matches played per second of wall time."""
+        return self.games / self.seconds if self.seconds else 0.0
+
+    def win_rate(self, player: int) -> float:
+        """Return fraction of matches won by player 0 or 1."""
+        return self.wins[player] / self.games if self.games else 0.0
+
+    def format(self) -> str:
+        """Return report as lines of text."""
+        lines = [
+            f"games: {self.games} in {self.seconds:.2f}s "
+            f"({self.games_per_second():.1f} games/s, {self.moves} moves)",
+            "move latency: "
+            + ", ".join(
+                f"p{p}={self.latency.percentile(p) / 1000:.1f}us" for p in (50, 90, 99)
+            ),
+        ]
+        for player, name in enumerate(self.strategies):
+            lines.append(
+                f"{name}: {self.wins[player]} wins ({self.win_rate(player):.1%})"
+            )
+        return "\n".join(lines)
+
+
+def split_games(games: int, batches: int) -> List[int]:
+    """Return sizes of batches sharing games as evenly as possible."""
+    batches = max(1, min(batches, games))
+    base, extra = divmod(games, batches)
+    return [base + (1 if i < extra else 0) for i in range(batches)]
+
+
+def run(
+    strategies: Tuple[str, str],
+    games: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    side_length: int = cfg.GRID_SIZE,
+    sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+) -> SimulationReport:
+    """Play games matches between two strategies across worker processes.
+
+    Args:
+        strategies: Names of the two strategies, see load_strategy.
+        games: Total number of matches to play.
+        workers: Worker processes, defaulting to the number of CPUs. With
+            one worker, matches are played in the calling process.
+        seed: Seed from which each batch's random source is derived.
+        side_length: Length of each side of the boards.
+        sizes: Entities in each player's fleet.
+
+    Returns:
+        SimulationReport: Merged results of every batch.
+    """
+    for name in strategies:
+        load_strategy(name)
+    workers = workers or os.cpu_count() or 1
+    batch_sizes = split_games(games, workers * BATCHES_PER_WORKER)
+    seeds = [seed * 1_000_003 + i for i in range(len(batch_sizes))]
+    args = [strategies] * len(batch_sizes)
+    sides = [side_length] * len(batch_sizes)
+    fleets = [dict(sizes)] * len(batch_sizes)
+    start = time.perf_counter()
+    if workers == 1:
+        results = list(map(run_batch, args, batch_sizes, seeds, sides, fleets))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_batch, args, batch_sizes, seeds, sides, fleets))
+    return SimulationReport(strategies, results, time.perf_counter() - start)
@@ -0,0 +1,280 @@
+"""Compact, versioned binary snapshots of a Grid.
+
+Layout, all integers little-endian:
+
+- header: magic ``FGSN``, u16 version, u16 flags, u32 width, u32
+  height and u32 number of labels, including the None label with id 0;
+  flag 1 marks a grid that wraps, flag 2 one with blocked squares;
+- states: one u8 per square, row-major, holding SqState values;
+- with flag 2, a bitmask of the blocked squares, one bit per square,
+  little-endian;
+- a padding byte if needed to align what follows to two bytes;
+- pub, prv and highlight label planes: one u16 label id per square each;
+- label table: for ids 1 and up, a u16 byte length and UTF-8 text.
+
+A Snapshot reads straight from the buffer it is given, so loading a
+memory-mapped file copies nothing until a Grid is restored from it.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from fightgrid.bitboard import iter_bits
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.topology import Topology
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fightgrid.arraygrid import ArrayGrid
+
+
+MAGIC = b"FGSN"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIII")
+FLAG_WRAP = 1
+FLAG_BLOCKED = 2
+LABEL_LENGTH = struct.Struct("<H")
+MAX_LABELS = 1 << 16
+
+_STATES_BY_VALUE = {state.value: state for state in SqState}
+_STATE_CODES = bytes(_STATES_BY_VALUE)
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _plane(values: List[int]) -> bytes:
+    """Return little-endian u16 bytes of values."""
+    plane = array("H", values)
+    if sys.byteorder != "little":  # pragma: no cover
+        plane.byteswap()
+    return plane.tobytes()
+
+
+def _grid_planes(grid: Grid) -> Tuple[bytes, List[bytes], List[Optional[str]]]:
+    """Return states, label planes and label table of any Grid."""
+    if "fightgrid.arraygrid" in sys.modules:
+        from fightgrid.arraygrid import ArrayGrid
+
+        if isinstance(grid, ArrayGrid):
+            labels = [grid.labels.label(i) for i in range(len(grid.labels))]
+            planes = [
+                p.astype("<u2").tobytes()
+                for p in (grid.pub_labels, grid.prv_labels, grid.highlights)
+            ]
+            return grid.states.tobytes(), planes, labels
+    ids: Dict[Optional[str], int] = {None: 0}
+    table: List[Optional[str]] = [None]
+    columns: List[List[int]] = [[], [], []]
+    states = bytearray()
+    for index in range(grid.side_length * grid.height):
+        sq = grid.get_square_index(index)
+        states.append(sq.state.value)
+        for column, label in zip(columns, (sq.pub_label, sq.prv_label, sq.highlight)):
+            label_id = ids.get(label)
+            if label_id is None:
+                label_id = ids[label] = len(table)
+                table.append(label)
+            column.append(label_id)
+    if len(table) > MAX_LABELS:
+        raise OverflowError("Too many distinct labels for a snapshot.")
+    return bytes(states), [_plane(c) for c in columns], table
+
+
+def dumps(grid: Grid) -> bytes:
+    """Return snapshot of grid as bytes."""
+    states, planes, labels = _grid_planes(grid)
+    topology = grid.topology
+    flags = FLAG_WRAP if topology.wrap else 0
+    blocked = b""
+    if topology.blocked:
+        flags |= FLAG_BLOCKED
+        mask = sum(1 << index for index in topology.blocked)
+        blocked = mask.to_bytes((topology.size + 7) // 8, "little")
+    header = HEADER.pack(
+        MAGIC, VERSION, flags, topology.width, topology.height, len(labels)
+    )
+    parts = [header, states, blocked]
+    if (len(states) + len(blocked)) % 2:
+        parts.append(b"\0")
+    parts.extend(planes)
+    for label in labels[1:]:
+        encoded = (label or "").encode("utf-8")
+        parts.append(LABEL_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+
+def dump(grid: Grid, path: str) -> None:
+    """Write snapshot of grid to the file at path."""
+    with open(path, "wb") as file:
+        file.write(dumps(grid))
+
+
+class Snapshot:
+    """Read-only view of a snapshot held in a buffer.
+
+    Args:
+        buffer: Bytes-like object holding a snapshot. It is not copied,
+            so it must not change while the Snapshot is in use.
+
+    Raises:
+        ValueError: If the buffer does not hold a supported snapshot.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        """Initialize Snapshot by parsing the header and label table."""
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise ValueError("Buffer is too short to hold a snapshot.")
+        magic, version, flags, width, height, label_count = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Buffer does not hold a FightGrid snapshot.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        count = width * height
+        offset = HEADER.size
+        mask_size = (count + 7) // 8 if flags & FLAG_BLOCKED else 0
+        aligned = count + mask_size + (count + mask_size) % 2
+        if len(view) < offset + aligned + 6 * count:
+            raise ValueError("Snapshot is truncated.")
+        self.topology = self._read_topology(view, flags, width, height)
+        self.side_length: int = width
+        self.height: int = height
+        self.states = view[offset : offset + count]
+        offset += aligned
+        planes: List[memoryview] = []
+        for _ in range(3):
+            planes.append(self._u16(view[offset : offset + 2 * count]))
+            offset += 2 * count
+        self.pub_labels, self.prv_labels, self.highlights = planes
+        self.labels = self._read_labels(view, offset, label_count)
+        if bytes(self.states).translate(None, _STATE_CODES):
+            raise ValueError("Snapshot holds an unknown square state.")
+        if any(max(plane, default=0) >= len(self.labels) for plane in planes):
+            raise ValueError("Snapshot refers to a label not in its table.")
+        self._view = view
+
+    @staticmethod
+    def _read_topology(
+        view: memoryview, flags: int, width: int, height: int
+    ) -> Topology:
+        """Return Topology from the header flags and blocked square mask."""
+        if flags & ~(FLAG_WRAP | FLAG_BLOCKED):
+            raise ValueError(f"Unsupported snapshot flags {flags}.")
+        blocked: FrozenSet[int] = frozenset()
+        if flags & FLAG_BLOCKED:
+            count = width * height
+            start = HEADER.size + count
+            mask = int.from_bytes(view[start : start + (count + 7) // 8], "little")
+            if mask >> count:
+                raise ValueError("Snapshot blocks a square outside the grid.")
+            blocked = frozenset(iter_bits(mask))
+        return Topology(width, height, bool(flags & FLAG_WRAP), blocked)
+
+    @staticmethod
+    def _read_labels(view: memoryview, offset: int, count: int) -> List[Optional[str]]:
+        """Return label table of count labels, the first None, at offset."""
+        labels: List[Optional[str]] = [None]
+        for _ in range(count - 1):
+            if offset + LABEL_LENGTH.size > len(view):
+                raise ValueError("Snapshot label table is truncated.")
+            (length,) = LABEL_LENGTH.unpack_from(view, offset)
+            offset += LABEL_LENGTH.size
+            if offset + length > len(view):
+                raise ValueError("Snapshot label table is truncated.")
+            labels.append(str(view[offset : offset + length], "utf-8"))
+            offset += length
+        return labels
+
+    @staticmethod
+    def _u16(raw: memoryview) -> memoryview:
+        """Return u16 view reading little-endian raw bytes."""
+        if sys.byteorder == "little":
+            return raw.cast("H")
+        plane = array("H", raw.tobytes())  # pragma: no cover
+        plane.byteswap()  # pragma: no cover
+        return memoryview(plane)  # pragma: no cover
+
+    def state_at(self, x: int, y: int) -> SqState:
+        """Return SqState of the square at x and y."""
+        return _STATES_BY_VALUE[self.states[y * self.side_length + x]]
+
+    def label_at(self, x: int, y: int, prv: bool = False) -> Optional[str]:
+        """Return public, or private, label of the square at x and y."""
+        plane = self.prv_labels if prv else self.pub_labels
+        return self.labels[plane[y * self.side_length + x]]
+
+    def to_grid(self) -> Grid:
+        """Return new Grid restored from the snapshot."""
+        grid = Grid(topology=self.topology)
+        labels = self.labels
+        for index, code in enumerate(self.states):
+            sq = grid.get_square_index(index)
+            sq.pub_label = labels[self.pub_labels[index]]
+            sq.prv_label = labels[self.prv_labels[index]]
+            sq.highlight = labels[self.highlights[index]]
+            if code != SqState.EMPTY.value:
+                sq.state = _STATES_BY_VALUE[code]
+        return grid
+
+    def to_array_grid(self) -> "ArrayGrid":
+        """Return new ArrayGrid restored from the snapshot.
+
+        Returns:
+            ArrayGrid: Grid with the snapshot's squares.
+
+        Raises:
+            ValueError: If the snapshot is not of a plain square grid, the
+                only shape an ArrayGrid takes.
+        """
+        import numpy as np
+
+        from fightgrid.arraygrid import ArrayGrid
+
+        if self.topology != Topology.square(self.side_length):
+            raise ValueError("Only a plain square grid restores to an ArrayGrid.")
+        grid = ArrayGrid(self.side_length)
+        for label in self.labels[1:]:
+            grid.labels.intern(label)
+        shape = (self.side_length, self.side_length)
+        grid.states[...] = np.frombuffer(self.states, dtype=np.uint8).reshape(shape)
+        for name in ("pub_labels", "prv_labels", "highlights"):
+            plane = np.frombuffer(getattr(self, name), dtype="<u2").reshape(shape)
+            getattr(grid, name)[...] = plane
+        grid.bits = grid._new_bits()
+        for index, code in enumerate(self.states):
+            if code != SqState.EMPTY.value:
+                grid.bits.move(index, SqState.EMPTY, _STATES_BY_VALUE[code])
+        return grid
+
+    def release(self) -> None:
+        """Release views of the buffer, so a memory map can be closed."""
+        self.states.release()
+        for plane in (self.pub_labels, self.prv_labels, self.highlights):
+            plane.release()
+        self._view.release()
+
+
+def loads(buffer: Buffer) -> Snapshot:
+    """Return Snapshot reading from buffer without copying it."""
+    return Snapshot(buffer)
+
+
+def load(path: str) -> Grid:
+    """Return Grid restored from the snapshot file at path."""
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            snapshot = Snapshot(mapped)
+            try:
+                return snapshot.to_grid()
+            finally:
+                snapshot.release()
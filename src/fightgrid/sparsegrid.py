@@ -0,0 +1,241 @@
+"""Grid storing only the Squares that differ from their defaults.
+
+A SparseGrid keeps a dict from row-major index to Square for squares
+whose state or labels were changed. Any other square is synthesized on
+demand, and is stored the first time it changes, through the same
+owner notification that keeps a dense Grid's indexes in sync. Memory
+therefore grows with the number of squares touched during a match, not
+with the area of the board, so boards of 100,000 squares a side fit.
+
+Neighbors are found by arithmetic instead of the per-square tables a
+dense Grid caches, and squares are indexed by state in sets of indexes
+instead of a BitBoard, so a SparseGrid has no ``bits`` attribute. Its
+Zobrist hash is kept with keys computed per change instead of a table.
+"""
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.bitboard import zobrist_key
+from fightgrid.grid import DIRECTION_OFFSETS
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import GridListener
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.topology import Topology
+
+
+class SparseGrid(Grid):
+    """Grid of Squares created on demand and stored once changed.
+
+    Squares that were never changed are synthesized by get_square_xy, so
+    they compare equal to, but are not identical with, earlier Squares
+    of the same location. A changed Square is returned itself until it
+    is back to its defaults.
+
+    Args:
+        side_length: Length of each side of the grid.
+        wrap: Projections leaving one edge re-enter from the opposite edge.
+        def_pub_label: Public label of squares not yet changed.
+        def_prv_label: Private label of squares not yet changed.
+    """
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        def_pub_label: Optional[str] = None,
+        def_prv_label: Optional[str] = None,
+        wrap: bool = False,
+    ) -> None:
+        """Initialize SparseGrid with no Squares stored."""
+        # Only the shape is used; the topology's tables would be as large
+        # as a dense grid.
+        self.topology = Topology.square(side_length, wrap)
+        self.side_length = side_length
+        self.height = side_length
+        self.def_pub_label = def_pub_label
+        self.def_prv_label = def_prv_label
+        self._stored: Dict[int, Square] = {}
+        self._by_state: Dict[SqState, Set[int]] = {
+            state: set() for state in SqState if state is not SqState.EMPTY
+        }
+        self._listeners: List[GridListener] = []
+        self._renderers = {}
+        self._forks = None
+        self._zobrist = 0
+
+    @property
+    def zobrist(self) -> int:
+        """64-bit Zobrist hash of the states of the squares, as on a Grid."""
+        return self._zobrist
+
+    def fork(self) -> "SparseGrid":
+        """Return copy of the grid, copying only the stored Squares."""
+        child = SparseGrid(
+            self.side_length, self.def_pub_label, self.def_prv_label, self.topology.wrap
+        )
+        for index, sq in self._stored.items():
+            copy = Square(sq.x, sq.y, sq.pub_label, sq.prv_label, sq.highlight)
+            copy._state = sq.state
+            copy._grid = child
+            child._stored[index] = copy
+        child._by_state = {state: set(s) for state, s in self._by_state.items()}
+        child._zobrist = self._zobrist
+        return child
+
+    def _synthesize(self, x: int, y: int) -> Square:
+        """Return new default Square at x and y owned by this grid."""
+        sq = Square(x, y, pub_label=self.def_pub_label, prv_label=self.def_prv_label)
+        sq._grid = self
+        return sq
+
+    def _is_default(self, sq: Square) -> bool:
+        """Return True if Square holds nothing but default values."""
+        return (
+            sq.state is SqState.EMPTY
+            and sq.pub_label == self.def_pub_label
+            and sq.prv_label == self.def_prv_label
+            and sq.highlight is None
+        )
+
+    def _store(self, sq: Square, field: str, old: Any) -> Tuple[Square, Any]:
+        """Keep a changed Square, or drop it once back to its defaults.
+
+        Args:
+            sq: Square whose field changed.
+            field: Name of the changed property.
+            old: Value of the field before the change.
+
+        Returns:
+            Tuple[Square, Any]: The Square stored for the location and the
+            value its field held before the change.
+        """
+        index = sq.y * self.side_length + sq.x
+        stored = self._stored.get(index)
+        if stored is not None and stored is not sq:
+            # Another Square of this location was synthesized before the
+            # first was stored; move the change onto the stored one.
+            attr = "_" + field
+            old = getattr(stored, attr)
+            setattr(stored, attr, getattr(sq, attr))
+            sq = stored
+        if self._is_default(sq):
+            self._stored.pop(index, None)
+        else:
+            self._stored[index] = sq
+        return sq, old
+
+    def _state_changed(self, sq: Square, old: SqState, new: SqState) -> None:
+        """Store Square and update state indexes after its state changed."""
+        sq, old = self._store(sq, "state", old)
+        index = sq.y * self.side_length + sq.x
+        if old is not SqState.EMPTY:
+            self._by_state[old].discard(index)
+        if new is not SqState.EMPTY:
+            self._by_state[new].add(index)
+        self._zobrist ^= zobrist_key(index, old) ^ zobrist_key(index, new)
+        for listener in self._listeners:
+            listener(sq, "state", old, new)
+
+    def get_square(self, sq: Square) -> Square:
+        """Given Square, return Square from grid with same x & y."""
+        return self.get_square_xy(sq.x, sq.y)
+
+    def get_square_xy(self, x: int, y: int) -> Square:
+        """Given x and y coordinates, return the Square from the grid.
+
+        Args:
+            x: Column of the square.
+            y: Row of the square.
+
+        Returns:
+            Square: The stored Square, or a new default one.
+
+        Raises:
+            IndexError: If x or y is outside the grid.
+        """
+        side = self.side_length
+        if not (0 <= x < side and 0 <= y < side):
+            raise IndexError(f"Square x{x} y{y} is outside the grid.")
+        stored = self._stored.get(y * side + x)
+        return self._synthesize(x, y) if stored is None else stored
+
+    def get_square_index(self, index: int) -> Square:
+        """Given row-major index, return the Square from the grid."""
+        y, x = divmod(index, self.side_length)
+        return self.get_square_xy(x, y)
+
+    def label_at(self, index: int, prv: bool = False) -> Optional[str]:
+        """Return a label of the square at row-major index, as on a Grid."""
+        stored = self._stored.get(index)
+        if stored is None:
+            return self.def_prv_label if prv else self.def_pub_label
+        return stored.prv_label if prv else stored.pub_label
+
+    def row_labels(self, y: int, prv: bool = False) -> List[Optional[str]]:
+        """Return the labels of row y, as on a Grid."""
+        start = y * self.side_length
+        return [self.label_at(i, prv) for i in range(start, start + self.side_length)]
+
+    def square_valid(self, sq: Square) -> bool:
+        """Returns True if point is within grid bounds."""
+        return self._index(sq) is not None
+
+    def projected_from(
+        self, sq: Square, direction: Direction, distance: int = 1
+    ) -> Optional[Square]:
+        """Returns Square from grid a distance and direction away."""
+        offset = DIRECTION_OFFSETS.get(direction)
+        if offset is None or self._index(sq) is None:
+            return None
+        x = sq.x + offset[0] * distance
+        y = sq.y + offset[1] * distance
+        side = self.side_length
+        if self.topology.wrap:
+            return self.get_square_xy(x % side, y % side)
+        if 0 <= x < side and 0 <= y < side:
+            return self.get_square_xy(x, y)
+        return None
+
+    def _adjacent(self, sq: Square, directions: Tuple[Direction, ...]) -> List[Square]:
+        """Return in-bounds Squares one step from given in each direction."""
+        squares = (self.projected_from(sq, d) for d in directions)
+        adjacent = {(s.x, s.y): s for s in squares if s is not None and s != sq}
+        return list(adjacent.values())
+
+    def stored(self) -> Iterator[Square]:
+        """Yield every Square that differs from its defaults."""
+        return iter(list(self._stored.values()))
+
+    def count(self, state: SqState) -> int:
+        """Return number of squares in state."""
+        if state is SqState.EMPTY:
+            return self.side_length**2 - sum(map(len, self._by_state.values()))
+        return len(self._by_state[state])
+
+    def members(self, state: SqState) -> Iterator[int]:
+        """Yield, in ascending order, indexes of squares in a non-EMPTY state.
+
+        Args:
+            state: State other than EMPTY, whose members would be nearly
+                every square of a large grid.
+
+        Returns:
+            Iterator[int]: Row-major indexes.
+
+        Raises:
+            ValueError: If state is EMPTY.
+        """
+        if state is SqState.EMPTY:
+            raise ValueError("EMPTY squares of a SparseGrid are not indexed.")
+        return iter(sorted(self._by_state[state]))
+
+    def __repr__(self) -> str:
+        """Return a short description, as labels of a large grid are huge."""
+        return f"SparseGrid(side_length={self.side_length}, stored={len(self._stored)})"
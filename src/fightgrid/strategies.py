@@ -0,0 +1,196 @@
+"""Pluggable strategies choosing where to fire.
+
+A strategy keeps its own tracking Grid of what it has learned about the
+opponent's board and is told the outcome of each of its shots. Strategies
+are looked up by name in STRATEGIES, or given as ``module:ClassName``.
+"""
+import importlib
+import random
+from typing import Callable
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.bitboard import iter_bits
+from fightgrid.components import HitComponents
+from fightgrid.game import Shot
+from fightgrid.grid import SURROUNDING_DIRECTIONS
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.targeting import DensityMap
+from fightgrid.transposition import TranspositionTable
+
+
+class Strategy:
+    """Base strategy firing at random unshot squares."""
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Initialize Strategy with an empty tracking grid."""
+        self.grid = Grid(side_length)
+        self.sizes = dict(sizes)
+        self.rng = rng or random.Random()  # noqa: S311
+
+    def choose(self) -> Tuple[int, int]:
+        """Return x and y of the next square to fire upon."""
+        return self._random_from(self.grid.bits.unshot())
+
+    def observe(self, x: int, y: int, shot: Shot) -> None:
+        """Record outcome of firing upon x and y."""
+        if shot.sunk is not None:
+            self._mark_sunk(x, y, self.sizes[shot.sunk])
+        else:
+            self.grid.get_square_xy(x, y).state = shot.state
+
+    def _mark_sunk(self, x: int, y: int, length: int) -> None:
+        """Mark x and y, and the run of HITs it completes, as SUNK."""
+        start = self.grid.get_square_xy(x, y)
+        for direction in SURROUNDING_DIRECTIONS:
+            run = [
+                self.grid.projected_from(start, direction, d) for d in range(1, length)
+            ]
+            if all(sq is not None and sq.state is SqState.HIT for sq in run):
+                for sq in run:
+                    sq.state = SqState.SUNK  # type: ignore[union-attr]
+                break
+        start.state = SqState.SUNK
+
+    def _random_from(self, mask: int) -> Tuple[int, int]:
+        """Return x and y of a random square in mask."""
+        index = self.rng.choice(list(iter_bits(mask)))
+        y, x = divmod(index, self.grid.side_length)
+        return x, y
+
+
+class HuntStrategy(Strategy):
+    """Fire at random until a hit, then at unshot squares next to hits.
+
+    Once two or more HITs line up, the squares extending that line are
+    preferred, as the entity they belong to must lie along it.
+    """
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Initialize HuntStrategy following HITs on its tracking grid."""
+        super().__init__(side_length, sizes, rng)
+        self.components = HitComponents(self.grid)
+
+    def choose(self) -> Tuple[int, int]:
+        """Return x and y of the next square to fire upon."""
+        bits = self.grid.bits
+        return self._random_from(self._line_ends() or bits.frontier() or bits.unshot())
+
+    def _line_ends(self) -> int:
+        """Return mask of unshot squares extending the largest line of HITs."""
+        side = self.grid.side_length
+        unshot = self.grid.bits.unshot()
+        for c in self.components.components():
+            if c.orientation is Direction.RIGHT:
+                ends = [(c.x0 - 1, c.y0), (c.x1 + 1, c.y0)]
+            elif c.orientation is Direction.DOWN:
+                ends = [(c.x0, c.y0 - 1), (c.x0, c.y1 + 1)]
+            else:
+                continue
+            mask = 0
+            for x, y in ends:
+                if 0 <= x < side and 0 <= y < self.grid.height:
+                    mask |= 1 << (y * side + x)
+            if mask & unshot:
+                return mask & unshot
+        return 0
+
+
+class DensityStrategy(Strategy):
+    """Fire at the square most likely to hold a remaining entity.
+
+    Args:
+        side_length: Length of each side of the opponent's grid.
+        sizes: Entities in the opponent's fleet.
+        rng: Random source.
+        cache: Table memoizing the chosen square by position, which may
+            be shared by every DensityStrategy playing the same sizes.
+    """
+
+    def __init__(
+        self,
+        side_length: int = cfg.GRID_SIZE,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        rng: Optional[random.Random] = None,
+        cache: Optional[TranspositionTable] = None,
+    ) -> None:
+        """Initialize DensityStrategy following its tracking grid."""
+        super().__init__(side_length, sizes, rng)
+        self.density = DensityMap(self.grid, sizes)
+        self.cache = cache
+
+    def choose(self) -> Tuple[int, int]:
+        """Return x and y of the next square to fire upon."""
+        if self.cache is None:
+            return self._best()
+        # The density depends on the entities afloat as well as on the
+        # squares, so both make up the position.
+        key = (
+            self.grid.side_length,
+            self.grid.zobrist,
+            tuple(sorted(self.density.remaining.values())),
+        )
+        target = self.cache.get(key)
+        if target is None:
+            target = self._best()
+            self.cache.put(key, target)
+        x, y = target
+        return x, y
+
+    def _best(self) -> Tuple[int, int]:
+        """Return x and y of the unshot square of highest density."""
+        sq = self.density.best_target()
+        assert sq is not None  # noqa: S101
+        return sq.x, sq.y
+
+    def observe(self, x: int, y: int, shot: Shot) -> None:
+        """Record outcome of firing upon x and y."""
+        super().observe(x, y, shot)
+        if shot.sunk is not None:
+            self.density.mark_sunk(shot.sunk)
+
+
+StrategyFactory = Callable[..., Strategy]
+
+STRATEGIES: Dict[str, StrategyFactory] = {
+    "random": Strategy,
+    "hunt": HuntStrategy,
+    "density": DensityStrategy,
+}
+
+
+def load_strategy(name: str) -> StrategyFactory:
+    """Return strategy factory by registered name or ``module:attribute``.
+
+    Args:
+        name: Key of STRATEGIES, or import path of a Strategy factory.
+
+    Returns:
+        StrategyFactory: Callable taking side_length, sizes and rng.
+
+    Raises:
+        ValueError: If the name is neither registered nor an import path.
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module_name, _, attribute = name.partition(":")
+    if not attribute:
+        known = ", ".join(sorted(STRATEGIES))
+        raise ValueError(f"Unknown strategy {name!r}, expected one of: {known}.")
+    factory: StrategyFactory = getattr(importlib.import_module(module_name), attribute)
+    return factory
@@ -0,0 +1,182 @@
+"""Probability-density targeting over the hidden entities of a Grid.
+
+The density of a square is the number of ways a remaining entity could
+be placed to cover it without touching a MISS or SUNK square. Spans
+through HIT squares are weighted up, steering fire towards finishing a
+damaged entity. The map listens to its Grid and adjusts only the spans
+through a square whose state changed, instead of recounting every
+placement after every shot.
+"""
+from collections import Counter
+from functools import lru_cache
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.bitboard import iter_bits
+from fightgrid.bitboard import popcount
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.placement import Span
+from fightgrid.placement import legal_spans
+from fightgrid.topology import Topology
+
+
+HIT_WEIGHT = 20
+
+BLOCKING_STATES = (SqState.MISS, SqState.SUNK)
+
+
+def covering_spans(
+    side_length: int, length: int, topology: Optional[Topology] = None
+) -> Tuple[Tuple[int, ...], ...]:
+    """Return, per square index, positions in legal_spans of spans covering it.
+
+    Args:
+        side_length: Length of each side of a square grid.
+        length: Number of squares each span covers.
+        topology: Shape of the grid, overriding side_length.
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: Span positions for every square index.
+    """
+    return _covering_spans(topology or Topology.square(side_length), length)
+
+
+@lru_cache(maxsize=256)
+def _covering_spans(topology: Topology, length: int) -> Tuple[Tuple[int, ...], ...]:
+    """Return, per square index of topology, positions of spans covering it."""
+    covering: List[List[int]] = [[] for _ in range(topology.size)]
+    for span_id, span in enumerate(legal_spans(topology.width, length, topology)):
+        for index in span.indices:
+            covering[index].append(span_id)
+    return tuple(tuple(ids) for ids in covering)
+
+
+class DensityMap:
+    """Heatmap of remaining-entity placements covering each square.
+
+    Args:
+        grid: Grid being fired upon; the map follows its state changes.
+        sizes: Entities still afloat, by name and length.
+        hit_weight: Extra weight of a span for each HIT square it covers.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+        hit_weight: int = HIT_WEIGHT,
+    ) -> None:
+        """Initialize DensityMap from the current state of grid."""
+        self.grid = grid
+        self._blocked = sum(1 << index for index in grid.topology.blocked)
+        self.remaining = dict(sizes)
+        self.hit_weight = hit_weight
+        self.density: List[int] = []
+        self._multiplicity: Dict[int, int] = Counter()
+        self._weights: Dict[int, List[int]] = {}
+        self.rebuild()
+        grid.add_listener(self._on_change)
+
+    def detach(self) -> None:
+        """Stop following state changes of the grid."""
+        self.grid.remove_listener(self._on_change)
+
+    def rebuild(self) -> None:
+        """Recount every span from scratch."""
+        topology = self.grid.topology
+        bits = self.grid.bits
+        blocked = bits.mask(*BLOCKING_STATES)
+        hits = bits.mask(SqState.HIT)
+        self._multiplicity = Counter(self.remaining.values())
+        self._weights = {}
+        self.density = [0] * topology.size
+        for length, count in self._multiplicity.items():
+            spans = legal_spans(topology.width, length, topology)
+            weights = [
+                0
+                if span.mask & blocked
+                else 1 + self.hit_weight * popcount(span.mask & hits)
+                for span in spans
+            ]
+            self._weights[length] = weights
+            for span, weight in zip(spans, weights):
+                self._add(span, count * weight)
+
+    def _add(self, span: Span, amount: int) -> None:
+        """Add amount to the density of every square of span."""
+        if amount:
+            density = self.density
+            for index in span.indices:
+                density[index] += amount
+
+    def _on_change(self, sq: Square, field: str, old: Any, new: Any) -> None:
+        """Adjust spans through a square whose state changed."""
+        if field != "state":
+            return
+        if old in BLOCKING_STATES or (old is SqState.HIT and new is not SqState.SUNK):
+            # Squares only become more constrained during play; undoing a
+            # shot is rare enough to recount.
+            self.rebuild()
+            return
+        index = sq.y * self.grid.side_length + sq.x
+        if new in BLOCKING_STATES:
+            self._update_spans(index, block=True)
+        elif new is SqState.HIT:
+            self._update_spans(index, block=False)
+
+    def _update_spans(self, index: int, block: bool) -> None:
+        """Remove, or weight up for a hit, each live span covering index."""
+        topology = self.grid.topology
+        for length, count in self._multiplicity.items():
+            spans = legal_spans(topology.width, length, topology)
+            weights = self._weights[length]
+            for span_id in covering_spans(topology.width, length, topology)[index]:
+                weight = weights[span_id]
+                if not weight:
+                    continue
+                if block:
+                    weights[span_id] = 0
+                    self._add(spans[span_id], -count * weight)
+                else:
+                    weights[span_id] = weight + self.hit_weight
+                    self._add(spans[span_id], count * self.hit_weight)
+
+    def mark_sunk(self, name: str) -> None:
+        """Remove the named entity from those still afloat."""
+        length = self.remaining.pop(name)
+        spans = legal_spans(self.grid.topology.width, length, self.grid.topology)
+        for span, weight in zip(spans, self._weights[length]):
+            self._add(span, -weight)
+        self._multiplicity[length] -= 1
+        if not self._multiplicity[length]:
+            del self._multiplicity[length]
+            del self._weights[length]
+
+    def density_at(self, sq: Square) -> int:
+        """Return density of the given square."""
+        return self.density[sq.y * self.grid.side_length + sq.x]
+
+    def heatmap(self) -> List[List[int]]:
+        """Return density as a list of rows."""
+        width = self.grid.side_length
+        return [
+            self.density[y * width : (y + 1) * width] for y in range(self.grid.height)
+        ]
+
+    def best_target(self) -> Optional[Square]:
+        """Return unshot, unblocked Square with the highest density, or None."""
+        density = self.density
+        best = None
+        best_density = -1
+        for index in iter_bits(self.grid.bits.unshot() & ~self._blocked):
+            if density[index] > best_density:
+                best = index
+                best_density = density[index]
+        return None if best is None else self.grid.get_square_index(best)
@@ -0,0 +1,181 @@
+"""Shape of a grid: width, height, wraparound and blocked squares.
+
+A Topology is a small hashable value, so the lookup tables derived from
+it are built once per distinct shape and shared by every grid of that
+shape. Single steps, neighbors and validity then cost a tuple index
+instead of bounds and wrap arithmetic on every call. Only one-square
+steps are tabled, one table per direction; longer projections are
+worked out when asked for, so a large grid does not keep a full-board
+table for every distance ever projected.
+
+Squares are addressed by row-major index (y * width + x). A blocked
+square is still part of the grid, but is not valid and is never the
+target of a projection or a neighbor of another square.
+"""
+from functools import lru_cache
+from typing import FrozenSet
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from fightgrid.grid import DIRECTION_OFFSETS
+from fightgrid.grid import Direction
+
+
+class Topology(NamedTuple):
+    """Width, height, wraparound and blocked squares of a grid.
+
+    Args:
+        width: Number of squares in each row.
+        height: Number of rows.
+        wrap: Projections leaving one edge re-enter from the opposite edge,
+            making the grid a torus.
+        blocked: Row-major indexes of squares that cannot be used.
+    """
+
+    width: int
+    height: int
+    wrap: bool = False
+    blocked: FrozenSet[int] = frozenset()
+
+    @classmethod
+    def square(cls, side_length: int, wrap: bool = False) -> "Topology":
+        """Return Topology of a square grid with nothing blocked."""
+        return cls(side_length, side_length, wrap)
+
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[str], blocked_char: str = "#", wrap: bool = False
+    ) -> "Topology":
+        """Return Topology drawn as rows of text, blocked_char marking blocks.
+
+        Args:
+            rows: Equally long strings, one character per square.
+            blocked_char: Character marking a blocked square.
+            wrap: Make the grid a torus.
+
+        Returns:
+            Topology: Topology of the drawn grid.
+
+        Raises:
+            ValueError: If rows differ in length.
+        """
+        width = len(rows[0]) if rows else 0
+        if any(len(row) != width for row in rows):
+            raise ValueError("Rows of a topology must have equal length.")
+        blocked = frozenset(
+            y * width + x
+            for y, row in enumerate(rows)
+            for x, char in enumerate(row)
+            if char == blocked_char
+        )
+        return cls(width, len(rows), wrap, blocked)
+
+    @property
+    def size(self) -> int:
+        """Number of squares, blocked or not."""
+        return self.width * self.height
+
+    def valid(self) -> Tuple[bool, ...]:
+        """Return, per square index, whether the square may be used."""
+        return valid_table(self)
+
+    def neighbors(
+        self, direction: Direction, distance: int = 1
+    ) -> Tuple[Optional[int], ...]:
+        """Return, per square index, the index a distance and direction away.
+
+        The table for a distance of 1 is cached; others are built anew.
+        """
+        if distance == 1:
+            return neighbor_table(self, direction)
+        return tuple(
+            self.project(index, direction, distance) for index in range(self.size)
+        )
+
+    def project(
+        self, index: int, direction: Direction, distance: int = 1
+    ) -> Optional[int]:
+        """Return index a distance and direction from index, None if off or blocked.
+
+        Args:
+            index: Row-major index of the square projected from.
+            direction: One of the keys of DIRECTION_OFFSETS.
+            distance: Number of squares to project.
+
+        Returns:
+            Optional[int]: Target index, None where the projection leaves
+            a grid that does not wrap or lands on a blocked square.
+        """
+        if distance == 1:
+            return neighbor_table(self, direction)[index]
+        dx, dy = DIRECTION_OFFSETS[direction]
+        return _target(self, index, dx * distance, dy * distance)
+
+    def adjacency(
+        self, directions: Tuple[Direction, ...]
+    ) -> Tuple[Tuple[int, ...], ...]:
+        """Return, per square index, neighbor indexes in the given order."""
+        return adjacency_table(self, directions)
+
+
+@lru_cache(maxsize=64)
+def valid_table(topology: Topology) -> Tuple[bool, ...]:
+    """Return, per square index, False for blocked squares."""
+    blocked = topology.blocked
+    return tuple(index not in blocked for index in range(topology.size))
+
+
+def _target(topology: Topology, index: int, dx: int, dy: int) -> Optional[int]:
+    """Return index dx and dy from index, None if off the grid or blocked."""
+    width, height = topology.width, topology.height
+    tx, ty = index % width + dx, index // width + dy
+    if topology.wrap:
+        tx %= width
+        ty %= height
+    elif not (0 <= tx < width and 0 <= ty < height):
+        return None
+    target = ty * width + tx
+    return target if valid_table(topology)[target] else None
+
+
+@lru_cache(maxsize=64)
+def neighbor_table(
+    topology: Topology, direction: Direction
+) -> Tuple[Optional[int], ...]:
+    """Return, per square index, the index one square in direction.
+
+    Args:
+        topology: Shape of the grid.
+        direction: One of the keys of DIRECTION_OFFSETS.
+
+    Returns:
+        Tuple[Optional[int], ...]: Target index for every square index,
+        None where the step leaves a grid that does not wrap or lands on
+        a blocked square.
+    """
+    dx, dy = DIRECTION_OFFSETS[direction]
+    return tuple(_target(topology, index, dx, dy) for index in range(topology.size))
+
+
+@lru_cache(maxsize=64)
+def adjacency_table(
+    topology: Topology, directions: Tuple[Direction, ...]
+) -> Tuple[Tuple[int, ...], ...]:
+    """Return, per square index, distinct valid neighbor indexes in order.
+
+    On a small torus one square can be the neighbor in several
+    directions, so later repeats are left out.
+    """
+    tables = [neighbor_table(topology, d) for d in directions]
+    return tuple(
+        tuple(
+            dict.fromkeys(
+                target
+                for target in (t[i] for t in tables)
+                if target is not None and target != i
+            )
+        )
+        for i in range(topology.size)
+    )
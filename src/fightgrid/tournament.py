@@ -0,0 +1,320 @@
+"""Round-robin tournaments between strategies, rated by Elo.
+
+Every pair of strategies plays the same set of deals, each deal being
+the starting fleets of both boards. The parent process writes the deals
+into one shared memory block as a u8 per square holding the number of
+the entity there, 0 for none. Workers are sent only the block's name
+and the numbers of their matches; they rebuild each Board from the
+shared deal and write the winner and move count of the match back into
+the block, so no Grid or Square is ever pickled.
+
+``multiprocessing.shared_memory`` is new in Python 3.8. On Python 3.7,
+or with one worker, matches are played in the calling process on a
+plain buffer of the same layout.
+"""
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import fightgrid.config as cfg
+from fightgrid.game import Board
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.simulate import play_match
+from fightgrid.strategies import load_strategy
+
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None  # type: ignore[assignment]
+
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+# Each match result is a winner, 0 or 1 for the pairing's first or
+# second strategy, and a move count.
+RESULT = struct.Struct("<ii")
+
+
+class Pairing(NamedTuple):
+    """Match between two strategies on one deal."""
+
+    a: str
+    b: str
+    deal: int
+
+
+class MatchOutcome(NamedTuple):
+    """Strategies of a match, the winner's name and moves played."""
+
+    a: str
+    b: str
+    winner: str
+    moves: int
+
+
+class Layout(NamedTuple):
+    """Where deals and results sit in a tournament's shared buffer."""
+
+    side_length: int
+    deals: int
+    matches: int
+
+    @property
+    def deal_size(self) -> int:
+        """Bytes of one deal: one byte per square of each of two boards."""
+        return 2 * self.side_length * self.side_length
+
+    @property
+    def results_offset(self) -> int:
+        """Offset of the first match result."""
+        return self.deals * self.deal_size
+
+    @property
+    def size(self) -> int:
+        """Bytes of the whole buffer."""
+        return self.results_offset + self.matches * RESULT.size
+
+
+def schedule(strategies: Sequence[str], deals: int) -> List[Pairing]:
+    """Return every pair of strategies playing each deal."""
+    return [
+        Pairing(a, b, deal)
+        for a, b in combinations(strategies, 2)
+        for deal in range(deals)
+    ]
+
+
+def write_deals(
+    buffer: memoryview,
+    layout: Layout,
+    rng: random.Random,
+    sizes: Mapping[str, int],
+) -> None:
+    """Deal random fleets for both boards of every deal into buffer."""
+    numbers = {name: i + 1 for i, name in enumerate(sizes)}
+    board_size = layout.side_length * layout.side_length
+    for deal in range(layout.deals):
+        for side in range(2):
+            board = Board(layout.side_length, sizes, rng)
+            start = deal * layout.deal_size + side * board_size
+            for placement in board.fleet.occupancy.placements.values():
+                for index in placement.span.indices:
+                    buffer[start + index] = numbers[placement.name]
+
+
+def read_board(
+    buffer: memoryview, layout: Layout, deal: int, side: int, sizes: Mapping[str, int]
+) -> Board:
+    """Return Board with the fleet of one side of a deal placed on it."""
+    side_length = layout.side_length
+    board_size = side_length * side_length
+    start = deal * layout.deal_size + side * board_size
+    cells = buffer[start : start + board_size]
+    board = Board(grid=Grid(side_length), sizes=sizes)
+    for number, name in enumerate(sizes, start=1):
+        indexes = [i for i, value in enumerate(cells) if value == number]
+        y, x = divmod(indexes[0], side_length)
+        direction = Direction.RIGHT
+        if len(indexes) > 1 and indexes[1] - indexes[0] != 1:
+            direction = Direction.DOWN
+        board.fleet.place(name, x, y, direction)
+    return board
+
+
+def _view(block: "shared_memory.SharedMemory") -> memoryview:
+    """Return buffer of an open shared memory block."""
+    view = block.buf
+    assert view is not None  # noqa: S101
+    return view
+
+
+def play_shard(
+    name: Optional[str],
+    layout: Layout,
+    matches: Sequence[Tuple[int, Pairing]],
+    seed: int,
+    sizes: Mapping[str, int],
+    buffer: Optional[memoryview] = None,
+) -> None:
+    """Play numbered matches, writing their results into the buffer.
+
+    Args:
+        name: Name of the shared memory block holding the buffer, or None
+            if buffer is given.
+        layout: Layout of the buffer.
+        matches: Number and Pairing of each match to play.
+        seed: Seed from which each match's random source is derived.
+        sizes: Entities in each player's fleet.
+        buffer: Buffer to use instead of a shared memory block.
+    """
+    block = None
+    if buffer is None:
+        block = shared_memory.SharedMemory(name=name)
+        buffer = _view(block)
+    try:
+        for number, pairing in matches:
+            rng = random.Random(seed * 1_000_003 + number)  # noqa: S311
+            boards = [
+                read_board(buffer, layout, pairing.deal, side, sizes)
+                for side in range(2)
+            ]
+            factories = (load_strategy(pairing.a), load_strategy(pairing.b))
+            result = play_match(
+                factories,
+                rng,
+                pairing.deal % 2,
+                layout.side_length,
+                sizes,
+                boards=boards,
+            )
+            offset = layout.results_offset + number * RESULT.size
+            RESULT.pack_into(buffer, offset, result.winner, result.moves)
+    finally:
+        if block is not None:
+            block.close()
+
+
+def read_results(
+    buffer: memoryview, layout: Layout, pairings: Sequence[Pairing]
+) -> Iterator[MatchOutcome]:
+    """Yield outcome of every match from the results in buffer."""
+    for number, pairing in enumerate(pairings):
+        offset = layout.results_offset + number * RESULT.size
+        winner, moves = RESULT.unpack_from(buffer, offset)
+        yield MatchOutcome(
+            pairing.a, pairing.b, pairing.b if winner else pairing.a, moves
+        )
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    """Return expected score of a player against an opponent."""
+    return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400.0))
+
+
+def elo_ratings(
+    outcomes: Sequence[MatchOutcome],
+    k_factor: float = K_FACTOR,
+    initial: float = INITIAL_RATING,
+) -> Dict[str, float]:
+    """Return Elo rating of every strategy after outcomes in order."""
+    ratings: Dict[str, float] = {}
+    for outcome in outcomes:
+        ra = ratings.setdefault(outcome.a, initial)
+        rb = ratings.setdefault(outcome.b, initial)
+        expected = expected_score(ra, rb)
+        score = 1.0 if outcome.winner == outcome.a else 0.0
+        ratings[outcome.a] = ra + k_factor * (score - expected)
+        ratings[outcome.b] = rb - k_factor * (score - expected)
+    return ratings
+
+
+class TournamentReport:
+    """Outcomes of a tournament with the resulting ratings."""
+
+    def __init__(self, outcomes: List[MatchOutcome], seconds: float) -> None:
+        """Initialize TournamentReport, rating the strategies."""
+        self.outcomes = outcomes
+        self.seconds = seconds
+        self.ratings = elo_ratings(outcomes)
+
+    def record(self, strategy: str) -> Tuple[int, int]:
+        """Return wins and losses of strategy."""
+        played = [o for o in self.outcomes if strategy in (o.a, o.b)]
+        wins = sum(1 for o in played if o.winner == strategy)
+        return wins, len(played) - wins
+
+    def standings(self) -> List[Tuple[str, float]]:
+        """Return strategies and ratings, highest rating first."""
+        return sorted(self.ratings.items(), key=lambda item: -item[1])
+
+    def format(self) -> str:
+        """Return report as lines of text."""
+        lines = [
+            f"matches: {len(self.outcomes)} in {self.seconds:.2f}s",
+            f"{'strategy':<20} {'elo':>7} {'wins':>6} {'losses':>6}",
+        ]
+        for strategy, rating in self.standings():
+            wins, losses = self.record(strategy)
+            lines.append(f"{strategy:<20} {rating:>7.1f} {wins:>6} {losses:>6}")
+        return "\n".join(lines)
+
+
+def run(
+    strategies: Sequence[str],
+    deals: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    side_length: int = cfg.GRID_SIZE,
+    sizes: Mapping[str, int] = cfg.ENTITY_SIZES,
+) -> TournamentReport:
+    """Play a round robin between strategies across worker processes.
+
+    Args:
+        strategies: Names of at least two strategies, see load_strategy.
+        deals: Deals played by every pair of strategies.
+        workers: Worker processes, defaulting to the number of CPUs.
+        seed: Seed of the deals and of each match's random source.
+        side_length: Length of each side of the boards.
+        sizes: Entities in each player's fleet.
+
+    Returns:
+        TournamentReport: Outcome of every match and the Elo ratings.
+
+    Raises:
+        ValueError: If fewer than two distinct strategies or no deals are
+            given, or if the boards are too small for the longest entity.
+    """
+    strategies = list(dict.fromkeys(strategies))
+    if len(strategies) < 2:
+        raise ValueError("A tournament needs at least two strategies.")
+    if deals < 1:
+        raise ValueError("A tournament needs at least one deal.")
+    longest = max(sizes.values(), default=1)
+    if side_length < longest:
+        raise ValueError(
+            f"Boards of side {side_length} cannot hold an entity of length {longest}."
+        )
+    for name in strategies:
+        load_strategy(name)
+    pairings = schedule(strategies, deals)
+    layout = Layout(side_length, deals, len(pairings))
+    workers = workers or os.cpu_count() or 1
+    numbered = list(enumerate(pairings))
+    shards = [numbered[i::workers] for i in range(workers)]
+    start = time.perf_counter()
+    if workers == 1 or shared_memory is None:
+        buffer = memoryview(bytearray(layout.size))
+        write_deals(buffer, layout, random.Random(seed), sizes)  # noqa: S311
+        play_shard(None, layout, numbered, seed, sizes, buffer)
+        outcomes = list(read_results(buffer, layout, pairings))
+    else:
+        block = shared_memory.SharedMemory(create=True, size=layout.size)
+        try:
+            write_deals(_view(block), layout, random.Random(seed), sizes)  # noqa: S311
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(play_shard, block.name, layout, shard, seed, sizes)
+                    for shard in shards
+                    if shard
+                ]
+                for future in futures:
+                    future.result()
+            outcomes = list(read_results(_view(block), layout, pairings))
+        finally:
+            block.close()
+            block.unlink()
+    return TournamentReport(outcomes, time.perf_counter() - start)
@@ -0,0 +1,137 @@
+"""Bounded cache of evaluated positions, keyed by Zobrist hash.
+
+Searches and strategies reach the same position by different orders of
+moves, and in game after game. A TranspositionTable remembers what a
+position evaluated to, with the depth it was searched to, so the work
+is done once. When full, it evicts by one of two policies:
+
+``lru``
+    Drop the entry used least recently. Suited to memoizing evaluations
+    that do not depend on depth.
+
+``depth``
+    Depth-preferred replacement: each key hashes to one slot, and a new
+    entry only replaces an entry of a different position that was
+    searched no deeper. Deep results, which cost the most to recompute,
+    survive a stream of shallow ones.
+"""
+from collections import OrderedDict
+from typing import Any
+from typing import Hashable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+
+LRU = "lru"
+DEPTH = "depth"
+POLICIES = (LRU, DEPTH)
+
+
+class Entry(NamedTuple):
+    """Stored evaluation of a position and the depth it was searched to."""
+
+    key: Hashable
+    value: Any
+    depth: int
+
+
+class TranspositionTable:
+    """Cache of at most capacity evaluations.
+
+    Args:
+        capacity: Most entries kept.
+        policy: Eviction policy, LRU or DEPTH.
+
+    Raises:
+        ValueError: If capacity is less than 1 or policy is unknown.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, policy: str = LRU) -> None:
+        """Initialize empty TranspositionTable."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, not one of {POLICIES}.")
+        self.capacity = capacity
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[Hashable, Entry]" = OrderedDict()
+        self._slots: List[Optional[Entry]] = []
+        if policy == DEPTH:
+            self._slots = [None] * capacity
+
+    def _find(self, key: Hashable) -> Optional[Entry]:
+        """Return entry of key, marking it recently used, or None."""
+        if self.policy == LRU:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+            return entry
+        entry = self._slots[hash(key) % self.capacity]
+        return entry if entry is not None and entry.key == key else None
+
+    def get(self, key: Hashable, depth: int = 0) -> Optional[Any]:
+        """Return value stored for key if searched at least depth deep.
+
+        Args:
+            key: Position, such as a Grid's zobrist hash.
+            depth: Least depth of a usable result.
+
+        Returns:
+            Optional[Any]: The stored value, or None if there is none
+            deep enough.
+        """
+        entry = self._find(key)
+        if entry is None or entry.depth < depth:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: Hashable, value: Any, depth: int = 0) -> bool:
+        """Store value for key, evicting by the table's policy.
+
+        Args:
+            key: Position, such as a Grid's zobrist hash.
+            value: Evaluation of the position.
+            depth: Depth the position was searched to.
+
+        Returns:
+            bool: True if stored, False if depth-preferred replacement
+            kept a deeper entry of another position instead.
+        """
+        entry = Entry(key, value, depth)
+        if self.policy == LRU:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            if len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+            return True
+        slot = hash(key) % self.capacity
+        held = self._slots[slot]
+        if held is not None and held.key != key and held.depth > depth:
+            return False
+        self._slots[slot] = entry
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if a value is stored for key."""
+        if self.policy == LRU:
+            return key in self._lru
+        entry = self._slots[hash(key) % self.capacity]
+        return entry is not None and entry.key == key
+
+    def __len__(self) -> int:
+        """Return number of stored entries."""
+        if self.policy == LRU:
+            return len(self._lru)
+        return sum(entry is not None for entry in self._slots)
+
+    def clear(self) -> None:
+        """Forget every entry and reset the hit and miss counts."""
+        self._lru.clear()
+        self._slots = [None] * len(self._slots)
+        self.hits = 0
+        self.misses = 0
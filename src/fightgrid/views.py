@@ -0,0 +1,185 @@
+"""Per-observer views of a Grid under fog of war, sent as deltas.
+
+A GridView projects every square of a Grid through a Visibility, which
+picks the label the observer may read and the states hidden from them:
+the owner of a board reads private labels and sees everything, while
+the opponent and spectators read public labels and see HIDDEN squares
+as EMPTY. The projection is computed once and kept up to date from the
+grid's change notifications.
+
+Each change that alters what the view shows is numbered, so the view
+has a version. An observer that last saw some version is sent only the
+squares changed since, and observers at the same version, such as the
+spectators of a match after each move, share one encoded message. A
+view keeps a bounded record of changes; an observer too far behind, or
+new, is sent the whole view instead.
+"""
+import json
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+
+
+Message = Dict[str, Any]
+
+
+class Visibility(NamedTuple):
+    """Label field an observer reads and states shown to them as EMPTY."""
+
+    field: str
+    hidden: FrozenSet[SqState]
+
+
+PRIVATE = Visibility("prv_label", frozenset())
+PUBLIC = Visibility("pub_label", frozenset({SqState.HIDDEN}))
+
+
+class Cell(NamedTuple):
+    """A square as an observer sees it."""
+
+    label: Optional[str]
+    state: SqState
+
+
+class GridView:
+    """Cached projection of a Grid for observers with the same visibility.
+
+    Args:
+        grid: Grid to project; the view follows its changes.
+        visibility: What the observers may see, PUBLIC by default.
+        history: Most changes remembered for deltas, by default four
+            per square.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        visibility: Visibility = PUBLIC,
+        history: Optional[int] = None,
+    ) -> None:
+        """Initialize GridView from the current squares of grid."""
+        self.grid = grid
+        self.visibility = visibility
+        squares = grid.side_length * grid.height
+        self.history = 4 * squares if history is None else history
+        self._cells = [self._project(grid.get_square_index(i)) for i in range(squares)]
+        # Index of the square changed by each version after _base.
+        self._log: List[int] = []
+        self._base = 0
+        self._encoded: Dict[int, bytes] = {}
+        grid.add_listener(self._on_change)
+
+    def detach(self) -> None:
+        """Stop following changes of the grid."""
+        self.grid.remove_listener(self._on_change)
+
+    @property
+    def version(self) -> int:
+        """Number of changes to the view so far."""
+        return self._base + len(self._log)
+
+    def _project(self, sq: Square) -> Cell:
+        """Return Cell of sq as the observers see it."""
+        state = sq.state
+        if state in self.visibility.hidden:
+            state = SqState.EMPTY
+        return Cell(getattr(sq, self.visibility.field), state)
+
+    def _on_change(self, sq: Square, field: str, old: Any, new: Any) -> None:
+        """Record a change of a square if it alters what is seen of it."""
+        if field != "state" and field != self.visibility.field:
+            return
+        index = sq.y * self.grid.side_length + sq.x
+        cell = self._project(sq)
+        if cell == self._cells[index]:
+            return
+        self._cells[index] = cell
+        self._log.append(index)
+        self._encoded.clear()
+        if len(self._log) > self.history:
+            dropped = len(self._log) - self.history // 2
+            del self._log[:dropped]
+            self._base += dropped
+
+    def cell(self, x: int, y: int) -> Cell:
+        """Return Cell of the square at x and y."""
+        return self._cells[y * self.grid.side_length + x]
+
+    def rows(self) -> List[List[Cell]]:
+        """Return every Cell as a list of rows."""
+        side = self.grid.side_length
+        return [self._cells[y * side : (y + 1) * side] for y in range(self.grid.height)]
+
+    def delta(self, since: int = -1) -> Message:
+        """Return message with the squares changed after version since.
+
+        Args:
+            since: Version the observer last saw, -1 for none.
+
+        Returns:
+            Message: The version, whether every square is included, and
+            a list of [index, label, state name] for each square sent.
+            Every square is sent if since is -1 or older than the
+            changes the view remembers.
+        """
+        full = since < self._base
+        if full:
+            indexes = list(range(len(self._cells)))
+        else:
+            indexes = sorted(set(self._log[since - self._base :]))
+        cells = self._cells
+        return {
+            "version": self.version,
+            "full": full,
+            "cells": [[i, cells[i].label, cells[i].state.name] for i in indexes],
+        }
+
+    def encoded(self, since: int = -1) -> bytes:
+        """Return delta op since a version as a JSON line, shared until changed."""
+        data = self._encoded.get(since)
+        if data is None:
+            message = json.dumps(
+                {"op": "delta", **self.delta(since)}, separators=(",", ":")
+            )
+            data = self._encoded[since] = message.encode("utf-8") + b"\n"
+        return data
+
+    def observe(self) -> "Observer":
+        """Return Observer that has seen nothing of the view yet."""
+        return Observer(self)
+
+
+class Observer:
+    """One recipient of a GridView, remembering the version it last saw."""
+
+    def __init__(self, view: GridView) -> None:
+        """Initialize Observer of view."""
+        self.view = view
+        self.version = -1
+
+    def pending(self) -> bool:
+        """Return True if the view changed since the observer last saw it."""
+        return self.version != self.view.version
+
+    def update(self) -> Optional[Message]:
+        """Return delta since last seen, or None if nothing changed."""
+        if not self.pending():
+            return None
+        message = self.view.delta(self.version)
+        self.version = self.view.version
+        return message
+
+    def update_encoded(self) -> Optional[bytes]:
+        """Return encoded delta since last seen, or None if nothing changed."""
+        if not self.pending():
+            return None
+        data = self.view.encoded(self.version)
+        self.version = self.view.version
+        return data
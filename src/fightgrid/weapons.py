@@ -0,0 +1,206 @@
+"""Area-of-effect templates for weapons striking several squares at once.
+
+A Template is a hashable tuple of (dx, dy) offsets from the square aimed
+at. Clipping a template to a grid, which drops offsets that leave the
+grid or land on blocked squares and wraps them on a torus, is cached
+per template, topology and center, so a weapon fired every turn looks
+its squares up instead of recomputing them. The clipped squares are
+also cached as a bitmask, letting apply_aoe pick out the squares to
+change with a few bitwise operations on the grid's BitBoard.
+"""
+from functools import lru_cache
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from fightgrid.bitboard import iter_bits
+from fightgrid.grid import DIRECTION_OFFSETS
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.topology import Topology
+
+
+Offset = Tuple[int, int]
+
+
+class Template(NamedTuple):
+    """Named shape of squares struck, as offsets from the aimed square."""
+
+    name: str
+    offsets: Tuple[Offset, ...]
+
+
+class AreaResult(NamedTuple):
+    """Masks of squares an area weapon turned into HITs and MISSes."""
+
+    hits: int
+    misses: int
+
+
+def cross(radius: int = 1) -> Template:
+    """Return Template of the center and radius squares along each axis."""
+    offsets = [(0, 0)]
+    for distance in range(1, radius + 1):
+        offsets += [(0, -distance), (-distance, 0), (distance, 0), (0, distance)]
+    return Template(f"cross{radius}", tuple(offsets))
+
+
+def line(length: int, direction: Direction = Direction.RIGHT) -> Template:
+    """Return Template of length squares from the center along direction."""
+    dx, dy = DIRECTION_OFFSETS[direction]
+    offsets = tuple((dx * i, dy * i) for i in range(length))
+    return Template(f"line{length}-{direction.name.lower()}", offsets)
+
+
+def diamond(radius: int) -> Template:
+    """Return Template of squares within Manhattan distance radius."""
+    offsets = tuple(
+        (dx, dy)
+        for dy in range(-radius, radius + 1)
+        for dx in range(-radius, radius + 1)
+        if abs(dx) + abs(dy) <= radius
+    )
+    return Template(f"diamond{radius}", offsets)
+
+
+def block(radius: int = 1) -> Template:
+    """Return Template of the square of side 2 * radius + 1 around center."""
+    offsets = tuple(
+        (dx, dy)
+        for dy in range(-radius, radius + 1)
+        for dx in range(-radius, radius + 1)
+    )
+    return Template(f"block{radius}", offsets)
+
+
+def from_mask(
+    rows: Sequence[str],
+    mark: str = "X",
+    center: Optional[Offset] = None,
+    name: str = "mask",
+) -> Template:
+    """Return Template drawn as rows of text.
+
+    Args:
+        rows: Strings with mark at each struck square.
+        mark: Character marking a struck square.
+        center: Column and row of the aimed square within rows, by
+            default the middle of the drawing.
+        name: Name of the template.
+
+    Returns:
+        Template: Offsets of the marked squares from center.
+    """
+    if center is None:
+        center = (max(map(len, rows), default=0) // 2, len(rows) // 2)
+    cx, cy = center
+    offsets = tuple(
+        (x - cx, y - cy)
+        for y, row in enumerate(rows)
+        for x, char in enumerate(row)
+        if char == mark
+    )
+    return Template(name, offsets)
+
+
+RETICLE = block(1)
+
+
+@lru_cache(maxsize=4096)
+def clip(template: Template, topology: Topology, center: int) -> Tuple[int, ...]:
+    """Return indexes struck by template aimed at the center index.
+
+    Args:
+        template: Shape of the weapon.
+        topology: Shape of the grid.
+        center: Row-major index of the aimed square.
+
+    Returns:
+        Tuple[int, ...]: Distinct indexes in template order, leaving out
+        squares off a grid that does not wrap and blocked squares.
+    """
+    width, height = topology.width, topology.height
+    y, x = divmod(center, width)
+    struck = []
+    for dx, dy in template.offsets:
+        tx, ty = x + dx, y + dy
+        if topology.wrap:
+            tx %= width
+            ty %= height
+        elif not (0 <= tx < width and 0 <= ty < height):
+            continue
+        index = ty * width + tx
+        if index not in topology.blocked:
+            struck.append(index)
+    return tuple(dict.fromkeys(struck))
+
+
+@lru_cache(maxsize=4096)
+def clip_mask(template: Template, topology: Topology, center: int) -> int:
+    """Return bitmask of the indexes clip returns."""
+    mask = 0
+    for index in clip(template, topology, center):
+        mask |= 1 << index
+    return mask
+
+
+def _center(grid: Grid, sq: Square) -> Optional[int]:
+    """Return index of the square aimed at, None if it is off the grid."""
+    if not (0 <= sq.x < grid.side_length and 0 <= sq.y < grid.height):
+        return None
+    return sq.y * grid.side_length + sq.x
+
+
+def area_squares(grid: Grid, template: Template, sq: Square) -> List[Square]:
+    """Return Squares of grid struck by template aimed at sq.
+
+    Args:
+        grid: Grid fired upon.
+        template: Shape of the weapon.
+        sq: Square aimed at.
+
+    Returns:
+        List[Square]: Squares struck, in the order clip gives them.
+
+    Raises:
+        ValueError: If sq is off the grid.
+    """
+    center = _center(grid, sq)
+    if center is None:
+        raise ValueError(f"Square x{sq.x} y{sq.y} is off the grid.")
+    return [grid.get_square_index(i) for i in clip(template, grid.topology, center)]
+
+
+def apply_aoe(grid: Grid, template: Template, sq: Square) -> AreaResult:
+    """Fire template at sq, turning HIDDEN squares HIT and EMPTY ones MISS.
+
+    Squares already fired upon are left alone. The squares to change are
+    found with bitwise operations on grid.bits, then set one by one so
+    listeners of the grid see every change.
+
+    Args:
+        grid: Grid to fire upon.
+        template: Shape of the weapon.
+        sq: Square aimed at.
+
+    Returns:
+        AreaResult: Masks of the squares hit and missed.
+
+    Raises:
+        ValueError: If sq is off the grid.
+    """
+    center = _center(grid, sq)
+    if center is None:
+        raise ValueError(f"Square x{sq.x} y{sq.y} is off the grid.")
+    mask = clip_mask(template, grid.topology, center)
+    hits = mask & grid.bits.mask(SqState.HIDDEN)
+    misses = mask & grid.bits.mask(SqState.EMPTY)
+    for index in iter_bits(hits):
+        grid.get_square_index(index).state = SqState.HIT
+    for index in iter_bits(misses):
+        grid.get_square_index(index).state = SqState.MISS
+    return AreaResult(hits, misses)
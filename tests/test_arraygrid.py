@@ -0,0 +1,134 @@
+"""Test cases for arraygrid module."""
+import pytest
+
+import fightgrid.config as cfg
+from fightgrid import grid
+
+
+pytest.importorskip("numpy")
+
+from fightgrid import arraygrid  # noqa: E402
+
+
+@pytest.fixture
+def array_grid() -> arraygrid.ArrayGrid:
+    """Pytest fixture with array grid of default size."""
+    return arraygrid.ArrayGrid(
+        side_length=cfg.GRID_SIZE, def_pub_label="w", def_prv_label="x"
+    )
+
+
+def test_label_table_interns() -> None:
+    """Test same label gets same id, None gets 0."""
+    labels = arraygrid.LabelTable()
+    assert labels.intern(None) == 0
+    a_id = labels.intern("a")
+    assert labels.intern("b") != a_id
+    assert labels.intern("a") == a_id
+    assert labels.label(a_id) == "a"
+    assert len(labels) == 3
+
+
+def test_label_table_overflow(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test OverflowError when label ids no longer fit the plane."""
+    labels = arraygrid.LabelTable()
+    monkeypatch.setattr(labels, "_labels", [None] * 65536)
+    with pytest.raises(OverflowError):
+        labels.intern("z")
+
+
+def test_planes_are_compact(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test planes have grid shape and small dtypes."""
+    shape = (cfg.GRID_SIZE, cfg.GRID_SIZE)
+    assert array_grid.states.shape == shape
+    assert array_grid.states.itemsize == 1
+    assert array_grid.pub_labels.itemsize == 2
+
+
+def test_square_view_reads_defaults(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test views report default labels and state."""
+    sq = array_grid.get_square_xy(2, 3)
+    assert sq == grid.Square(2, 3)
+    assert sq.pub_label == "w"
+    assert sq.prv_label == "x"
+    assert sq.highlight is None
+    assert sq.state is grid.SqState.EMPTY
+    assert repr(sq) == "Sq x2 y3 pub:w prv:x state:EMPTY"
+
+
+def test_square_view_writes_planes(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test writes through a view land in the planes."""
+    sq = array_grid.get_square(grid.Square(4, 1))
+    sq.state = grid.SqState.HIT
+    sq.pub_label = "H"
+    sq.prv_label = "B"
+    sq.highlight = "red"
+    again = array_grid.get_square_xy(4, 1)
+    assert again.state is grid.SqState.HIT
+    assert again.pub_label == "H"
+    assert again.prv_label == "B"
+    assert again.highlight == "red"
+    assert array_grid.states[1, 4] == grid.SqState.HIT.value
+
+
+def test_unchanged_labels_notify_nobody(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test rewriting a label with its current value calls no listener."""
+    seen = []
+    array_grid.add_listener(lambda sq, field, old, new: seen.append(field))
+    sq = array_grid.get_square_xy(0, 0)
+    sq.pub_label = "w"
+    sq.prv_label = "x"
+    sq.highlight = None
+    assert seen == []
+    sq.highlight = "red"
+    assert seen == ["highlight"]
+
+
+def test_projected_from(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test inherited projection works on views."""
+    start = array_grid.get_square_xy(0, 0)
+    end = array_grid.projected_from(start, grid.Direction.RIGHT, 3)
+    assert end == grid.Square(3, 0)
+    assert array_grid.projected_from(start, grid.Direction.UP) is None
+
+
+def test_grid_string_labels(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test string matches the object-backed Grid."""
+    plain = grid.Grid(cfg.GRID_SIZE, def_pub_label="w", def_prv_label="x")
+    array_grid.get_square_xy(1, 1).pub_label = None
+    plain.get_square_xy(1, 1).pub_label = None
+    assert array_grid.grid_string_labels() == plain.grid_string_labels()
+    assert array_grid.grid_string_labels(prv=True) == plain.grid_string_labels(prv=True)
+    assert repr(array_grid) == repr(plain)
+
+
+def test_label_at(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test labels read by index or row match the object-backed Grid."""
+    plain = grid.Grid(cfg.GRID_SIZE, def_pub_label="w", def_prv_label="x")
+    array_grid.get_square_xy(1, 1).pub_label = "o"
+    plain.get_square_xy(1, 1).pub_label = "o"
+    for index in (0, cfg.GRID_SIZE + 1):
+        assert array_grid.label_at(index) == plain.label_at(index)
+        assert array_grid.label_at(index, prv=True) == plain.label_at(index, prv=True)
+    assert array_grid.row_labels(1) == plain.row_labels(1)
+    assert array_grid.row_labels(1, prv=True) == plain.row_labels(1, prv=True)
+
+
+def test_square_view_state_updates_bits(array_grid: arraygrid.ArrayGrid) -> None:
+    """Test state writes through a view keep bitboards in sync."""
+    array_grid.get_square_xy(2, 0).state = grid.SqState.MISS
+    array_grid.get_square_xy(2, 0).state = grid.SqState.MISS
+    assert array_grid.bits.members(grid.SqState.MISS) == {2}
+    assert array_grid.bits.count(grid.SqState.EMPTY) == cfg.GRID_SIZE**2 - 1
+
+
+def test_fork_copies_planes() -> None:
+    """Test a fork of an ArrayGrid changes independently of it."""
+    g = arraygrid.ArrayGrid(4, def_pub_label="w")
+    child = g.fork()
+    child.get_square_xy(1, 2).state = grid.SqState.HIT
+    child.get_square_xy(1, 2).pub_label = "o"
+    assert g.get_square_xy(1, 2).state is grid.SqState.EMPTY
+    assert g.get_square_xy(1, 2).pub_label == "w"
+    assert child.bits.count(grid.SqState.HIT) == 1
+    assert g.bits.count(grid.SqState.HIT) == 0
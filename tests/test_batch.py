@@ -0,0 +1,101 @@
+"""Test cases for batch module."""
+from typing import Any
+from typing import Tuple
+
+import pytest
+
+import fightgrid.config as cfg
+from fightgrid import grid
+from fightgrid.topology import Topology
+
+
+np = pytest.importorskip("numpy")
+
+from fightgrid import batch  # noqa: E402
+
+
+Coords = Tuple[Any, Any]
+
+
+@pytest.fixture
+def default_grid() -> grid.Grid:
+    """Pytest fixture with grid of default size."""
+    return grid.Grid(side_length=cfg.GRID_SIZE)
+
+
+@pytest.fixture
+def all_coords() -> Coords:
+    """Pytest fixture with x and y of every square plus a border outside."""
+    ys, xs = np.mgrid[-1 : cfg.GRID_SIZE + 1, -1 : cfg.GRID_SIZE + 1]
+    return xs.ravel(), ys.ravel()
+
+
+def test_valid_mask_and_indices(default_grid: grid.Grid, all_coords: Coords) -> None:
+    """Test mask and indexes agree with single-square bounds."""
+    xs, ys = all_coords
+    mask = batch.valid_mask(default_grid, xs, ys)
+    idx = batch.indices(default_grid, xs, ys)
+    for x, y, valid, i in zip(xs, ys, mask, idx):
+        inside = 0 <= x < cfg.GRID_SIZE and 0 <= y < cfg.GRID_SIZE
+        assert valid == inside
+        assert i == (y * cfg.GRID_SIZE + x if inside else -1)
+
+
+def test_coords_round_trip(default_grid: grid.Grid) -> None:
+    """Test coords inverts indices."""
+    xs, ys = batch.coords(default_grid, [0, 10, 80])
+    assert xs.tolist() == [0, 1, 8]
+    assert ys.tolist() == [0, 1, 8]
+    assert batch.indices(default_grid, xs, ys).tolist() == [0, 10, 80]
+
+
+@pytest.mark.parametrize("direction", list(grid.Direction))
+def test_projected_indices(
+    default_grid: grid.Grid, all_coords: Coords, direction: grid.Direction
+) -> None:
+    """Test batch projection matches projected_from for every direction."""
+    xs, ys = all_coords
+    projected = batch.projected_indices(default_grid, xs, ys, direction, 2)
+    for x, y, i in zip(xs.tolist(), ys.tolist(), projected.tolist()):
+        single = default_grid.projected_from(grid.Square(x, y), direction, 2)
+        assert batch.squares(default_grid, [i]) == ([single] if single else [])
+
+
+def test_surrounding_and_reticle(default_grid: grid.Grid, all_coords: Coords) -> None:
+    """Test neighbor arrays match surrounding_squares and reticle_squares."""
+    xs, ys = all_coords
+    surrounding = batch.surrounding_indices(default_grid, xs, ys)
+    reticle = batch.reticle_indices(default_grid, xs, ys)
+    assert surrounding.shape == (len(xs), 4)
+    assert reticle.shape == (len(xs), 8)
+    for x, y, near, ret in zip(xs.tolist(), ys.tolist(), surrounding, reticle):
+        sq = grid.Square(x, y)
+        assert batch.squares(default_grid, near) == default_grid.surrounding_squares(sq)
+        assert batch.squares(default_grid, ret) == default_grid.reticle_squares(sq)
+
+
+@pytest.mark.parametrize(
+    "topology",
+    [
+        Topology(5, 2),
+        Topology(4, 3, wrap=True),
+        Topology.from_rows(["..#.", "#...", "...."]),
+        Topology.from_rows(["..#", "#..", "...", ".#."], wrap=True),
+    ],
+)
+def test_queries_follow_topology(topology: Topology) -> None:
+    """Test batch queries match single-square ones on any topology."""
+    g = grid.Grid(topology=topology)
+    ys, xs = np.mgrid[-1 : topology.height + 2, -1 : topology.width + 1]
+    xs, ys = xs.ravel(), ys.ravel()
+    mask = batch.valid_mask(g, xs, ys)
+    idx = batch.indices(g, xs, ys)
+    for x, y, valid, i in zip(xs.tolist(), ys.tolist(), mask, idx.tolist()):
+        assert valid == g.square_valid(grid.Square(x, y))
+        assert i == (y * topology.width + x if valid else -1)
+    for direction in grid.Direction:
+        for distance in (1, 2):
+            projected = batch.projected_indices(g, xs, ys, direction, distance)
+            for x, y, i in zip(xs.tolist(), ys.tolist(), projected.tolist()):
+                single = g.projected_from(grid.Square(x, y), direction, distance)
+                assert batch.squares(g, [i]) == ([single] if single else [])
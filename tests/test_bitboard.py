@@ -0,0 +1,121 @@
+"""Test cases for bitboard module."""
+import pytest
+
+from fightgrid import bitboard
+from fightgrid import grid
+from fightgrid.grid import SqState
+
+
+@pytest.fixture
+def small_grid() -> grid.Grid:
+    """Pytest fixture with a 4x4 grid."""
+    return grid.Grid(side_length=4)
+
+
+def test_iter_bits_and_popcount() -> None:
+    """Test set bits are listed lowest first and counted."""
+    assert list(bitboard.iter_bits(0b10110)) == [1, 2, 4]
+    assert bitboard.popcount(0b10110) == 3
+
+
+def test_new_board_all_empty(small_grid: grid.Grid) -> None:
+    """Test every square starts EMPTY."""
+    bits = small_grid.bits
+    assert bits.count(SqState.EMPTY) == 16
+    assert bits.mask(SqState.EMPTY) == bits.full
+    assert bits.members(SqState.HIT) == set()
+    assert bits.cleared()
+
+
+def test_grid_keeps_bits_in_sync(small_grid: grid.Grid) -> None:
+    """Test state assignment on grid Squares updates the bitboards."""
+    sq = small_grid.get_square_xy(1, 2)
+    sq.state = SqState.HIDDEN
+    assert small_grid.bits.members(SqState.HIDDEN) == {9}
+    assert not small_grid.bits.cleared()
+    small_grid.set_state(grid.Square(1, 2), SqState.HIT)
+    assert small_grid.bits.members(SqState.HIT) == {9}
+    assert small_grid.bits.count(SqState.HIDDEN) == 0
+    assert small_grid.bits.state_at(9) is SqState.HIT
+    assert small_grid.bits.count(*bitboard.SHOT_STATES) == 1
+
+
+def test_state_at_off_board(small_grid: grid.Grid) -> None:
+    """Test IndexError for an index past the board."""
+    with pytest.raises(IndexError):
+        small_grid.bits.state_at(16)
+
+
+def test_neighbors_do_not_wrap(small_grid: grid.Grid) -> None:
+    """Test neighbors of edge squares stay on their own row."""
+    bits = small_grid.bits
+    right_edge = 1 << 7  # x3 y1
+    assert set(bitboard.iter_bits(bits.neighbors(right_edge))) == {3, 6, 11}
+    left_edge = 1 << 4  # x0 y1
+    assert set(bitboard.iter_bits(bits.neighbors(left_edge))) == {0, 5, 8}
+
+
+def test_neighbors_diagonal_match_reticle(small_grid: grid.Grid) -> None:
+    """Test diagonal neighbors match reticle_squares for every square."""
+    bits = small_grid.bits
+    for index in range(16):
+        sq = small_grid.get_square_index(index)
+        expected = {s.y * 4 + s.x for s in small_grid.reticle_squares(sq)}
+        found = set(bitboard.iter_bits(bits.neighbors(1 << index, diagonal=True)))
+        assert found == expected
+
+
+def test_frontier_and_adjacent_hits(small_grid: grid.Grid) -> None:
+    """Test hunt queries around hits."""
+    for x in (1, 2):
+        small_grid.get_square_xy(x, 1).state = SqState.HIT
+    small_grid.get_square_xy(1, 0).state = SqState.MISS
+    bits = small_grid.bits
+    assert set(bitboard.iter_bits(bits.adjacent_hits())) == {5, 6}
+    assert set(bitboard.iter_bits(bits.frontier())) == {2, 4, 7, 9, 10}
+    assert bits.unshot() & bits.shot() == 0
+
+
+def test_copy_is_independent() -> None:
+    """Test a copied BitBoard does not share its masks."""
+    b = bitboard.BitBoard(3)
+    other = b.copy()
+    other.move(4, SqState.EMPTY, SqState.HIT)
+    assert b.count(SqState.HIT) == 0
+    assert other.count(SqState.HIT) == 1
+    assert other.neighbors(1 << 4) == b.neighbors(1 << 4)
+
+
+def test_zobrist_follows_position() -> None:
+    """Test the hash depends on the position, not the moves leading to it."""
+    a, b = grid.Grid(4), grid.Grid(4)
+    assert a.zobrist == 0
+    a.get_square_index(3).state = SqState.HIT
+    a.get_square_index(7).state = SqState.MISS
+    b.get_square_index(7).state = SqState.HIDDEN
+    b.get_square_index(7).state = SqState.MISS
+    assert a.zobrist != b.zobrist
+    b.get_square_index(3).state = SqState.HIT
+    assert a.zobrist == b.zobrist
+    a.get_square_index(3).state = SqState.EMPTY
+    a.get_square_index(7).state = SqState.EMPTY
+    assert a.zobrist == 0
+    assert a.fork().zobrist == 0 and b.fork().zobrist == b.zobrist
+
+
+def test_zobrist_keys() -> None:
+    """Test keys are 64-bit, distinct and 0 for EMPTY."""
+    keys = {
+        bitboard.zobrist_key(index, state)
+        for index in range(9)
+        for state in SqState
+        if state is not SqState.EMPTY
+    }
+    assert len(keys) == 9 * (len(SqState) - 1)
+    assert all(0 < key < 1 << 64 for key in keys)
+    assert bitboard.zobrist_key(4, SqState.EMPTY) == 0
+    full = bitboard.BitBoard(3, SqState.HIDDEN)
+    expected = 0
+    for index in range(9):
+        expected ^= bitboard.zobrist_key(index, SqState.HIDDEN)
+    assert full.zobrist == expected
@@ -0,0 +1,76 @@
+"""Test cases for components module."""
+from fightgrid.components import Component
+from fightgrid.components import HitComponents
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+
+
+def hit(grid: Grid, *coords: int) -> None:
+    """Set the squares at pairs of x and y coordinates to HIT."""
+    for x, y in zip(coords[::2], coords[1::2]):
+        grid.get_square_xy(x, y).state = SqState.HIT
+
+
+def component(comps: HitComponents, x: int, y: int) -> Component:
+    """Return the component at x and y, which must exist."""
+    result = comps.component(x, y)
+    assert result is not None
+    return result
+
+
+def test_joins_adjacent_hits() -> None:
+    """Test adjacent HITs form one component with its bounding box."""
+    grid = Grid(5)
+    hit(grid, 1, 1)
+    comps = HitComponents(grid)
+    hit(grid, 3, 1, 2, 1, 4, 4)
+    root = component(comps, 1, 1).root
+    assert component(comps, 3, 1) == Component(root, 3, 1, 1, 3, 1)
+    assert comps.size(2, 1) == 3
+    assert comps.size(4, 4) == 1
+    assert comps.size(0, 0) == 0
+    assert comps.component(0, 0) is None
+    assert comps.members(1, 1) == [6, 7, 8]
+    assert [c.size for c in comps.components()] == [3, 1]
+
+
+def test_orientation() -> None:
+    """Test rows and columns have an orientation, other shapes none."""
+    grid = Grid(5)
+    comps = HitComponents(grid)
+    hit(grid, 0, 0, 0, 1, 0, 2)
+    hit(grid, 2, 4, 3, 4)
+    hit(grid, 3, 0, 4, 0, 4, 1)
+    assert component(comps, 0, 1).orientation is Direction.DOWN
+    assert component(comps, 2, 4).orientation is Direction.RIGHT
+    assert component(comps, 4, 1).orientation is Direction.NONE
+
+
+def test_rebuilds_after_squares_leave_state() -> None:
+    """Test sinking part of a component splits it."""
+    grid = Grid(5)
+    comps = HitComponents(grid)
+    hit(grid, 0, 0, 1, 0, 2, 0)
+    assert comps.size(0, 0) == 3
+    grid.get_square_xy(1, 0).state = SqState.SUNK
+    assert comps.size(0, 0) == 1
+    assert comps.size(2, 0) == 1
+    hit(grid, 2, 1)
+    assert comps.size(2, 1) == 2
+    comps.detach()
+    hit(grid, 4, 4)
+    assert comps.size(4, 4) == 0
+
+
+def test_closing_a_loop_and_other_changes() -> None:
+    """Test a square joining one component twice, and label changes."""
+    grid = Grid(5)
+    comps = HitComponents(grid)
+    hit(grid, 0, 0, 1, 0, 0, 1)
+    assert comps.size(0, 0) == 3
+    grid.get_square_xy(1, 1).pub_label = "X"
+    hit(grid, 1, 1)
+    assert comps.size(1, 1) == 4
+    assert len(comps.components()) == 1
+    assert comps.members(4, 4) == []
@@ -0,0 +1,55 @@
+"""Test cases for config module."""
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import fightgrid.config as cfg
+
+
+@pytest.fixture(autouse=True)
+def restore_config() -> Iterator[None]:
+    """Put back the settings a test loads."""
+    grid_size, entity_sizes = cfg.GRID_SIZE, dict(cfg.ENTITY_SIZES)
+    yield
+    cfg.GRID_SIZE = grid_size
+    cfg.ENTITY_SIZES.clear()
+    cfg.ENTITY_SIZES.update(entity_sizes)
+
+
+def test_load_replaces_settings(tmp_path: Path) -> None:
+    """Test settings are read from a TOML file, fleet updated in place."""
+    fleet = cfg.ENTITY_SIZES
+    path = tmp_path / "fightgrid.toml"
+    path.write_text('grid_size = 12\n[entity_sizes]\n"Carrier" = 5\n')
+    cfg.load(str(path))
+    assert cfg.GRID_SIZE == 12
+    assert cfg.ENTITY_SIZES is fleet
+    assert fleet == {"Carrier": 5}
+
+
+def test_load_keeps_missing_settings(tmp_path: Path) -> None:
+    """Test settings left out of the file keep their values."""
+    path = tmp_path / "fightgrid.toml"
+    path.write_text("grid_size = 10\n")
+    cfg.load(str(path))
+    assert cfg.GRID_SIZE == 10
+    assert cfg.ENTITY_SIZES["Battleship"] == 4
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "colour = 'red'\n",
+        "grid_size = 0\n",
+        "grid_size = 3\n[entity_sizes]\nBattleship = 4\n",
+        "entity_sizes = 4\n",
+    ],
+)
+def test_load_rejects_bad_settings(tmp_path: Path, text: str) -> None:
+    """Test unknown or invalid settings are refused."""
+    path = tmp_path / "fightgrid.toml"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        cfg.load(str(path))
+    assert cfg.GRID_SIZE == 9
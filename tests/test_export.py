@@ -0,0 +1,104 @@
+"""Test cases for export module."""
+from pathlib import Path
+
+import pytest
+
+from fightgrid.game import Shot
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.topology import Topology
+
+
+pytest.importorskip("numpy")
+
+from fightgrid import export  # noqa: E402
+
+
+def test_grid_states() -> None:
+    """Test states are read from the BitBoard in row-major order."""
+    grid = Grid(3)
+    grid.get_square_xy(2, 0).state = SqState.HIT
+    grid.get_square_xy(0, 2).state = SqState.MISS
+    states = export.grid_states(grid)
+    assert states.tolist() == [1, 1, 3, 1, 1, 1, 4, 1, 1]
+
+
+def test_npz_round_trip(tmp_path: Path) -> None:
+    """Test moves come back in order from several shards."""
+    path = str(tmp_path / "shards")
+    moves = export.export_matches(path, 3, ("random", "hunt"), seed=1, chunk_rows=40)
+    shards = sorted(p.name for p in (tmp_path / "shards").iterdir())
+    assert shards[0] == "shard-00000.npz"
+    assert len(shards) == -(-moves // 40)
+    records = list(export.iter_moves(path))
+    assert len(records) == moves
+    assert [r.move for r in records if r.match == 0] == list(
+        range(sum(r.match == 0 for r in records))
+    )
+    assert {r.match for r in records} == {0, 1, 2}
+    last = records[-1]
+    assert last.sunk is not None and last.outcome is SqState.SUNK
+    assert SqState.HIDDEN.value not in last.states
+    first = records[0]
+    assert first.states[first.y * 9 + first.x] == first.outcome.value
+
+
+def test_chunks_hold_metadata(tmp_path: Path) -> None:
+    """Test each shard describes its own columns."""
+    path = str(tmp_path / "shards")
+    export.export_matches(path, 1, ("random", "random"), chunk_rows=1000)
+    (meta, columns), *rest = list(export.iter_chunks(path))
+    assert rest == []
+    assert meta["version"] == export.VERSION
+    assert meta["side_length"] == 9
+    assert meta["columns"][-1] == "states"
+    assert sorted(columns) == sorted(meta["columns"])
+    assert columns["states"].shape == (len(columns["match"]), 81)
+
+
+def test_writer_bounds_buffer(tmp_path: Path) -> None:
+    """Test the writer reuses one chunk of buffers, flushing when full."""
+    grid = Grid(9)
+    with export.ExportWriter(str(tmp_path / "shards"), chunk_rows=4) as writer:
+        buffer = writer._states
+        for move in range(10):
+            shot = Shot(SqState.MISS)
+            writer.add(0, move, 0, move % 9, 0, shot, grid)
+        assert writer._states is buffer
+        assert writer.chunks == 2
+    assert writer.chunks == 3 and writer.rows == 10
+    with pytest.raises(ValueError):
+        export.ExportWriter(str(tmp_path / "other"), chunk_rows=0)
+
+
+def test_writer_rejects_other_shapes(tmp_path: Path) -> None:
+    """Test ValueError for a grid that is not a board of side_length."""
+    shot = Shot(SqState.MISS)
+    with export.ExportWriter(str(tmp_path / "shards"), side_length=9) as writer:
+        for grid in (Grid(8), Grid(topology=Topology(9, 5))):
+            with pytest.raises(ValueError):
+                writer.add(0, 0, 0, 0, 0, shot, grid)
+    assert writer.rows == 0
+
+
+def test_overwrites_earlier_export(tmp_path: Path) -> None:
+    """Test a smaller export over a larger one reads back only its rows."""
+    path = str(tmp_path / "shards")
+    export.export_matches(path, 4, ("random", "random"), chunk_rows=20)
+    grid = Grid(9)
+    with export.ExportWriter(path, chunk_rows=4) as writer:
+        for move in range(8):
+            writer.add(0, move, 0, move, 0, Shot(SqState.MISS), grid)
+    assert writer.chunks == 2
+    assert len(list((tmp_path / "shards").iterdir())) == 2
+    assert [r.move for r in export.iter_moves(path)] == list(range(8))
+
+
+def test_parquet_round_trip(tmp_path: Path) -> None:
+    """Test Parquet row groups read back as the npz shards do."""
+    pytest.importorskip("pyarrow")
+    shards = str(tmp_path / "shards")
+    parquet = str(tmp_path / "moves.parquet")
+    export.export_matches(shards, 2, ("random", "hunt"), seed=3, chunk_rows=50)
+    export.export_matches(parquet, 2, ("random", "hunt"), seed=3, chunk_rows=50)
+    assert list(export.iter_moves(parquet)) == list(export.iter_moves(shards))
@@ -0,0 +1,87 @@
+"""Test cases for game module."""
+import random
+
+import pytest
+
+from fightgrid import game
+from fightgrid import grid
+from fightgrid import weapons
+from fightgrid.grid import Direction
+from fightgrid.grid import SqState
+from fightgrid.topology import Topology
+
+
+@pytest.fixture
+def board() -> game.Board:
+    """Pytest fixture with a Patrol Boat at x1 y1 pointing right."""
+    b = game.Board(grid=grid.Grid(side_length=4), sizes={"Patrol Boat": 2})
+    b.fleet.place("Patrol Boat", 1, 1, Direction.RIGHT)
+    return b
+
+
+def test_random_board_places_fleet() -> None:
+    """Test board places fleet when no grid is given."""
+    b = game.Board(rng=random.Random(1))  # noqa: S311
+    assert len(b.fleet.occupancy.placements) == 3
+
+
+def test_miss(board: game.Board) -> None:
+    """Test firing on empty square is a miss with public marker."""
+    assert board.fire(0, 0) == game.Shot(SqState.MISS)
+    sq = board.grid.get_square_xy(0, 0)
+    assert sq.state is SqState.MISS
+    assert sq.pub_label == game.MISS_LABEL
+
+
+def test_hit_then_sunk(board: game.Board) -> None:
+    """Test hits until the entity sinks and the board is defeated."""
+    assert board.fire(1, 1) == game.Shot(SqState.HIT)
+    assert board.grid.get_square_xy(1, 1).pub_label == game.HIT_LABEL
+    assert not board.defeated()
+    assert board.fire(2, 1) == game.Shot(SqState.SUNK, "Patrol Boat")
+    for x in (1, 2):
+        sq = board.grid.get_square_xy(x, 1)
+        assert sq.state is SqState.SUNK
+        assert sq.pub_label == "P"
+    assert board.defeated()
+
+
+def test_fire_rejects_repeat_and_off_grid(board: game.Board) -> None:
+    """Test ValueError for squares already shot or off the grid."""
+    board.fire(1, 1)
+    with pytest.raises(ValueError):
+        board.fire(1, 1)
+    with pytest.raises(ValueError):
+        board.fire(4, 0)
+
+
+def test_fire_follows_topology() -> None:
+    """Test firing is bounded by the grid's height and its blocked squares."""
+    topology = Topology.from_rows(["..", "#.", "..", ".."], "#")
+    b = game.Board(grid=grid.Grid(topology=topology), sizes={"Patrol Boat": 2})
+    b.fleet.place("Patrol Boat", 1, 2, Direction.DOWN)
+    assert b.fire(1, 3) == game.Shot(SqState.HIT)
+    with pytest.raises(ValueError, match="off the grid"):
+        b.fire(0, 4)
+    with pytest.raises(ValueError, match="blocked"):
+        b.fire(0, 1)
+
+
+def test_fire_area_sinks_and_skips_shot_squares(board: game.Board) -> None:
+    """Test an area weapon fires once on each unshot square it covers."""
+    board.fire(1, 0)
+    shots = board.fire_area(weapons.cross(1), 1, 1)
+    outcomes = {(sq.x, sq.y): shot for sq, shot in shots}
+    assert (1, 0) not in outcomes
+    assert outcomes[(0, 1)] == game.Shot(SqState.MISS)
+    assert outcomes[(2, 1)] == game.Shot(SqState.SUNK, "Patrol Boat")
+    assert board.defeated()
+
+
+def test_fire_area_off_grid(board: game.Board) -> None:
+    """Test aiming an area weapon off the grid fires nothing."""
+    with pytest.raises(ValueError):
+        board.fire_area(weapons.cross(1), -1, 0)
+    with pytest.raises(ValueError):
+        board.fire_area(weapons.cross(1), 4, 0)
+    assert board.grid.bits.count(SqState.MISS) == 0
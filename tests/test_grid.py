@@ -1,8 +1,13 @@
 """Test cases for grid module."""
+from typing import Any
+from typing import List
+from typing import Tuple
+
 import pytest
 
 import fightgrid.config as cfg
 from fightgrid import grid
+from fightgrid.topology import Topology
 
 
 @pytest.fixture
@@ -185,3 +190,186 @@ x x x x x x x x x
 x x x x x x x x x
 x x x x x x x x x"""
     assert expected == default_grid.grid_string_labels(prv=True)
+
+
+def test_projected_diagonal_distance(default_grid: grid.Grid) -> None:
+    """Test diagonal projections honor distance in every direction."""
+    dg = default_grid
+    start = dg.get_square_xy(4, 4)
+    expected = {
+        grid.Direction.UP_LEFT: (2, 2),
+        grid.Direction.UP_RIGHT: (6, 2),
+        grid.Direction.DOWN_LEFT: (2, 6),
+        grid.Direction.DOWN_RIGHT: (6, 6),
+    }
+    for direction, coords in expected.items():
+        assert dg.projected_from(start, direction, 2) is dg.get_square_xy(*coords)
+
+
+def test_projected_from_off_grid_returns_none(default_grid: grid.Grid) -> None:
+    """Test projecting from a Square outside the grid gives None."""
+    off = grid.Square(-1, 0)
+    assert default_grid.projected_from(off, grid.Direction.RIGHT) is None
+    assert default_grid.surrounding_squares(off) == []
+
+
+def test_neighbor_table_bounds() -> None:
+    """Test table marks projections leaving the grid with None."""
+    table = grid.neighbor_table(3, grid.Direction.RIGHT, 1)
+    assert table == (1, 2, None, 4, 5, None, 7, 8, None)
+    assert grid.neighbor_table(3, grid.Direction.RIGHT, 1) is table
+
+
+def test_surrounding_squares_corner(default_grid: grid.Grid) -> None:
+    """Test corner Square has only in-bounds neighbors."""
+    dg = default_grid
+    squares = dg.reticle_squares(dg.get_square_xy(0, 0))
+    assert squares == [grid.Square(1, 0), grid.Square(0, 1), grid.Square(1, 1)]
+
+
+def test_square_valid_uses_grid_size() -> None:
+    """Test validity follows the grid's own size, not the configured one."""
+    small = grid.Grid(4)
+    large = grid.Grid(cfg.GRID_SIZE + 3)
+    edge = grid.Square(cfg.GRID_SIZE + 1, 0)
+    assert not small.square_valid(grid.Square(4, 0))
+    assert large.square_valid(edge)
+
+
+def test_rectangular_grid() -> None:
+    """Test a grid wider than it is tall."""
+    g = grid.Grid(topology=Topology(5, 2))
+    assert g.side_length == 5
+    assert g.height == 2
+    assert g.grid_string_labels().count("\n") == 1
+    corner = g.get_square_xy(4, 1)
+    assert g.square_valid(corner)
+    assert g.projected_from(corner, grid.Direction.DOWN) is None
+    assert g.projected_from(corner, grid.Direction.LEFT) is g.get_square_xy(3, 1)
+    corner.state = grid.SqState.HIT
+    assert g.bits.members(grid.SqState.HIT) == {9}
+
+
+def test_blocked_squares_are_skipped() -> None:
+    """Test blocked squares are invalid and never neighbors."""
+    g = grid.Grid(topology=Topology.from_rows(["...", ".#.", "..."]))
+    center = g.get_square_xy(1, 1)
+    assert not g.square_valid(center)
+    assert g.projected_from(g.get_square_xy(0, 1), grid.Direction.RIGHT) is None
+    assert center not in g.reticle_squares(g.get_square_xy(0, 0))
+
+
+def test_squares_share_interned_coords() -> None:
+    """Test grids of one size share Coords and squares have no __dict__."""
+    a, b = grid.Grid(4), grid.Grid(4)
+    sq = a.get_square_xy(2, 3)
+    assert sq.coord == grid.Coord(2, 3)
+    assert sq.coord is b.get_square_xy(2, 3).coord
+    assert not hasattr(sq, "__dict__")
+    with pytest.raises(AttributeError):
+        sq.coord.x = 1  # type: ignore[misc]
+
+
+def test_new_grids_build_rows_when_read() -> None:
+    """Test a new grid builds each row once, on first read, not on render."""
+    a = grid.Grid(4, def_pub_label="w")
+    assert a.grid_string_labels() == "\n".join(["w w w w"] * 4)
+    assert a.label_at(6) == "w" and a.label_at(6, prv=True) is None
+    assert a.row_labels(1) == ["w"] * 4 and a.row_labels(1, prv=True) == [None] * 4
+    assert a._grid == [None] * 4
+    sq = a.get_square_index(6)
+    assert a._grid[0] is None and a._grid[1] is not None
+    assert a.get_square_xy(2, 1) is sq and sq._grid is a
+    sq.pub_label = "X"
+    assert a.label_at(6) == "X" and a.row_labels(1) == ["w", "w", "X", "w"]
+    assert a.row_labels(1, prv=True) == [None] * 4
+    assert a.get_square_xy(-1, -1).coord == grid.Coord(3, 3)
+    assert grid.Grid(4, def_pub_label="v").get_square_xy(2, 1).pub_label == "v"
+
+
+def test_squares_hash_by_location() -> None:
+    """Test Squares can be set members, equal by location."""
+    g = grid.Grid(4)
+    seen = set(g.surrounding_squares(g.get_square_xy(1, 1)))
+    assert grid.Square(1, 0) in seen
+    assert g.get_square_xy(2, 1) in seen
+    assert len(seen | set(g.surrounding_squares(g.get_square_xy(1, 0)))) == 7
+
+
+def test_fork_shares_rows_until_changed() -> None:
+    """Test a fork copies a row only when one of its squares changes."""
+    g = grid.Grid(4, def_pub_label="w")
+    g.get_square_xy(1, 1).state = grid.SqState.HIT
+    child = g.fork()
+    assert all(a is b for a, b in zip(child._grid, g._grid))
+    sq = child.get_square_xy(1, 1)
+    assert sq.state is grid.SqState.HIT
+    assert sq is not g.get_square_xy(1, 1)
+    assert child._grid[1] is g._grid[1]
+    sq.pub_label = "o"
+    assert child._grid[1] is not g._grid[1]
+    assert child._grid[0] is g._grid[0]
+    assert g.get_square_xy(1, 1).pub_label == "w"
+    assert child.get_square_xy(1, 1) is sq
+    assert child.bits.mask(grid.SqState.HIT) == g.bits.mask(grid.SqState.HIT)
+
+
+def test_fork_keeps_changes_of_earlier_reads() -> None:
+    """Test a change through a Square read before its row was copied lands."""
+    g = grid.Grid(3, def_pub_label="w")
+    g.get_square_xy(0, 0)
+    child = g.fork()
+    first, second = child.get_square_xy(1, 0), child.get_square_xy(1, 0)
+    assert first is not second
+    seen: List[Tuple[str, Any, Any]] = []
+    child.add_listener(lambda sq, field, old, new: seen.append((field, old, new)))
+    first.state = grid.SqState.HIT
+    second.pub_label = "o"
+    kept = child.get_square_xy(1, 0)
+    assert kept is first and kept.pub_label == "o"
+    assert kept.state is grid.SqState.HIT
+    assert seen == [
+        ("state", grid.SqState.EMPTY, grid.SqState.HIT),
+        ("pub_label", "w", "o"),
+    ]
+
+
+def test_fork_and_parent_diverge() -> None:
+    """Test changes to either side of a fork are not seen by the other."""
+    g = grid.Grid(4, def_pub_label="w")
+    g.get_square_xy(0, 0)
+    child = g.fork()
+    sibling = g.fork()
+    g.get_square_xy(2, 0).state = grid.SqState.MISS
+    g.get_square_xy(3, 0).pub_label = "o"
+    child.get_square_index(5).state = grid.SqState.HIT
+    assert child.get_square_xy(2, 0).state is grid.SqState.EMPTY
+    assert child.get_square_xy(3, 0).pub_label == "w"
+    assert g.get_square_index(5).state is grid.SqState.EMPTY
+    assert child.bits.count(grid.SqState.MISS) == 0
+    assert g.bits.count(grid.SqState.HIT) == 0
+    assert child.grid_string_labels().splitlines()[0] == "w w w w"
+    assert g.grid_string_labels().splitlines()[0] == "w w w o"
+    assert sibling.get_square_xy(2, 0).state is grid.SqState.EMPTY
+    assert sibling.grid_string_labels().splitlines()[0] == "w w w w"
+
+
+def test_fork_of_fork_keeps_its_rows() -> None:
+    """Test a grandchild sharing the root's rows sees no later root change."""
+    g = grid.Grid(3)
+    grandchild = g.fork().fork()
+    g.get_square_xy(0, 2).state = grid.SqState.HIT
+    assert grandchild.get_square_xy(0, 2).state is grid.SqState.EMPTY
+    grandchild.get_square_xy(1, 2).state = grid.SqState.MISS
+    assert g.get_square_xy(1, 2).state is grid.SqState.EMPTY
+    assert g.get_square_xy(0, 2).state is grid.SqState.HIT
+
+
+def test_fork_has_no_listeners() -> None:
+    """Test listeners of a grid are not called for changes of its fork."""
+    g = grid.Grid(3)
+    seen = []
+    g.add_listener(lambda sq, field, old, new: seen.append(field))
+    child = g.fork()
+    child.get_square_xy(0, 0).state = grid.SqState.HIT
+    assert seen == []
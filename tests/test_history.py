@@ -0,0 +1,86 @@
+"""Test cases for history module."""
+import pytest
+
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.history import Change
+from fightgrid.history import History
+
+
+def test_undo_and_redo_a_move() -> None:
+    """Test a move is taken back and made again as one."""
+    grid = Grid(3, def_pub_label="w")
+    history = History(grid)
+    with history.move():
+        grid.get_square_xy(1, 1).state = SqState.HIT
+        grid.get_square_xy(1, 1).pub_label = "X"
+    assert len(history) == 1
+    assert history.undo()
+    assert grid.get_square_xy(1, 1).state is SqState.EMPTY
+    assert grid.get_square_xy(1, 1).pub_label == "w"
+    assert grid.bits.count(SqState.HIT) == 0
+    assert not history.can_undo
+    assert history.redo()
+    assert grid.get_square_xy(1, 1).state is SqState.HIT
+    assert grid.get_square_xy(1, 1).pub_label == "X"
+    assert not history.redo()
+
+
+def test_undo_reverts_changes_in_reverse() -> None:
+    """Test a square changed twice in a move returns to its first value."""
+    grid = Grid(3)
+    history = History(grid)
+    sq = grid.get_square_xy(0, 0)
+    sq.state = SqState.HIDDEN
+    sq.state = SqState.HIT
+    assert history.undo()
+    assert sq.state is SqState.EMPTY
+    assert not history.undo()
+
+
+def test_moves_are_undone_last_first() -> None:
+    """Test moves unwind one at a time, and a new change drops redo."""
+    grid = Grid(3)
+    history = History(grid)
+    for index in range(3):
+        grid.get_square_index(index).state = SqState.MISS
+        assert history.end_move()
+    assert not history.end_move()
+    history.undo()
+    history.undo()
+    assert grid.bits.members(SqState.MISS) == {0}
+    can_redo = history.can_redo
+    grid.get_square_index(8).state = SqState.HIT
+    assert can_redo and not history.can_redo
+    assert len(history) == 2
+    assert history._pending == [Change(8, "state", SqState.EMPTY, SqState.HIT)]
+
+
+def test_limit_drops_oldest_moves() -> None:
+    """Test only the last limit moves can be undone."""
+    grid = Grid(3)
+    history = History(grid, limit=2)
+    for index in range(3):
+        with history.move():
+            grid.get_square_index(index).state = SqState.MISS
+    assert len(history) == 2
+    while history.undo():
+        pass
+    assert grid.bits.members(SqState.MISS) == {0}
+    with pytest.raises(ValueError):
+        History(grid, limit=0)
+
+
+def test_undo_on_a_fork() -> None:
+    """Test history of a fork leaves the parent alone."""
+    grid = Grid(3)
+    child = grid.fork()
+    history = History(child)
+    child.get_square_xy(2, 2).state = SqState.HIT
+    history.undo()
+    history.detach()
+    child.get_square_xy(0, 0).state = SqState.MISS
+    history.clear()
+    assert not history.can_undo
+    assert child.bits.members(SqState.MISS) == {0}
+    assert grid.bits.count(SqState.MISS, SqState.HIT) == 0
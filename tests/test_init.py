@@ -0,0 +1,30 @@
+"""Test cases for the fightgrid package."""
+import sys
+
+import pytest
+
+import fightgrid
+
+
+def test_submodules_load_on_access() -> None:
+    """Test submodules are reachable as attributes and listed by dir."""
+    assert fightgrid.topology.Topology.square(2).size == 4
+    assert "tournament" in dir(fightgrid)
+
+
+def test_unknown_attribute() -> None:
+    """Test names that are not submodules raise AttributeError."""
+    with pytest.raises(AttributeError):
+        fightgrid.nothing_here
+    with pytest.raises(AttributeError):
+        fightgrid._private
+
+
+def test_missing_dependency_of_submodule(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a submodule failing to import a dependency is not hidden."""
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.delitem(sys.modules, "fightgrid.batch", raising=False)
+    monkeypatch.delitem(vars(fightgrid), "batch", raising=False)
+    with pytest.raises(ModuleNotFoundError) as info:
+        fightgrid.batch
+    assert info.value.name == "numpy"
@@ -0,0 +1,21 @@
+"""Test cases for loadgen module."""
+import asyncio
+
+from fightgrid import loadgen
+from fightgrid import server
+
+
+def test_run_local_reports_moves() -> None:
+    """Test a short local run answers moves and records their latency."""
+    report = asyncio.run(loadgen.run_local(connections=2, seconds=0.3))
+    assert report.moves > 0
+    assert report.latency.total == report.moves
+    assert report.moves_per_second() > 0
+    assert "moves/s" in report.format()
+
+
+def test_run_local_retries_when_full() -> None:
+    """Test clients turned away by a full server retry until the deadline."""
+    full = server.MatchServer(seed=0, max_matches=1)
+    report = asyncio.run(loadgen.run_local(connections=3, seconds=0.3, server=full))
+    assert report.moves > 0
@@ -1,7 +1,15 @@
 """Test cases for the __main__ module."""
+import asyncio
+import subprocess  # noqa: S404
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator
+
 import pytest
 from click.testing import CliRunner
 
+import fightgrid.config as cfg
 from fightgrid import __main__
 
 
@@ -15,3 +23,176 @@ def test_main_succeeds(runner: CliRunner) -> None:
     """It exits with a status code of zero."""
     result = runner.invoke(__main__.main)
     assert result.exit_code == 0
+
+
+def test_simulate_reports_results(runner: CliRunner) -> None:
+    """It plays matches and prints throughput and win rates."""
+    result = runner.invoke(
+        __main__.main, ["simulate", "-n", "2", "-w", "1", "-a", "random"]
+    )
+    assert result.exit_code == 0
+    assert "games: 2" in result.output
+    assert "random:" in result.output
+
+
+def test_simulate_rejects_unknown_strategy(runner: CliRunner) -> None:
+    """It fails with a usage error for unknown strategies."""
+    result = runner.invoke(__main__.main, ["simulate", "-a", "nope"])
+    assert result.exit_code == 2
+
+
+def test_loadgen_local_reports_throughput(runner: CliRunner) -> None:
+    """It runs load against a server in the same process."""
+    result = runner.invoke(
+        __main__.main, ["loadgen", "--local", "-c", "2", "-s", "0.2"]
+    )
+    assert result.exit_code == 0
+    assert "moves/s" in result.output
+
+
+def test_serve_hosts_matches(
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It serves matches of the given size until serving stops."""
+    from fightgrid import server
+
+    served = []
+
+    async def serve_forever(
+        match_server: server.MatchServer, host: str, port: int
+    ) -> None:
+        served.append((match_server.side_length, host, port))
+
+    monkeypatch.setattr(server, "serve_forever", serve_forever)
+    result = runner.invoke(__main__.main, ["serve", "--port", "0", "--size", "6"])
+    assert result.exit_code == 0
+    assert served == [(6, "127.0.0.1", 0)]
+    assert "Serving FightGrid matches on 127.0.0.1:0" in result.output
+
+
+def test_loadgen_against_running_server(runner: CliRunner) -> None:
+    """It runs load against a server listening elsewhere."""
+    from fightgrid.server import MatchServer
+
+    loop = asyncio.new_event_loop()
+    listening = loop.run_until_complete(MatchServer(seed=1).start("127.0.0.1", 0))
+    port = listening.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        result = runner.invoke(
+            __main__.main, ["loadgen", "--port", str(port), "-c", "2", "-s", "0.2"]
+        )
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        listening.close()
+        loop.run_until_complete(listening.wait_closed())
+        loop.close()
+    assert result.exit_code == 0
+    assert "moves/s" in result.output
+
+
+@pytest.mark.parametrize(
+    "output,expected",
+    [("text", "wall time"), ("json", '"methods"'), ("prometheus", "# TYPE")],
+)
+def test_profile_prints_hotspots(runner: CliRunner, output: str, expected: str) -> None:
+    """It profiles a short workload in each output format."""
+    result = runner.invoke(__main__.main, ["profile", "-n", "1", "--format", output])
+    assert result.exit_code == 0
+    assert expected in result.output
+
+
+def test_tournament_rates_strategies(runner: CliRunner) -> None:
+    """It plays a round robin and prints Elo standings."""
+    result = runner.invoke(
+        __main__.main,
+        ["tournament", "-s", "random", "-s", "hunt", "-n", "2", "-w", "1"],
+    )
+    assert result.exit_code == 0
+    assert "hunt" in result.output
+    assert "elo" in result.output
+
+
+def test_tournament_rejects_single_strategy(runner: CliRunner) -> None:
+    """It fails with a usage error for fewer than two strategies."""
+    result = runner.invoke(__main__.main, ["tournament", "-s", "hunt"])
+    assert result.exit_code == 2
+
+
+def test_tournament_rejects_bad_deals_and_size(runner: CliRunner) -> None:
+    """It refuses no deals and boards too small for the fleet up front."""
+    result = runner.invoke(__main__.main, ["tournament", "-n", "0", "-w", "2"])
+    assert result.exit_code == 2
+    assert "--deals" in result.output
+    result = runner.invoke(__main__.main, ["tournament", "--size", "3"])
+    assert result.exit_code == 2
+    assert "cannot hold an entity" in result.output
+
+
+def test_export_writes_shards(runner: CliRunner, tmp_path: Path) -> None:
+    """It plays matches and streams their moves to npz shards."""
+    pytest.importorskip("numpy")
+    path = tmp_path / "export"
+    result = runner.invoke(
+        __main__.main, ["export", str(path), "-n", "2", "-a", "random", "--chunk", "50"]
+    )
+    assert result.exit_code == 0
+    assert "games: 2" in result.output
+    assert (path / "shard-00000.npz").exists()
+
+
+def test_startup_imports_no_engine() -> None:
+    """Importing the CLI leaves the engine and heavy modules unimported."""
+    code = "import sys, fightgrid.__main__; print(' '.join(sys.modules))"
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout.split()
+    for module in (
+        "fightgrid.grid",
+        "fightgrid.server",
+        "fightgrid.simulate",
+        "numpy",
+        "asyncio",
+        "concurrent.futures",
+    ):
+        assert module not in output
+
+
+@pytest.fixture
+def restore_config(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Put back settings and environment a test changes."""
+    # Setting the variable first makes monkeypatch restore its absence.
+    monkeypatch.setenv(cfg.CONFIG_ENV, "")
+    monkeypatch.delenv(cfg.CONFIG_ENV)
+    grid_size, entity_sizes = cfg.GRID_SIZE, dict(cfg.ENTITY_SIZES)
+    yield
+    cfg.GRID_SIZE = grid_size
+    cfg.ENTITY_SIZES.clear()
+    cfg.ENTITY_SIZES.update(entity_sizes)
+
+
+def test_config_option_loads_settings(
+    runner: CliRunner, tmp_path: Path, restore_config: None
+) -> None:
+    """It loads settings before running a command."""
+    path = tmp_path / "fightgrid.toml"
+    path.write_text('grid_size = 6\n[entity_sizes]\n"Patrol Boat" = 2\n')
+    result = runner.invoke(
+        __main__.main,
+        ["--config", str(path), "simulate", "-n", "1", "-w", "1", "-a", "random"],
+    )
+    assert result.exit_code == 0
+    assert cfg.GRID_SIZE == 6
+    assert "moves" in result.output
+
+
+def test_config_option_rejects_bad_file(
+    runner: CliRunner, tmp_path: Path, restore_config: None
+) -> None:
+    """It fails with a usage error for invalid settings."""
+    path = tmp_path / "fightgrid.toml"
+    path.write_text("grid_size = -1\n")
+    result = runner.invoke(__main__.main, ["--config", str(path)])
+    assert result.exit_code == 2
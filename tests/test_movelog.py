@@ -0,0 +1,121 @@
+"""Test cases for movelog module."""
+import io
+import random
+from typing import List
+from typing import Tuple
+
+import pytest
+
+from fightgrid import game
+from fightgrid import grid
+from fightgrid import movelog
+from fightgrid import snapshot
+from fightgrid.grid import Direction
+from fightgrid.grid import SqState
+from fightgrid.topology import Topology
+
+
+Recorded = Tuple[io.BytesIO, List[bytes]]
+
+
+@pytest.fixture
+def recorded() -> Recorded:
+    """Pytest fixture with a logged match and a snapshot after each move."""
+    board = game.Board(grid=grid.Grid(side_length=6), sizes={"Submarine": 3})
+    log = io.BytesIO()
+    snapshots = [snapshot.dumps(board.grid)]
+    with movelog.MoveLogWriter(board.grid, log, keyframe_interval=4) as writer:
+        writer.record_placement(board.fleet.place("Submarine", 1, 1, Direction.DOWN))
+        rng = random.Random(0)  # noqa: S311
+        targets = [(x, y) for x in range(6) for y in range(6)]
+        rng.shuffle(targets)
+        while not board.defeated():
+            board.fire(*targets.pop())
+            writer.end_move()
+            snapshots.append(snapshot.dumps(board.grid))
+    log.seek(0)
+    return log, snapshots
+
+
+def test_events_round_trip() -> None:
+    """Test every event kind encodes and decodes unchanged."""
+    events: List[movelog.Event] = [
+        movelog.StateChange(3, SqState.EMPTY, SqState.HIT),
+        movelog.LabelChange(4, "prv_label", None, "ß"),
+        movelog.LabelChange(4, "highlight", "a", None),
+        movelog.EntityPlaced("Patrol Boat", 1, 2, Direction.LEFT, 2),
+        movelog.MoveEnd(7),
+        movelog.Keyframe(8, b"data"),
+    ]
+    for event in events:
+        assert movelog.decode(*movelog.encode(event)) == event
+    with pytest.raises(ValueError):
+        movelog.decode(99, b"")
+
+
+def test_replay_every_move(recorded: Recorded) -> None:
+    """Test replay to any move matches the board at that move."""
+    log, snapshots = recorded
+    reader = movelog.MoveLogReader(log)
+    assert (reader.side_length, reader.height) == (6, 6)
+    assert reader.moves() == len(snapshots) - 1
+    assert 4 in reader.keyframes()
+    for move, expected in enumerate(snapshots):
+        assert snapshot.dumps(reader.replay(move)) == expected
+    assert snapshot.dumps(reader.replay()) == snapshots[-1]
+    with pytest.raises(ValueError):
+        reader.replay(len(snapshots))
+    with pytest.raises(ValueError):
+        reader.replay(-1)
+
+
+def test_log_records_placement(recorded: Recorded) -> None:
+    """Test the placement and its square changes are logged."""
+    log, _ = recorded
+    events = list(movelog.MoveLogReader(log).events())
+    assert isinstance(events[0], movelog.Keyframe)
+    placed = [e for e in events if isinstance(e, movelog.EntityPlaced)]
+    assert placed == [movelog.EntityPlaced("Submarine", 1, 1, Direction.DOWN, 3)]
+    labels = [e for e in events if isinstance(e, movelog.LabelChange)]
+    assert movelog.LabelChange(7, "prv_label", None, "S") in labels
+
+
+def test_truncated_log_stops_cleanly(
+    recorded: Recorded,
+) -> None:
+    """Test a partly written record at the end is ignored."""
+    log, _ = recorded
+    data = log.getvalue()
+    events = list(movelog.MoveLogReader(io.BytesIO(data[:-2])).events())
+    assert len(events) == len(list(movelog.MoveLogReader(log).events())) - 1
+
+
+def test_rejects_bad_headers() -> None:
+    """Test ValueError for files that are not move logs."""
+    with pytest.raises(ValueError):
+        movelog.MoveLogReader(io.BytesIO(b"FG"))
+    with pytest.raises(ValueError):
+        movelog.MoveLogReader(
+            io.BytesIO(b"XXXX\x02\x00\x06\x00\x00\x00\x06\x00\x00\x00")
+        )
+    with pytest.raises(ValueError):
+        movelog.MoveLogReader(
+            io.BytesIO(b"FGML\x09\x00\x06\x00\x00\x00\x06\x00\x00\x00")
+        )
+
+
+def test_replay_keeps_topology() -> None:
+    """Test a log of a wrapping grid with blocks replays on that grid."""
+    topology = Topology.from_rows(["....", ".#..", "....", "...#", "...."], wrap=True)
+    board = game.Board(grid=grid.Grid(topology=topology), sizes={"Patrol Boat": 2})
+    log = io.BytesIO()
+    with movelog.MoveLogWriter(board.grid, log) as writer:
+        writer.record_placement(board.fleet.place("Patrol Boat", 3, 4, Direction.DOWN))
+        board.fire(3, 0)
+        writer.end_move()
+    log.seek(0)
+    reader = movelog.MoveLogReader(log)
+    assert (reader.side_length, reader.height) == (4, 5)
+    replayed = reader.replay()
+    assert replayed.topology == topology
+    assert snapshot.dumps(replayed) == snapshot.dumps(board.grid)
@@ -0,0 +1,156 @@
+"""Test cases for movement module."""
+from typing import Tuple
+
+import pytest
+
+from fightgrid import movement
+from fightgrid.game import Board
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.movement import Move
+from fightgrid.placement import Fleet
+from fightgrid.placement import make_span
+from fightgrid.topology import Topology
+
+
+SIZES = {"Battleship": 4, "Patrol Boat": 2, "Submarine": 3}
+
+
+def fleet_at(**bows: Tuple[int, int, Direction]) -> Fleet:
+    """Return Fleet on a 9x9 grid with entities at (x, y, direction)."""
+    fleet = Fleet(Grid(9), SIZES)
+    names = {"battleship": "Battleship", "patrol": "Patrol Boat", "sub": "Submarine"}
+    for key, (x, y, direction) in bows.items():
+        fleet.place(names[key], x, y, direction)
+    return fleet
+
+
+def test_flipped_mirrors_across_diagonal() -> None:
+    """Test FLIP swaps rows and columns of each direction."""
+    assert movement.FLIPPED[Direction.RIGHT] is Direction.DOWN
+    assert movement.FLIPPED[Direction.UP] is Direction.LEFT
+    assert movement.FLIPPED[Direction.UP_RIGHT] is Direction.DOWN_LEFT
+
+
+def test_plan_shift_sweeps_each_step() -> None:
+    """Test a shift sweeps every intermediate span and ends on the last."""
+    span = make_span(9, 0, 0, Direction.RIGHT, 2)
+    assert span is not None
+    path = movement.plan(9, span, Direction.DOWN, 2)
+    assert path is not None
+    assert path.span.indices == (18, 19)
+    assert path.swept == (1 << 9 | 1 << 10 | 1 << 18 | 1 << 19)
+    assert movement.plan(9, span, Direction.UP) is None
+    assert movement.plan(9, span, Direction.DOWN, -1) is None
+    assert movement.plan(9, span, Direction.NONE) == (span, span.mask)
+
+
+def test_plan_flip_sweeps_triangle() -> None:
+    """Test a flip sweeps the squares between the two arms."""
+    span = make_span(9, 0, 0, Direction.RIGHT, 3)
+    assert span is not None
+    path = movement.plan(9, span, Direction.FLIP)
+    assert path is not None
+    assert path.span.direction is Direction.DOWN
+    assert path.span.indices == (0, 9, 18)
+    assert sorted(i for i in range(81) if path.swept >> i & 1) == [0, 1, 2, 9, 10, 18]
+    edge = make_span(9, 0, 7, Direction.RIGHT, 3)
+    assert edge is not None and movement.plan(9, edge, Direction.FLIP) is None
+
+
+def test_plan_follows_topology() -> None:
+    """Test moves wrap on a torus and fail across a blocked square."""
+    torus = Topology(5, 3, wrap=True)
+    span = make_span(0, 4, 0, Direction.RIGHT, 2, torus)
+    assert span is not None
+    path = movement.plan(0, span, Direction.UP, 1, torus)
+    assert path is not None and path.span.indices == (14, 10)
+    holed = Topology.from_rows(["...", ".#.", "..."])
+    span = make_span(0, 0, 0, Direction.RIGHT, 3, holed)
+    assert span is not None
+    assert movement.plan(0, span, Direction.DOWN, 1, holed) is None
+    assert movement.plan(0, span, Direction.DOWN, 2, holed) is None
+    column = make_span(0, 0, 0, Direction.DOWN, 2, holed)
+    assert column is not None
+    assert movement.plan(0, column, Direction.RIGHT, 1, holed) is None
+    assert movement.plan(0, span, Direction.FLIP, 1, holed) is None
+
+
+def test_resolve_on_rectangular_grid() -> None:
+    """Test entities move within a grid wider than it is tall."""
+    fleet = Fleet(Grid(topology=Topology(10, 5)), {"a": 3})
+    fleet.place("a", 9, 4, Direction.UP)
+    result = movement.resolve(fleet, [Move("a", Direction.DOWN)])
+    assert result.failed == (Move("a", Direction.DOWN),)
+    result = movement.resolve(fleet, [Move("a", Direction.LEFT, 2)])
+    assert result.moved["a"].indices == (47, 37, 27)
+    assert fleet.grid.get_square_xy(7, 4).state is SqState.HIDDEN
+
+
+def test_resolve_moves_in_one_pass() -> None:
+    """Test entities may follow one another into vacated squares."""
+    fleet = fleet_at(patrol=(0, 0, Direction.RIGHT), sub=(2, 0, Direction.RIGHT))
+    result = movement.resolve(
+        fleet,
+        [Move("Patrol Boat", Direction.RIGHT), Move("Submarine", Direction.RIGHT)],
+    )
+    assert result.failed == ()
+    assert fleet.occupancy.placements["Patrol Boat"].span.indices == (1, 2)
+    assert fleet.occupancy.placements["Submarine"].span.indices == (3, 4, 5)
+    assert fleet.grid.bits.members(SqState.HIDDEN) == {1, 2, 3, 4, 5}
+    assert fleet.grid.get_square_index(0).state is SqState.EMPTY
+
+
+def test_resolve_fails_head_on_and_blocked_chains() -> None:
+    """Test crossing paths fail together and block moves behind them."""
+    fleet = fleet_at(
+        patrol=(0, 0, Direction.RIGHT),
+        sub=(3, 0, Direction.RIGHT),
+        battleship=(0, 2, Direction.RIGHT),
+    )
+    moves = [
+        Move("Patrol Boat", Direction.RIGHT),
+        Move("Submarine", Direction.LEFT),
+        Move("Battleship", Direction.UP, 2),
+    ]
+    result = movement.resolve(fleet, moves)
+    assert result.moved == {}
+    assert set(result.failed) == set(moves)
+    assert fleet.occupancy.placements["Battleship"].span.indices == (18, 19, 20, 21)
+
+
+def test_resolve_carries_hits_and_keeps_sunk() -> None:
+    """Test damage moves with an entity and sunk entities stay put."""
+    board = Board(grid=Grid(9), sizes=SIZES)
+    board.fleet.place("Submarine", 0, 0, Direction.RIGHT)
+    board.fleet.place("Patrol Boat", 0, 4, Direction.RIGHT)
+    board.fire(1, 0)
+    board.fire(0, 4)
+    board.fire(1, 4)
+    result = movement.resolve(
+        board.fleet,
+        [Move("Submarine", Direction.FLIP), Move("Patrol Boat", Direction.DOWN)],
+    )
+    assert list(result.moved) == ["Submarine"]
+    assert result.failed == (Move("Patrol Boat", Direction.DOWN),)
+    assert board.grid.get_square_xy(0, 1).state is SqState.HIT
+    assert board.grid.get_square_xy(1, 0).state is SqState.EMPTY
+    assert board.fire(0, 2).state is SqState.HIT
+    assert board.fire(0, 0).sunk == "Submarine"
+
+
+def test_resolve_dry_run_and_errors() -> None:
+    """Test apply=False changes nothing and bad moves raise."""
+    fleet = fleet_at(patrol=(0, 0, Direction.RIGHT))
+    result = movement.resolve(fleet, [Move("Patrol Boat", Direction.DOWN)], False)
+    assert result.moved["Patrol Boat"].indices == (9, 10)
+    assert fleet.occupancy.placements["Patrol Boat"].span.indices == (0, 1)
+    assert movement.resolve(fleet, [Move("Patrol Boat", Direction.NONE)]) == ({}, ())
+    with pytest.raises(ValueError):
+        movement.resolve(fleet, [Move("Submarine", Direction.DOWN)])
+    with pytest.raises(ValueError):
+        movement.resolve(
+            fleet,
+            [Move("Patrol Boat", Direction.DOWN), Move("Patrol Boat", Direction.FLIP)],
+        )
@@ -0,0 +1,170 @@
+"""Test cases for placement module."""
+import random
+
+import pytest
+
+import fightgrid.config as cfg
+from fightgrid import grid
+from fightgrid import placement
+from fightgrid.grid import Direction
+from fightgrid.grid import SqState
+from fightgrid.topology import Topology
+
+
+@pytest.fixture
+def fleet() -> placement.Fleet:
+    """Pytest fixture with unplaced default fleet on default grid."""
+    return placement.Fleet(grid.Grid(side_length=cfg.GRID_SIZE))
+
+
+def test_make_span() -> None:
+    """Test span covers squares along direction and rejects leaving grid."""
+    span = placement.make_span(4, 1, 0, Direction.DOWN, 3)
+    assert span is not None
+    assert span.indices == (1, 5, 9)
+    assert span.mask == (1 << 1) | (1 << 5) | (1 << 9)
+    assert placement.make_span(4, 2, 0, Direction.RIGHT, 3) is None
+    assert placement.make_span(4, -1, 0, Direction.RIGHT, 1) is None
+    assert placement.make_span(4, 0, 0, Direction.FLIP, 1) is None
+
+
+def test_legal_spans_counts() -> None:
+    """Test every orientation is counted once and results are cached."""
+    assert len(placement.legal_spans(4, 3)) == 2 * 4 * 2
+    assert len(placement.legal_spans(4, 1)) == 16
+    assert placement.legal_spans(4, 3) is placement.legal_spans(4, 3)
+
+
+def test_spans_follow_topology() -> None:
+    """Test spans use the width, height, wrap and blocks of a topology."""
+    wide = Topology(10, 5)
+    span = placement.make_span(0, 9, 4, Direction.UP, 5, wide)
+    assert span is not None and span.indices == (49, 39, 29, 19, 9)
+    assert placement.make_span(0, 9, 0, Direction.DOWN, 6, wide) is None
+    assert placement.make_span(0, 0, 5, Direction.RIGHT, 1, wide) is None
+    assert len(placement.legal_spans(0, 5, wide)) == 6 * 5 + 10 * 1
+    torus = Topology(4, 3, wrap=True)
+    span = placement.make_span(0, 3, 0, Direction.RIGHT, 3, torus)
+    assert span is not None and span.indices == (3, 0, 1)
+    assert placement.make_span(0, 0, 0, Direction.DOWN, 4, torus) is None
+    assert len(placement.legal_spans(0, 3, torus)) == 2 * 12
+    holed = Topology.from_rows(["..#", "...", "..."])
+    assert placement.make_span(0, 2, 0, Direction.DOWN, 1, holed) is None
+    assert placement.make_span(0, 0, 0, Direction.RIGHT, 3, holed) is None
+    assert len(placement.legal_spans(0, 3, holed)) == 4
+    layouts = list(placement.fleet_layouts(0, (3, 3), topology=holed))
+    assert len(layouts) == 4
+
+
+def test_fleet_layouts_do_not_overlap() -> None:
+    """Test layouts on a tiny grid are all non-overlapping."""
+    layouts = list(placement.fleet_layouts(2, (2, 2)))
+    # Two rows or two columns, in either order.
+    assert len(layouts) == 4
+    for first, second in layouts:
+        assert not first.mask & second.mask
+
+
+def test_place_marks_grid(fleet: placement.Fleet) -> None:
+    """Test placing sets state and private label of covered squares."""
+    placed = fleet.place("Submarine", 2, 3, Direction.LEFT)
+    assert placed.span.indices == (29, 28, 27)
+    sq = fleet.grid.get_square_xy(0, 3)
+    assert sq.state is SqState.HIDDEN
+    assert sq.prv_label == "S"
+    assert fleet.entity_at(sq) == placed
+    assert fleet.entity_at(grid.Square(3, 3)) is None
+    assert fleet.grid.bits.count(SqState.HIDDEN) == 3
+
+
+def test_place_rejects_bad_positions(fleet: placement.Fleet) -> None:
+    """Test ValueError for off-grid, colliding or repeated placement."""
+    with pytest.raises(ValueError):
+        fleet.place("Battleship", 7, 0, Direction.RIGHT)
+    fleet.place("Battleship", 0, 0, Direction.RIGHT)
+    assert not fleet.can_place("Submarine", 2, 0, Direction.DOWN)
+    assert fleet.can_place("Submarine", 4, 0, Direction.DOWN)
+    with pytest.raises(ValueError):
+        fleet.place("Submarine", 2, 0, Direction.DOWN)
+    assert not fleet.can_place("Battleship", 0, 5, Direction.RIGHT)
+    with pytest.raises(ValueError):
+        fleet.place("Battleship", 0, 5, Direction.RIGHT)
+
+
+def test_remove_restores_grid(fleet: placement.Fleet) -> None:
+    """Test removing entity empties its squares and frees them."""
+    fleet.grid.get_square_xy(0, 0).prv_label = "x"
+    fleet.place("Patrol Boat", 0, 0, Direction.DOWN)
+    fleet.remove("Patrol Boat")
+    sq = fleet.grid.get_square_xy(0, 0)
+    assert sq.state is SqState.EMPTY
+    assert sq.prv_label == "x"
+    assert fleet.can_place("Patrol Boat", 0, 0, Direction.DOWN)
+
+
+def test_place_random(fleet: placement.Fleet) -> None:
+    """Test random placement places whole fleet without overlap."""
+    placed = fleet.place_random(random.Random(5))  # noqa: S311
+    assert {p.name for p in placed} == set(cfg.ENTITY_SIZES)
+    assert fleet.grid.bits.count(SqState.HIDDEN) == sum(cfg.ENTITY_SIZES.values())
+
+
+def test_place_random_crowded() -> None:
+    """Test random placement finds the last free spot, or raises."""
+    fleet = placement.Fleet(grid.Grid(side_length=2), {"A": 2, "B": 2})
+    fleet.place("A", 0, 0, Direction.RIGHT)
+    (placed,) = fleet.place_random(random.Random(0))  # noqa: S311
+    assert placed.span.indices == (2, 3)
+    full = placement.Fleet(grid.Grid(side_length=2), {"A": 2, "B": 2, "C": 1})
+    with pytest.raises(ValueError):
+        full.place_random(random.Random(0))  # noqa: S311
+
+
+class FirstChoice(random.Random):
+    """Random that always chooses the first item."""
+
+    def choice(self, seq):  # type: ignore[no-untyped-def]
+        """Return first item of seq."""
+        return seq[0]
+
+
+def test_place_random_falls_back_to_fitting_spans() -> None:
+    """Test random placement picks from the fitting spans after misses."""
+    fleet = placement.Fleet(grid.Grid(side_length=3), {"A": 3, "B": 3})
+    fleet.place("A", 0, 0, Direction.RIGHT)
+    (placed,) = fleet.place_random(FirstChoice())
+    assert placed.span.indices == (3, 4, 5)
+
+
+def test_relocate_checks_before_moving() -> None:
+    """Test relocation fails as a whole onto an entity staying put."""
+    fleet = placement.Fleet(grid.Grid(4), {"A": 2, "B": 2})
+    fleet.place("A", 0, 0, Direction.RIGHT)
+    fleet.place("B", 0, 1, Direction.RIGHT)
+    span = placement.make_span(4, 1, 1, Direction.RIGHT, 2)
+    assert span is not None
+    with pytest.raises(ValueError):
+        fleet.relocate({"A": span})
+    assert fleet.occupancy.placements["A"].span.indices == (0, 1)
+    swap = placement.make_span(4, 0, 0, Direction.RIGHT, 2)
+    assert swap is not None
+    other = placement.make_span(4, 2, 2, Direction.RIGHT, 2)
+    assert other is not None
+    fleet.relocate({"A": other, "B": swap})
+    assert fleet.grid.get_square_xy(0, 0).prv_label == "B"
+    assert fleet.grid.get_square_xy(2, 2).prv_label == "A"
+    assert fleet.grid.get_square_xy(0, 1).state is grid.SqState.EMPTY
+
+
+def test_fleet_on_rectangular_grid_with_blocks() -> None:
+    """Test a fleet is placed within the topology, never on a block."""
+    rows = ["#........."] + ["." * 10] * 3 + [".........#"]
+    g = grid.Grid(topology=Topology.from_rows(rows))
+    fleet = placement.Fleet(g)
+    assert not fleet.can_place("Submarine", 0, 0, Direction.DOWN)
+    assert fleet.can_place("Submarine", 9, 3, Direction.UP)
+    assert fleet.span("Patrol Boat", 8, 4, Direction.RIGHT) is None
+    fleet.place_random(random.Random(5))  # noqa: S311
+    assert len(fleet.occupancy.placements) == len(cfg.ENTITY_SIZES)
+    assert not fleet.occupancy.mask >> 50
+    assert not fleet.occupancy.mask & (1 << 0 | 1 << 49)
@@ -0,0 +1,73 @@
+"""Test cases for profiling module."""
+import json
+
+import pytest
+
+from fightgrid import profiling
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+
+
+def test_counts_calls_only_while_enabled() -> None:
+    """Test methods are wrapped while enabled and restored afterwards."""
+    original = Grid.__dict__["projected_from"]
+    grid = Grid(4)
+    profiler = profiling.Profiler(profiling.GRID_TARGETS)
+    with profiler:
+        assert Grid.__dict__["projected_from"] is not original
+        grid.projected_from(grid.get_square_xy(0, 0), Direction.RIGHT)
+    assert Grid.__dict__["projected_from"] is original
+    grid.projected_from(grid.get_square_xy(0, 0), Direction.RIGHT)
+    stats = {s.name: s for s in profiler.stats()}
+    assert stats["Grid.projected_from"].calls == 1
+    assert stats["Grid.get_square_xy"].calls == 1
+    assert stats["Grid.get_square_index"].calls == 1
+    assert stats["Grid.projected_from"].seconds > 0
+    profiler.reset()
+    assert profiler.stats() == []
+
+
+def test_sampling_times_some_calls() -> None:
+    """Test sampled timing still counts every call."""
+    grid = Grid(4)
+    with profiling.Profiler(profiling.GRID_TARGETS, sample_every=4) as profiler:
+        for _ in range(10):
+            grid.get_square_xy(1, 1)
+    (stat,) = profiler.stats()
+    assert stat.calls == 10
+    assert profiler._calls[stat.name][1] == 2
+    with pytest.raises(ValueError):
+        profiling.Profiler(sample_every=0)
+
+
+def test_only_one_profiler_enabled() -> None:
+    """Test enabling a second Profiler fails until the first is disabled."""
+    first = profiling.Profiler(profiling.GRID_TARGETS)
+    second = profiling.Profiler(profiling.GRID_TARGETS)
+    with first:
+        first.enable()
+        with pytest.raises(RuntimeError):
+            second.enable()
+    with second:
+        assert second.enabled
+        first.disable()
+        assert second.enabled
+    assert not first.enabled
+
+
+def test_exports() -> None:
+    """Test the workload is profiled and exported in every format."""
+    with profiling.Profiler() as profiler:
+        moves = profiling.workload(games=1)
+    stats = {s.name: s for s in profiler.stats()}
+    assert stats["Board.fire"].calls == moves
+    assert stats["Grid.grid_string_labels"].calls == 2 * moves
+    data = json.loads(profiler.to_json())
+    assert data["methods"]["Board.fire"]["calls"] == moves
+    prometheus = profiler.to_prometheus()
+    assert f'fightgrid_calls_total{{method="Board.fire"}} {moves}\n' in prometheus
+    assert "# TYPE fightgrid_seconds_total counter" in prometheus
+    text = profiler.format(1.0)
+    assert "Board.fire" in text
+    assert "wall time" in text
+    assert "wall time" not in profiler.format()
@@ -0,0 +1,98 @@
+"""Test cases for render module."""
+from typing import List
+from typing import Optional
+
+import pytest
+
+from fightgrid import grid
+from fightgrid import render
+
+
+@pytest.fixture
+def small_grid() -> grid.Grid:
+    """Pytest fixture with a 3x3 grid of labels."""
+    return grid.Grid(side_length=3, def_pub_label="w", def_prv_label="x")
+
+
+def test_render_matches_full_rebuild(small_grid: grid.Grid) -> None:
+    """Test cached rendering follows label changes."""
+    renderer = render.GridRenderer(small_grid)
+    assert renderer.render() == "w w w\nw w w\nw w w"
+    small_grid.get_square_xy(1, 2).pub_label = "H"
+    small_grid.get_square_xy(0, 0).pub_label = None
+    assert renderer.dirty_rows() == {0, 2}
+    assert renderer.render() == "  w w\nw w w\nw H w"
+    assert renderer.dirty_rows() == set()
+
+
+def test_render_only_dirty_rows(
+    small_grid: grid.Grid, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test clean rows are not re-rendered."""
+    renderer = render.GridRenderer(small_grid)
+    renderer.render()
+    small_grid.get_square_xy(2, 1).pub_label = "o"
+    small_grid.get_square_xy(2, 1).prv_label = "S"
+    small_grid.get_square_xy(2, 1).state = grid.SqState.MISS
+    looked_up: List[int] = []
+    real_row_labels = small_grid.row_labels
+
+    def counting_row_labels(y: int, prv: bool = False) -> List[Optional[str]]:
+        looked_up.append(y)
+        return real_row_labels(y, prv)
+
+    monkeypatch.setattr(small_grid, "row_labels", counting_row_labels)
+    assert renderer.render() == "w w w\nw w o\nw w w"
+    assert looked_up == [1]
+    assert renderer.render() == "w w w\nw w o\nw w w"
+    assert looked_up == [1]
+
+
+def test_private_renderer(small_grid: grid.Grid) -> None:
+    """Test private renderer ignores public label changes."""
+    renderer = render.GridRenderer(small_grid, prv=True)
+    small_grid.get_square_xy(0, 0).pub_label = "H"
+    assert renderer.dirty_rows() == {0, 1, 2}
+    renderer.render()
+    small_grid.get_square_xy(0, 0).pub_label = "o"
+    assert renderer.dirty_rows() == set()
+    renderer.detach()
+    small_grid.get_square_xy(0, 0).prv_label = "S"
+    assert renderer.dirty_rows() == set()
+
+
+def test_ansi_updates(small_grid: grid.Grid) -> None:
+    """Test ANSI diff moves the cursor to just the changed squares."""
+    renderer = render.GridRenderer(small_grid)
+    assert renderer.ansi_updates() == ""
+    small_grid.get_square_xy(2, 1).pub_label = "X"
+    assert renderer.ansi_updates(top=5, left=3) == "\x1b[6;7HX"
+    assert renderer.ansi_updates() == ""
+    small_grid.get_square_xy(0, 2).pub_label = "AB"
+    small_grid.get_square_xy(1, 2).pub_label = "C"
+    assert renderer.ansi_updates() == "\x1b[3;1HAB C w\x1b[K"
+
+
+def test_ansi_updates_wide_row_turning_narrow(small_grid: grid.Grid) -> None:
+    """Test a row last drawn wide is redrawn whole once narrow again."""
+    renderer = render.GridRenderer(small_grid)
+    small_grid.get_square_xy(0, 2).pub_label = "AB"
+    assert renderer.ansi_updates() == "\x1b[3;1HAB w w\x1b[K"
+    small_grid.get_square_xy(0, 2).pub_label = "A"
+    assert renderer.ansi_updates() == "\x1b[3;1HA w w\x1b[K"
+    small_grid.get_square_xy(1, 2).pub_label = "B"
+    assert renderer.ansi_updates() == "\x1b[3;3HB"
+    small_grid.get_square_xy(2, 2).pub_label = "CD"
+    renderer.render()
+    small_grid.get_square_xy(2, 2).pub_label = "C"
+    assert renderer.ansi_updates() == "\x1b[3;1HA B C\x1b[K"
+
+
+def test_grid_string_labels_uses_cache(small_grid: grid.Grid) -> None:
+    """Test grid strings stay current after label changes."""
+    assert small_grid.grid_string_labels() == "w w w\nw w w\nw w w"
+    small_grid.get_square_xy(1, 1).pub_label = "H"
+    small_grid.get_square_xy(1, 1).prv_label = "B"
+    assert small_grid.grid_string_labels() == "w w w\nw H w\nw w w"
+    assert small_grid.grid_string_labels(prv=True) == "x x x\nx B x\nx x x"
+    assert repr(small_grid) == "w w w\nw H w\nw w w"
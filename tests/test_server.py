@@ -0,0 +1,240 @@
+"""Test cases for server module."""
+import asyncio
+import json
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import List
+from typing import Tuple
+from typing import cast
+
+from fightgrid import server
+
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def with_server(test: Callable[[int], Awaitable[Any]], **kwargs: Any) -> Any:
+    """Run test against a MatchServer listening on an ephemeral port."""
+
+    async def main() -> Any:
+        match_server = server.MatchServer(seed=1, **kwargs)
+        listening = await match_server.start("127.0.0.1", 0)
+        port = listening.sockets[0].getsockname()[1]
+        try:
+            return await test(port)
+        finally:
+            listening.close()
+            await listening.wait_closed()
+
+    return asyncio.run(main())
+
+
+async def send(conn: Connection, message: Any) -> Any:
+    """Send one message line and return the decoded reply."""
+    reader, writer = conn
+    raw = message if isinstance(message, bytes) else server.encode(message)
+    writer.write(raw)
+    return json.loads(await reader.readline())
+
+
+def test_match_plays_to_a_winner() -> None:
+    """Test firing at every square ends the match with a winner."""
+
+    async def test(port: int) -> Any:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        start = json.loads(await reader.readline())
+        assert start["op"] == "start"
+        assert len(start["own"]) == start["size"]
+        result: Any = {"winner": None}
+        index = 0
+        while not result["winner"]:
+            y, x = divmod(index, start["size"])
+            result = await send((reader, writer), {"op": "fire", "x": x, "y": y})
+            assert result["op"] == "result"
+            index += 1
+        writer.close()
+        return result
+
+    result = with_server(test)
+    assert result["winner"] in ("you", "bot")
+
+
+def test_view_hides_bot_fleet() -> None:
+    """Test the view shows own fleet but only shots on the bot's board."""
+
+    async def test(port: int) -> Any:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readline()
+        await send((reader, writer), {"op": "fire", "x": 0, "y": 0})
+        view = await send((reader, writer), {"op": "view"})
+        writer.close()
+        return view
+
+    view = with_server(test)
+    assert view["op"] == "view"
+    assert any(label.strip() for label in view["own"])
+    assert view["target"][0][0] in ("X", "o")
+    assert all(not row.strip() for row in view["target"][1:])
+
+
+def test_delta_sends_changed_squares() -> None:
+    """Test deltas hold every square first, then only those changed."""
+
+    async def test(port: int) -> Any:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readline()
+        first = await send((reader, writer), {"op": "delta"})
+        await send((reader, writer), {"op": "fire", "x": 0, "y": 0})
+        second = await send((reader, writer), {"op": "delta"})
+        third = await send((reader, writer), {"op": "delta"})
+        writer.close()
+        return first, second, third
+
+    first, second, third = with_server(test)
+    assert first["op"] == "delta"
+    assert first["target"]["full"] and len(first["target"]["cells"]) == 81
+    assert all(cell[2] == "EMPTY" for cell in first["target"]["cells"])
+    assert [cell[0] for cell in second["target"]["cells"]] == [0]
+    assert second["target"]["cells"][0][2] in ("HIT", "MISS")
+    assert len(second["own"]["cells"]) == 1
+    assert third["own"] is None and third["target"] is None
+
+
+def test_bad_messages_get_errors() -> None:
+    """Test malformed, unknown and repeated messages are answered with errors."""
+
+    async def test(port: int) -> Any:
+        conn = await asyncio.open_connection("127.0.0.1", port)
+        await conn[0].readline()
+        replies = [
+            await send(conn, b"not json\n"),
+            await send(conn, {"op": "dance"}),
+            await send(conn, {"op": "fire", "x": 0}),
+            await send(conn, {"op": "fire", "x": 0, "y": 0}),
+            await send(conn, {"op": "fire", "x": 0, "y": 0}),
+            await send(conn, {"op": "fire", "x": 99, "y": 0}),
+            await send(conn, b'{"op": "fire", "x": 1e999, "y": 0}\n'),
+            await send(conn, {"op": "fire", "x": 1.0, "y": 0}),
+            await send(conn, {"op": "fire", "x": "1", "y": 0}),
+        ]
+        conn[1].close()
+        return replies
+
+    replies = with_server(test)
+    assert [r["op"] for r in replies] == [
+        "error",
+        "error",
+        "error",
+        "result",
+        "error",
+        "error",
+        "error",
+        "error",
+        "error",
+    ]
+    assert replies[-1]["error"] == "x must be an integer."
+
+
+def test_match_refuses_moves_once_won() -> None:
+    """Test the client wins by sinking every entity and cannot fire after."""
+
+    async def test() -> Any:
+        match = server.Match(side_length=3, sizes={"A": 2})
+        result = None
+        for index in match.target.fleet.occupancy.placements["A"].span.indices:
+            result = await match.fire(index % 3, index // 3)
+        try:
+            await match.fire(0, 0)
+        except ValueError as error:
+            return result, str(error)
+
+    result, error = asyncio.run(test())
+    assert result["winner"] == "you" and result["reply"] is None
+    assert error == "The match is over."
+
+
+class ClosedWriter:
+    """Stand-in StreamWriter of a connection that is already gone."""
+
+    def __init__(self) -> None:
+        """Initialize ClosedWriter."""
+        self.written: List[bytes] = []
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        """Record data written."""
+        self.written.append(data)
+
+    async def drain(self) -> None:
+        """Return at once."""
+
+    def close(self) -> None:
+        """Record the close."""
+        self.closed = True
+
+
+def test_reset_connection_ends_match() -> None:
+    """Test a connection reset by the client ends its match quietly."""
+
+    async def test() -> Tuple[server.MatchServer, ClosedWriter]:
+        match_server = server.MatchServer(seed=1)
+        reader = asyncio.StreamReader()
+        reader.set_exception(ConnectionResetError())
+        writer = ClosedWriter()
+        await match_server.handle(reader, cast(asyncio.StreamWriter, writer))
+        return match_server, writer
+
+    match_server, writer = asyncio.run(test())
+    assert writer.closed and len(writer.written) == 1
+    assert match_server.active == 0
+
+
+def test_serve_forever_until_cancelled() -> None:
+    """Test serve_forever listens until its task is cancelled."""
+
+    async def test() -> bool:
+        task = asyncio.ensure_future(
+            server.serve_forever(server.MatchServer(seed=1), "127.0.0.1", 0)
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return task.cancelled()
+
+    assert asyncio.run(test())
+
+
+def test_full_server_turns_connections_away() -> None:
+    """Test connections beyond max_matches get an error and are closed."""
+
+    async def test(port: int) -> Any:
+        first = await asyncio.open_connection("127.0.0.1", port)
+        await first[0].readline()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        reply = json.loads(await reader.readline())
+        closed = await reader.readline()
+        first[1].close()
+        writer.close()
+        return reply, closed
+
+    reply, closed = with_server(test, max_matches=1)
+    assert reply == {"op": "error", "error": "Server is full."}
+    assert closed == b""
+
+
+def test_long_line_ends_connection() -> None:
+    """Test a line longer than MAX_LINE is refused and the connection closed."""
+
+    async def test(port: int) -> Any:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readline()
+        writer.write(b"x" * (server.MAX_LINE * 2) + b"\n")
+        reply = json.loads(await reader.readline())
+        closed = await reader.readline()
+        writer.close()
+        return reply, closed
+
+    reply, closed = with_server(test)
+    assert reply == {"op": "error", "error": "Line too long."}
+    assert closed == b""
@@ -0,0 +1,62 @@
+"""Test cases for simulate module."""
+import random
+
+from fightgrid import simulate
+from fightgrid import strategies
+
+
+def test_latency_histogram_percentiles() -> None:
+    """Test percentiles fall within a bucket of the true value."""
+    hist = simulate.LatencyHistogram()
+    assert hist.percentile(50) == 0.0
+    for ns in range(1, 1001):
+        hist.add(ns * 1000)
+    other = simulate.LatencyHistogram()
+    other.add(0)
+    hist.merge(other)
+    assert hist.total == 1001
+    assert 500_000 <= hist.percentile(50) <= 500_000 * 1.1
+    assert 990_000 <= hist.percentile(99) <= 990_000 * 1.1
+    assert hist.percentile(150) == hist.percentile(100)
+
+
+def test_play_match_has_winner() -> None:
+    """Test a match ends with one player winning."""
+    factories = (strategies.Strategy, strategies.HuntStrategy)
+    latency = simulate.LatencyHistogram()
+    rng = random.Random(2)  # noqa: S311
+    result = simulate.play_match(factories, rng, latency=latency)
+    assert result.winner in (0, 1)
+    assert latency.total == result.moves
+
+
+def test_split_games() -> None:
+    """Test games are shared evenly across batches."""
+    assert simulate.split_games(10, 4) == [3, 3, 2, 2]
+    assert simulate.split_games(2, 8) == [1, 1]
+    assert simulate.split_games(0, 8) == [0]
+
+
+def test_run_in_process_is_reproducible() -> None:
+    """Test one-worker runs with the same seed give the same results."""
+    first = simulate.run(("random", "hunt"), 6, workers=1, seed=4)
+    second = simulate.run(("random", "hunt"), 6, workers=1, seed=4)
+    assert first.games == 6
+    assert first.wins == second.wins
+    assert first.moves == second.moves
+    assert abs(first.win_rate(0) + first.win_rate(1) - 1) < 1e-9
+    assert "random:" in first.format()
+
+
+def test_run_process_pool() -> None:
+    """Test runs across worker processes count every game."""
+    report = simulate.run(("hunt", "hunt"), 4, workers=2)
+    assert report.games == 4
+    assert report.games_per_second() > 0
+
+
+def test_empty_report() -> None:
+    """Test a report with no games has zero rates."""
+    report = simulate.SimulationReport(("a", "b"), [], 0.0)
+    assert report.games_per_second() == 0.0
+    assert report.win_rate(0) == 0.0
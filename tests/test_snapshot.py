@@ -0,0 +1,157 @@
+"""Test cases for snapshot module."""
+import pathlib
+import struct
+import sys
+
+import pytest
+
+from fightgrid import grid
+from fightgrid import snapshot
+from fightgrid.grid import SqState
+from fightgrid.topology import Topology
+
+
+@pytest.fixture
+def busy_grid() -> grid.Grid:
+    """Pytest fixture with a 5x5 grid of varied states and labels."""
+    g = grid.Grid(side_length=5, def_pub_label="w", def_prv_label="x")
+    g.get_square_xy(0, 0).state = SqState.HIT
+    g.get_square_xy(1, 0).state = SqState.MISS
+    g.get_square_xy(4, 4).state = SqState.SUNK
+    g.get_square_xy(2, 3).pub_label = "ü"
+    g.get_square_xy(2, 3).highlight = "red"
+    g.get_square_xy(3, 3).prv_label = None
+    return g
+
+
+def assert_same(a: grid.Grid, b: grid.Grid) -> None:
+    """Assert two grids hold the same squares."""
+    assert a.side_length == b.side_length
+    for index in range(a.side_length**2):
+        sa, sb = a.get_square_index(index), b.get_square_index(index)
+        assert repr(sa) == repr(sb)
+        assert sa.highlight == sb.highlight
+    assert a.bits.mask(SqState.HIT) == b.bits.mask(SqState.HIT)
+
+
+def test_round_trip(busy_grid: grid.Grid) -> None:
+    """Test grid restored from bytes matches the original."""
+    data = snapshot.dumps(busy_grid)
+    snap = snapshot.loads(data)
+    assert snap.side_length == 5
+    assert snap.state_at(4, 4) is SqState.SUNK
+    assert snap.label_at(2, 3) == "ü"
+    assert snap.label_at(3, 3, prv=True) is None
+    assert_same(snap.to_grid(), busy_grid)
+
+
+def test_snapshot_is_compact(busy_grid: grid.Grid) -> None:
+    """Test snapshot holds about seven bytes per square."""
+    data = snapshot.dumps(busy_grid)
+    assert len(data) < snapshot.HEADER.size + 7 * 25 + 32
+
+
+def test_file_round_trip(busy_grid: grid.Grid, tmp_path: pathlib.Path) -> None:
+    """Test dump and memory-mapped load through a file."""
+    path = str(tmp_path / "board.fgsn")
+    snapshot.dump(busy_grid, path)
+    assert_same(snapshot.load(path), busy_grid)
+
+
+def test_rejects_bad_buffers(busy_grid: grid.Grid) -> None:
+    """Test ValueError for foreign, newer, truncated or corrupt snapshots."""
+    data = snapshot.dumps(busy_grid)
+    with pytest.raises(ValueError):
+        snapshot.loads(b"FG")
+    with pytest.raises(ValueError):
+        snapshot.loads(b"XXXX" + data[4:])
+    newer = data[:4] + struct.pack("<H", snapshot.VERSION + 1) + data[6:]
+    with pytest.raises(ValueError):
+        snapshot.loads(newer)
+    with pytest.raises(ValueError):
+        snapshot.loads(data[:60])
+    with pytest.raises(ValueError):
+        snapshot.loads(data[:-4])
+    with pytest.raises(ValueError):
+        snapshot.loads(data[:-1])
+    states = snapshot.HEADER.size
+    with pytest.raises(ValueError, match="state"):
+        snapshot.loads(data[:states] + b"\xff" + data[states + 1 :])
+    planes = states + 26
+    with pytest.raises(ValueError, match="label"):
+        snapshot.loads(data[:planes] + b"\xff\xff" + data[planes + 2 :])
+
+
+@pytest.fixture
+def holed_grid() -> grid.Grid:
+    """Pytest fixture with a 5x3 wrapping grid with two blocked squares."""
+    topology = Topology.from_rows([".....", ".#...", "....#"], "#", wrap=True)
+    g = grid.Grid(topology=topology)
+    g.get_square_xy(0, 2).state = SqState.HIT
+    g.get_square_xy(3, 1).pub_label = "z"
+    return g
+
+
+def test_round_trip_keeps_topology(holed_grid: grid.Grid) -> None:
+    """Test width, height, wrap and blocked squares survive a round trip."""
+    snap = snapshot.loads(snapshot.dumps(holed_grid))
+    assert (snap.side_length, snap.height) == (5, 3)
+    assert snap.topology == holed_grid.topology
+    assert snap.state_at(0, 2) is SqState.HIT
+    assert snap.label_at(3, 1) == "z"
+    restored = snap.to_grid()
+    assert restored.topology == holed_grid.topology
+    assert [repr(restored.get_square_index(i)) for i in range(15)] == [
+        repr(holed_grid.get_square_index(i)) for i in range(15)
+    ]
+    assert restored.bits.mask(SqState.HIT) == holed_grid.bits.mask(SqState.HIT)
+
+
+def test_rejects_bad_topology(holed_grid: grid.Grid) -> None:
+    """Test ValueError for unknown flags or blocks outside the grid."""
+    data = snapshot.dumps(holed_grid)
+    unknown = data[:6] + struct.pack("<H", 4) + data[8:]
+    with pytest.raises(ValueError, match="flags"):
+        snapshot.loads(unknown)
+    mask = snapshot.HEADER.size + 15
+    outside = data[: mask + 1] + bytes([data[mask + 1] | 0x80]) + data[mask + 2 :]
+    with pytest.raises(ValueError, match="outside"):
+        snapshot.loads(outside)
+
+
+def test_array_grid_needs_plain_square(holed_grid: grid.Grid) -> None:
+    """Test ValueError restoring a shaped grid to an ArrayGrid."""
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        snapshot.loads(snapshot.dumps(holed_grid)).to_array_grid()
+    wrapped = grid.Grid(topology=Topology.square(3, wrap=True))
+    with pytest.raises(ValueError):
+        snapshot.loads(snapshot.dumps(wrapped)).to_array_grid()
+
+
+def test_too_many_labels() -> None:
+    """Test OverflowError when labels do not fit u16 ids."""
+    g = grid.Grid(side_length=256)
+    for index in range(256 * 256):
+        g.get_square_index(index).pub_label = str(index)
+    with pytest.raises(OverflowError):
+        snapshot.dumps(g)
+
+
+def test_without_array_grid_loaded(
+    busy_grid: grid.Grid, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a plain Grid is dumped without importing arraygrid."""
+    monkeypatch.delitem(sys.modules, "fightgrid.arraygrid", raising=False)
+    data = snapshot.dumps(busy_grid)
+    assert "fightgrid.arraygrid" not in sys.modules
+    assert_same(snapshot.loads(data).to_grid(), busy_grid)
+
+
+def test_array_grid_round_trip(busy_grid: grid.Grid) -> None:
+    """Test ArrayGrid snapshots match plain Grid snapshots."""
+    pytest.importorskip("numpy")
+    restored = snapshot.loads(snapshot.dumps(busy_grid)).to_array_grid()
+    assert_same(restored, busy_grid)
+    again = snapshot.loads(snapshot.dumps(restored))
+    assert_same(again.to_grid(), busy_grid)
@@ -0,0 +1,127 @@
+"""Test cases for sparsegrid module."""
+from typing import Any
+from typing import List
+from typing import Tuple
+
+import pytest
+
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.sparsegrid import SparseGrid
+
+
+def test_huge_grid_stores_only_changed_squares() -> None:
+    """Test a 100,000 square a side grid only keeps touched squares."""
+    grid = SparseGrid(100_000)
+    sq = grid.get_square_xy(99_999, 50_000)
+    assert sq.state is SqState.EMPTY
+    assert list(grid.stored()) == []
+    sq.state = SqState.HIT
+    assert grid.get_square_xy(99_999, 50_000) is sq
+    assert list(grid.members(SqState.HIT)) == [50_000 * 100_000 + 99_999]
+    assert grid.count(SqState.EMPTY) == 100_000**2 - 1
+    sq.state = SqState.EMPTY
+    assert list(grid.stored()) == []
+    assert grid.count(SqState.HIT) == 0
+    assert "stored=0" in repr(grid)
+
+
+def test_matches_dense_grid_neighbors() -> None:
+    """Test projections and neighbors agree with a dense Grid."""
+    dense = Grid(5)
+    sparse = SparseGrid(5)
+    for x, y in ((0, 0), (2, 3), (4, 4)):
+        dsq = dense.get_square_xy(x, y)
+        ssq = sparse.get_square_xy(x, y)
+        for direction in Direction:
+            for distance in (1, 2):
+                assert sparse.projected_from(ssq, direction, distance) == (
+                    dense.projected_from(dsq, direction, distance)
+                )
+        assert sparse.surrounding_squares(ssq) == dense.surrounding_squares(dsq)
+        assert sparse.reticle_squares(ssq) == dense.reticle_squares(dsq)
+    assert sparse.projected_from(Square(9, 9), Direction.UP) is None
+    assert not sparse.square_valid(Square(5, 0))
+    with pytest.raises(IndexError):
+        sparse.get_square_xy(-1, 0)
+
+
+def test_labels_and_listeners() -> None:
+    """Test label changes are stored and reported like a dense Grid's."""
+    grid = SparseGrid(4, def_pub_label=".")
+    changes: List[Tuple[Any, ...]] = []
+
+    def listener(sq: Square, field: str, old: Any, new: Any) -> None:
+        changes.append((sq.x, sq.y, field, old, new))
+
+    grid.add_listener(listener)
+    grid.get_square_xy(1, 2).pub_label = "X"
+    grid.set_state(Square(1, 2), SqState.MISS)
+    assert grid.get_square_index(9).pub_label == "X"
+    assert grid.grid_string_labels().split("\n")[2] == ". X . ."
+    assert changes == [
+        (1, 2, "pub_label", ".", "X"),
+        (1, 2, "state", SqState.EMPTY, SqState.MISS),
+    ]
+
+
+def test_stale_synthesized_square_updates_stored() -> None:
+    """Test changing an older synthesized Square updates the stored one."""
+    grid = SparseGrid(4)
+    first = grid.get_square_xy(0, 0)
+    second = grid.get_square_xy(0, 0)
+    first.state = SqState.HIT
+    second.state = SqState.SUNK
+    assert grid.get_square_xy(0, 0) is first
+    assert first.state is SqState.SUNK
+    assert grid.count(SqState.HIT) == 0
+    assert grid.count(SqState.SUNK) == 1
+    with pytest.raises(ValueError):
+        grid.members(SqState.EMPTY)
+
+
+def test_wrap() -> None:
+    """Test projections on a wrapping sparse grid cross its edges."""
+    grid = SparseGrid(100_000, wrap=True)
+    corner = grid.get_square_xy(0, 0)
+    assert grid.projected_from(corner, Direction.LEFT) == Square(99_999, 0)
+    assert len(grid.reticle_squares(corner)) == 8
+
+
+def test_fork_copies_stored_squares() -> None:
+    """Test a fork of a SparseGrid changes independently of it."""
+    g = SparseGrid(100, def_pub_label="w")
+    g.get_square_xy(5, 5).state = SqState.HIT
+    child = g.fork()
+    child.get_square_xy(5, 5).state = SqState.MISS
+    child.get_square_xy(6, 5).pub_label = "o"
+    assert g.get_square_xy(5, 5).state is SqState.HIT
+    assert g.count(SqState.MISS) == 0
+    assert child.count(SqState.HIT) == 0
+    assert len(list(g.stored())) == 1
+    assert len(list(child.stored())) == 2
+
+
+def test_zobrist_matches_dense_grid() -> None:
+    """Test a SparseGrid hashes the same position as a Grid does."""
+    sparse, dense = SparseGrid(5), Grid(5)
+    for g in (sparse, dense):
+        g.get_square_xy(1, 2).state = SqState.HIT
+        g.get_square_xy(4, 4).state = SqState.MISS
+        g.get_square_xy(4, 4).state = SqState.EMPTY
+    assert sparse.zobrist == dense.zobrist != 0
+    assert sparse.fork().zobrist == sparse.zobrist
+
+
+def test_label_at_matches_dense_grid() -> None:
+    """Test labels read by index or row match a Grid's, stored or not."""
+    sparse, dense = SparseGrid(5, "w", "x"), Grid(5, "w", "x")
+    for g in (sparse, dense):
+        g.get_square_xy(1, 2).pub_label = "o"
+        g.get_square_xy(1, 2).state = SqState.HIT
+    for index in (0, 11):
+        assert sparse.label_at(index) == dense.label_at(index)
+        assert sparse.label_at(index, prv=True) == dense.label_at(index, prv=True)
+    assert sparse.row_labels(2) == dense.row_labels(2) == ["w", "o", "w", "w", "w"]
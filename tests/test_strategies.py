@@ -0,0 +1,74 @@
+"""Test cases for strategies module."""
+import random
+
+import pytest
+
+from fightgrid import game
+from fightgrid import strategies
+from fightgrid.grid import SqState
+from fightgrid.transposition import TranspositionTable
+
+
+@pytest.mark.parametrize("name", sorted(strategies.STRATEGIES))
+def test_strategy_sinks_fleet(name: str) -> None:
+    """Test each strategy defeats a board without repeating a shot."""
+    rng = random.Random(7)  # noqa: S311
+    board = game.Board(rng=rng)
+    player = strategies.load_strategy(name)(rng=rng)
+    shots = set()
+    while not board.defeated():
+        x, y = player.choose()
+        assert (x, y) not in shots
+        shots.add((x, y))
+        player.observe(x, y, board.fire(x, y))
+
+
+def test_mark_sunk_follows_hits() -> None:
+    """Test sinking marks the run of hits matching the entity length."""
+    player = strategies.Strategy(sizes={"Submarine": 3})
+    player.observe(3, 3, game.Shot(SqState.HIT))
+    player.observe(3, 4, game.Shot(SqState.HIT))
+    player.observe(4, 3, game.Shot(SqState.HIT))
+    player.observe(5, 3, game.Shot(SqState.SUNK, "Submarine"))
+    assert player.grid.bits.members(SqState.SUNK) == {30, 31, 32}
+    assert player.grid.get_square_xy(3, 4).state is SqState.HIT
+
+
+def test_hunt_extends_line_of_hits() -> None:
+    """Test hunting fires at the ends of a line of hits."""
+    player = strategies.HuntStrategy(rng=random.Random(3))  # noqa: S311
+    player.observe(3, 3, game.Shot(SqState.HIT))
+    player.observe(4, 3, game.Shot(SqState.HIT))
+    for _ in range(10):
+        assert player.choose() in ((2, 3), (5, 3))
+    player.observe(5, 3, game.Shot(SqState.MISS))
+    assert player.choose() == (2, 3)
+
+
+def test_load_strategy_import_path() -> None:
+    """Test strategies load from module:attribute paths."""
+    loaded = strategies.load_strategy("fightgrid.strategies:HuntStrategy")
+    assert loaded is strategies.HuntStrategy
+
+
+def test_load_strategy_unknown() -> None:
+    """Test ValueError for unknown names."""
+    with pytest.raises(ValueError):
+        strategies.load_strategy("nope")
+
+
+def test_density_cache_shared_across_games() -> None:
+    """Test a shared cache chooses as the density map does, reusing positions."""
+    cache = TranspositionTable(1024)
+    for seed in range(3):
+        rng = random.Random(seed)  # noqa: S311
+        board = game.Board(rng=rng)
+        cached = strategies.DensityStrategy(rng=rng, cache=cache)
+        plain = strategies.DensityStrategy(rng=rng)
+        while not board.defeated():
+            x, y = cached.choose()
+            assert (x, y) == plain.choose()
+            shot = board.fire(x, y)
+            cached.observe(x, y, shot)
+            plain.observe(x, y, shot)
+    assert cache.hits >= 2
@@ -0,0 +1,131 @@
+"""Test cases for targeting module."""
+import random
+from typing import List
+
+import pytest
+
+import fightgrid.config as cfg
+from fightgrid import grid
+from fightgrid import targeting
+from fightgrid.grid import SqState
+from fightgrid.topology import Topology
+
+
+@pytest.fixture
+def density() -> targeting.DensityMap:
+    """Pytest fixture with density map over an empty default grid."""
+    return targeting.DensityMap(grid.Grid(side_length=cfg.GRID_SIZE))
+
+
+def fresh_density(dm: targeting.DensityMap) -> List[int]:
+    """Return density recounted from scratch for the same grid."""
+    other = targeting.DensityMap(dm.grid, dm.remaining, dm.hit_weight)
+    other.detach()
+    return other.density
+
+
+def test_covering_spans() -> None:
+    """Test each square lists spans through it."""
+    covering = targeting.covering_spans(3, 3)
+    assert len(covering[4]) == 2
+    assert len(covering[0]) == 2
+    assert len(covering[1]) == 2
+
+
+def test_covering_spans_follow_topology() -> None:
+    """Test spans through squares of a rectangular grid with a block."""
+    topology = Topology.from_rows(["...#", "....", "...."])
+    covering = targeting.covering_spans(0, 3, topology)
+    assert len(covering) == 12
+    assert covering[3] == ()
+    assert len(covering[2]) == 2 and len(covering[7]) == 1
+
+
+def test_empty_grid_density(density: targeting.DensityMap) -> None:
+    """Test center squares are denser than corners on an empty grid."""
+    corner = density.density_at(grid.Square(0, 0))
+    center = density.density_at(grid.Square(4, 4))
+    assert center > corner > 0
+    assert corner == 2 * len(cfg.ENTITY_SIZES)
+    assert len(density.heatmap()) == cfg.GRID_SIZE
+
+
+def test_miss_removes_spans(density: targeting.DensityMap) -> None:
+    """Test a miss drops its own density to zero."""
+    density.grid.get_square_xy(4, 4).state = SqState.MISS
+    assert density.density_at(grid.Square(4, 4)) == 0
+    assert density.density == fresh_density(density)
+
+
+def test_hit_weights_neighbors(density: targeting.DensityMap) -> None:
+    """Test a hit makes its neighbors the best targets."""
+    density.grid.get_square_xy(0, 0).state = SqState.HIT
+    best = density.best_target()
+    assert best in (grid.Square(1, 0), grid.Square(0, 1))
+    assert density.density == fresh_density(density)
+
+
+def test_incremental_matches_rebuild(density: targeting.DensityMap) -> None:
+    """Test random shots keep incremental density equal to a recount."""
+    rng = random.Random(3)  # noqa: S311
+    squares = [density.grid.get_square_index(i) for i in range(81)]
+    rng.shuffle(squares)
+    for sq in squares[:40]:
+        sq.state = rng.choice([SqState.HIT, SqState.MISS])
+        assert density.density == fresh_density(density)
+    for sq in squares[:10]:
+        if sq.state is SqState.HIT:
+            sq.state = SqState.SUNK
+    assert density.density == fresh_density(density)
+
+
+def test_undo_rebuilds(density: targeting.DensityMap) -> None:
+    """Test reverting a shot recounts density."""
+    before = list(density.density)
+    sq = density.grid.get_square_xy(2, 2)
+    sq.state = SqState.MISS
+    sq.state = SqState.EMPTY
+    assert density.density == before
+    sq.pub_label = "x"
+    sq.state = SqState.HIDDEN
+    assert density.density == before
+
+
+def test_mark_sunk(density: targeting.DensityMap) -> None:
+    """Test sinking every entity leaves no density."""
+    for name in cfg.ENTITY_SIZES:
+        density.mark_sunk(name)
+    assert not any(density.density)
+    assert density.density == fresh_density(density)
+
+
+def test_mark_sunk_keeps_same_length_entities() -> None:
+    """Test sinking one of two equal entities keeps the other's spans."""
+    dm = targeting.DensityMap(grid.Grid(3), {"a": 2, "b": 2})
+    before = dm.density_at(grid.Square(0, 0))
+    dm.mark_sunk("a")
+    assert dm.density_at(grid.Square(0, 0)) == before // 2 > 0
+    assert dm.density == fresh_density(dm)
+
+
+def test_best_target_none_when_all_shot() -> None:
+    """Test no target once every square is shot."""
+    g = grid.Grid(side_length=2)
+    dm = targeting.DensityMap(g, {"Patrol Boat": 2})
+    for i in range(4):
+        g.get_square_index(i).state = SqState.MISS
+    assert dm.best_target() is None
+
+
+def test_density_on_rectangular_grid_skips_blocks() -> None:
+    """Test the map covers a wide grid and never targets a block."""
+    g = grid.Grid(topology=Topology.from_rows(["#....", ".....", "....."]))
+    dm = targeting.DensityMap(g, {"Patrol Boat": 2})
+    assert len(dm.density) == 15
+    assert [len(row) for row in dm.heatmap()] == [5, 5, 5]
+    assert dm.density_at(grid.Square(0, 0)) == 0
+    g.get_square_xy(4, 2).state = SqState.MISS
+    assert dm.density == fresh_density(dm)
+    for i in range(1, 15):
+        g.get_square_index(i).state = SqState.MISS
+    assert dm.best_target() is None
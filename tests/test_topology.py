@@ -0,0 +1,52 @@
+"""Test cases for topology module."""
+import pytest
+
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.topology import Topology
+
+
+def test_wrap_neighbor_table() -> None:
+    """Test projections on a torus re-enter from the opposite edge."""
+    torus = Topology(3, 2, wrap=True)
+    assert torus.neighbors(Direction.RIGHT) == (1, 2, 0, 4, 5, 3)
+    assert torus.neighbors(Direction.UP, 3) == (3, 4, 5, 0, 1, 2)
+    assert torus.neighbors(Direction.RIGHT) is torus.neighbors(Direction.RIGHT)
+
+
+def test_small_torus_adjacency_has_no_repeats() -> None:
+    """Test each neighbor is listed once, and never the square itself."""
+    torus = Topology.square(2, wrap=True)
+    adjacency = torus.adjacency((Direction.UP, Direction.LEFT, Direction.RIGHT))
+    assert adjacency[0] == (2, 1)
+
+
+def test_from_rows() -> None:
+    """Test blocked squares are read from rows of text."""
+    topology = Topology.from_rows(["#..", "..#"])
+    assert (topology.width, topology.height) == (3, 2)
+    assert topology.blocked == frozenset({0, 5})
+    assert topology.valid() == (False, True, True, True, True, False)
+    with pytest.raises(ValueError):
+        Topology.from_rows(["..", "..."])
+
+
+def test_grid_on_torus() -> None:
+    """Test a Grid on a torus finds neighbors across its edges."""
+    g = Grid(topology=Topology.square(4, wrap=True))
+    corner = g.get_square_xy(0, 0)
+    assert g.projected_from(corner, Direction.UP_LEFT) is g.get_square_xy(3, 3)
+    assert len(g.reticle_squares(corner)) == 8
+
+
+def test_project_longer_distances_without_tables() -> None:
+    """Test projections past one square jump blocked squares and wrap."""
+    topology = Topology.from_rows(["..#.", "....", "#..."])
+    assert topology.project(0, Direction.RIGHT, 3) == 3
+    assert topology.project(0, Direction.RIGHT, 2) is None
+    assert topology.project(1, Direction.DOWN, 2) == 9
+    assert topology.project(1, Direction.LEFT, 2) is None
+    assert topology.project(5, Direction.DOWN, 0) == 5
+    torus = topology._replace(wrap=True)
+    assert torus.project(1, Direction.LEFT, 2) == 3
+    assert torus.neighbors(Direction.DOWN, 2) is not torus.neighbors(Direction.DOWN, 2)
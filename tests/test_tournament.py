@@ -0,0 +1,78 @@
+"""Test cases for tournament module."""
+import random
+
+import pytest
+
+from fightgrid import tournament
+
+
+SIZES = {"Destroyer": 3, "Patrol Boat": 2}
+
+
+def test_deals_round_trip() -> None:
+    """Test a dealt fleet is rebuilt on a Board from the buffer."""
+    layout = tournament.Layout(6, deals=1, matches=0)
+    buffer = memoryview(bytearray(layout.size))
+    tournament.write_deals(buffer, layout, random.Random(2), SIZES)  # noqa: S311
+    for side in range(2):
+        board = tournament.read_board(buffer, layout, 0, side, SIZES)
+        placements = board.fleet.occupancy.placements
+        assert {name: len(p.span.indices) for name, p in placements.items()} == SIZES
+        start = side * 36
+        for number, name in enumerate(SIZES, start=1):
+            cells = [i for i in range(36) if buffer[start + i] == number]
+            assert list(placements[name].span.indices) == cells
+
+
+def test_elo_ratings() -> None:
+    """Test the winner gains what the loser loses."""
+    outcome = tournament.MatchOutcome("a", "b", "a", 30)
+    ratings = tournament.elo_ratings([outcome])
+    assert ratings["a"] == pytest.approx(1516.0)
+    assert ratings["b"] == pytest.approx(1484.0)
+    assert tournament.expected_score(1600, 1600) == 0.5
+
+
+def test_run_in_process_matches_workers() -> None:
+    """Test workers sharing memory give the same outcomes as one process."""
+    names = ["random", "hunt", "density"]
+    local = tournament.run(names, 4, workers=1, seed=3, side_length=6, sizes=SIZES)
+    shared = tournament.run(names, 4, workers=2, seed=3, side_length=6, sizes=SIZES)
+    assert len(local.outcomes) == 12
+    assert local.outcomes == shared.outcomes
+    assert local.ratings == shared.ratings
+    wins, losses = local.record("random")
+    assert wins + losses == 8
+    assert local.standings()[0][1] >= local.standings()[-1][1]
+    assert "elo" in local.format()
+
+
+def test_play_shard_attaches_shared_memory() -> None:
+    """Test a shard reads its deals from a named shared memory block."""
+    shared_memory = pytest.importorskip("multiprocessing.shared_memory")
+    pairings = tournament.schedule(["hunt", "random"], 1)
+    layout = tournament.Layout(6, 1, len(pairings))
+    block = shared_memory.SharedMemory(create=True, size=layout.size)
+    try:
+        tournament.write_deals(block.buf, layout, random.Random(1), SIZES)  # noqa: S311
+        tournament.play_shard(block.name, layout, list(enumerate(pairings)), 0, SIZES)
+        (outcome,) = tournament.read_results(block.buf, layout, pairings)
+    finally:
+        block.close()
+        block.unlink()
+    assert outcome.winner in ("hunt", "random")
+    assert outcome.moves > 0
+
+
+def test_run_needs_two_strategies() -> None:
+    """Test a tournament of one strategy is refused."""
+    with pytest.raises(ValueError):
+        tournament.run(["hunt", "hunt"], 1)
+
+
+def test_run_rejects_no_deals_and_small_boards() -> None:
+    """Test bad deal counts and sizes are refused before any match."""
+    with pytest.raises(ValueError, match="one deal"):
+        tournament.run(["hunt", "random"], 0, workers=2)
+    with pytest.raises(ValueError, match="length 3"):
+        tournament.run(["hunt", "random"], 1, side_length=2, sizes=SIZES)
@@ -0,0 +1,64 @@
+"""Test cases for transposition module."""
+import pytest
+
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.transposition import DEPTH
+from fightgrid.transposition import TranspositionTable
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    """Test the entry not used for longest is dropped when full."""
+    table = TranspositionTable(2)
+    table.put(1, "a")
+    table.put(2, "b")
+    assert table.get(1) == "a"
+    table.put(3, "c")
+    assert 2 not in table
+    assert 1 in table and 3 in table
+    assert len(table) == 2
+    assert table.get(2) is None
+    assert (table.hits, table.misses) == (1, 1)
+
+
+def test_get_requires_depth() -> None:
+    """Test a shallower result is not returned for a deeper search."""
+    table = TranspositionTable()
+    table.put(5, 0.5, depth=2)
+    assert table.get(5, depth=3) is None
+    assert table.get(5, depth=2) == 0.5
+
+
+def test_depth_preferred_keeps_deeper_entry() -> None:
+    """Test a shallow entry does not replace a deeper one in its slot."""
+    table = TranspositionTable(4, policy=DEPTH)
+    assert table.put(1, "deep", depth=5)
+    assert not table.put(5, "shallow", depth=1)
+    assert table.get(1) == "deep"
+    assert 5 not in table
+    assert table.put(1, "shallower", depth=0)
+    assert table.put(5, "deeper", depth=6)
+    assert table.get(5) == "deeper"
+    assert len(table) == 1
+    table.clear()
+    assert len(table) == 0 and table.hits == 0
+
+
+def test_grid_zobrist_as_key() -> None:
+    """Test positions reached in different orders share an entry."""
+    table = TranspositionTable(16, policy=DEPTH)
+    a, b = Grid(3), Grid(3)
+    a.get_square_index(0).state = SqState.MISS
+    a.get_square_index(1).state = SqState.HIT
+    table.put(a.zobrist, 1.0)
+    b.get_square_index(1).state = SqState.HIT
+    b.get_square_index(0).state = SqState.MISS
+    assert table.get(b.zobrist) == 1.0
+
+
+def test_invalid_arguments() -> None:
+    """Test capacity and policy are checked."""
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+    with pytest.raises(ValueError):
+        TranspositionTable(policy="fifo")
@@ -0,0 +1,91 @@
+"""Test cases for views module."""
+import json
+
+from fightgrid.game import Board
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.views import PRIVATE
+from fightgrid.views import PUBLIC
+from fightgrid.views import Cell
+from fightgrid.views import GridView
+
+
+def board() -> Board:
+    """Return 4x4 Board with a Patrol Boat at its top left."""
+    b = Board(grid=Grid(4), sizes={"Patrol Boat": 2})
+    b.fleet.place("Patrol Boat", 0, 0, Direction.RIGHT)
+    return b
+
+
+def test_visibility_hides_fleet_from_public() -> None:
+    """Test the owner sees the fleet and others see only shots."""
+    b = board()
+    own, other = GridView(b.grid, PRIVATE), GridView(b.grid, PUBLIC)
+    assert own.cell(0, 0) == Cell("P", SqState.HIDDEN)
+    assert other.cell(0, 0) == Cell(None, SqState.EMPTY)
+    b.fire(1, 0)
+    assert other.cell(1, 0).state is SqState.HIT
+    assert other.cell(1, 0).label == b.grid.get_square_xy(1, 0).pub_label
+    assert other.rows()[0][1] == other.cell(1, 0)
+
+
+def test_delta_sends_only_changed_squares() -> None:
+    """Test an observer gets every square once, then only changes."""
+    b = board()
+    view = GridView(b.grid, PUBLIC)
+    observer = view.observe()
+    first = observer.update()
+    assert first is not None and first["full"] and len(first["cells"]) == 16
+    assert observer.update() is None
+    b.fire(3, 3)
+    b.fire(0, 0)
+    delta = observer.update()
+    assert delta is not None and not delta["full"]
+    assert [cell[0] for cell in delta["cells"]] == [0, 15]
+    assert delta["cells"][1][2] == "MISS"
+    assert delta["version"] == view.version
+
+
+def test_unseen_changes_are_not_versions() -> None:
+    """Test changes hidden by the visibility leave the version alone."""
+    b = board()
+    view = GridView(b.grid, PUBLIC)
+    b.grid.get_square_xy(2, 2).prv_label = "x"
+    b.fleet.place_random()
+    b.grid.get_square_xy(3, 3).state = SqState.HIDDEN
+    assert view.version == 0
+    assert GridView(b.grid, PRIVATE).version == 0
+
+
+def test_observers_at_one_version_share_encoding() -> None:
+    """Test the encoded delta is reused until the view changes."""
+    b = board()
+    view = GridView(b.grid, PUBLIC)
+    a, c = view.observe(), view.observe()
+    assert a.update_encoded() is c.update_encoded()
+    b.fire(2, 2)
+    data = a.update_encoded()
+    assert data is not None and data is c.update_encoded()
+    assert a.update_encoded() is None
+    message = json.loads(data)
+    assert message["op"] == "delta"
+    assert message["cells"] == [[10, b.grid.get_square_xy(2, 2).pub_label, "MISS"]]
+
+
+def test_lagging_observer_gets_full_view() -> None:
+    """Test an observer behind the remembered changes is sent everything."""
+    grid = Grid(3)
+    view = GridView(grid, PUBLIC, history=4)
+    observer = view.observe()
+    observer.update()
+    for index in range(6):
+        grid.get_square_index(index).state = SqState.MISS
+    delta = observer.update()
+    assert delta is not None and delta["full"]
+    assert len(delta["cells"]) == 9
+    grid.get_square_index(8).state = SqState.HIT
+    assert view.delta(view.version - 1)["cells"] == [[8, None, "HIT"]]
+    view.detach()
+    grid.get_square_index(7).state = SqState.HIT
+    assert view.version == 7
@@ -0,0 +1,56 @@
+"""Test cases for weapons module."""
+import pytest
+
+from fightgrid import weapons
+from fightgrid.grid import Direction
+from fightgrid.grid import Grid
+from fightgrid.grid import SqState
+from fightgrid.grid import Square
+from fightgrid.topology import Topology
+
+
+def test_template_shapes() -> None:
+    """Test the built-in templates cover the expected offsets."""
+    assert set(weapons.cross(1).offsets) == {(0, 0), (0, -1), (-1, 0), (1, 0), (0, 1)}
+    assert weapons.line(3, Direction.UP).offsets == ((0, 0), (0, -1), (0, -2))
+    assert len(weapons.diamond(2).offsets) == 13
+    assert len(weapons.RETICLE.offsets) == 9
+    mask = weapons.from_mask([".X.", "XXX", ".X."])
+    assert set(mask.offsets) == set(weapons.cross(1).offsets)
+    corner = weapons.from_mask(["XX", "X."], center=(0, 0))
+    assert set(corner.offsets) == {(0, 0), (1, 0), (0, 1)}
+
+
+def test_clip_drops_off_grid_and_blocked() -> None:
+    """Test clipping leaves out squares off the grid and blocked squares."""
+    topology = Topology.from_rows(["..#", "...", "..."])
+    assert weapons.clip(weapons.cross(1), topology, 0) == (0, 1, 3)
+    assert weapons.clip(weapons.cross(1), topology, 5) == (5, 4, 8)
+    assert weapons.clip_mask(weapons.cross(1), topology, 0) == 0b1011
+
+
+def test_clip_wraps_and_is_cached() -> None:
+    """Test clipping on a torus wraps and repeats are cached."""
+    torus = Topology.square(3, wrap=True)
+    struck = weapons.clip(weapons.line(4), torus, 1)
+    assert struck == (1, 2, 0)
+    assert weapons.clip(weapons.line(4), torus, 1) is struck
+
+
+def test_apply_aoe() -> None:
+    """Test an area shot hits hidden squares, misses empty ones."""
+    grid = Grid(4)
+    grid.get_square_xy(1, 1).state = SqState.HIDDEN
+    grid.get_square_xy(2, 1).state = SqState.MISS
+    result = weapons.apply_aoe(grid, weapons.cross(1), Square(1, 1))
+    assert result.hits == 1 << 5
+    assert result.misses == (1 << 1) | (1 << 4) | (1 << 9)
+    assert grid.get_square_xy(1, 1).state is SqState.HIT
+    assert grid.get_square_xy(2, 1).state is SqState.MISS
+    assert grid.get_square_xy(1, 0).state is SqState.MISS
+    squares = weapons.area_squares(grid, weapons.line(2), Square(3, 3))
+    assert squares == [Square(3, 3)]
+    with pytest.raises(ValueError):
+        weapons.apply_aoe(grid, weapons.RETICLE, Square(4, 0))
+    with pytest.raises(ValueError):
+        weapons.area_squares(grid, weapons.RETICLE, Square(0, -1))